@@ -1,8 +1,56 @@
 """Ash"""
 
-import importlib.metadata
+import importlib
+from typing import TYPE_CHECKING, Any
 
-from .cli import ash_cli
-from .main import Paper, RetractionDatabase
+if TYPE_CHECKING:
+    from .cli import ash_cli
+    from .mapped import MappedRetractionDatabase
+    from .main import Paper, PaperBatch, PrefilteredDatabase, RetractionDatabase
 
-__version__ = importlib.metadata.version("ash-williams")
+__all__ = [
+    "MappedRetractionDatabase",
+    "Paper",
+    "PaperBatch",
+    "PrefilteredDatabase",
+    "RetractionDatabase",
+    "ash_cli",
+]
+
+# Imported on first use, so that `import ash` costs next to nothing
+_LAZY_ATTRIBUTES = {
+    "ash_cli": ".cli",
+    "MappedRetractionDatabase": ".mapped",
+    "Paper": ".main",
+    "PaperBatch": ".main",
+    "PrefilteredDatabase": ".main",
+    "RetractionDatabase": ".main",
+}
+# Likewise submodules, so that `import ash` then `ash.config.setup_logging()` works
+_LAZY_SUBMODULES = frozenset(
+    {
+        "aio",
+        "bloom",
+        "cache",
+        "cli",
+        "config",
+        "corpus",
+        "instrument",
+        "main",
+        "mapped",
+        "records",
+        "server",
+    }
+)
+
+
+def __getattr__(name: str) -> Any:
+    if name == "__version__":
+        from importlib import metadata  # pylint: disable=import-outside-toplevel
+
+        return metadata.version("ash-williams")
+    if name in _LAZY_ATTRIBUTES:
+        return getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
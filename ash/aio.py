@@ -0,0 +1,136 @@
+"""
+Just enough of an asyncio HTTP/1.1 client to check DOIs against doi.org without
+blocking the event loop: HEAD requests over kept-alive connections.
+"""
+
+import asyncio
+import contextlib
+import ssl
+from urllib.parse import quote, urlsplit
+
+Origin = tuple[str, str, int]
+Connection = tuple[asyncio.StreamReader, asyncio.StreamWriter]
+Response = tuple[int, dict[str, str]]
+
+
+class AsyncHeadClient:
+    """
+    Send HEAD requests, at most max_connections at once, reusing connections to
+    each origin for as long as the server keeps them open.
+
+    Belongs to the event loop it is first used on; close it when done.
+    """
+
+    MAX_HEADER_LINES = 100
+
+    def __init__(
+        self,
+        max_connections: int = 8,
+        user_agent: str = "ash",
+        connect_timeout: float | None = None,
+    ) -> None:
+        self.user_agent = user_agent
+        self.connect_timeout = connect_timeout
+        self._slots = asyncio.Semaphore(max_connections)
+        self._idle: dict[Origin, list[Connection]] = {}
+        self._ssl: ssl.SSLContext | None = None
+
+    async def head(self, url: str) -> Response:
+        """
+        The response status and headers, the header names lowercased. Cancelling
+        drops the connection rather than reusing it.
+        """
+        parts = urlsplit(url)
+        secure = parts.scheme == "https"
+        origin = (
+            parts.scheme,
+            parts.hostname or "",
+            parts.port or (443 if secure else 80),
+        )
+        target = quote(parts.path or "/", safe="/:@!$&'()*+,;=-._~%")
+        if parts.query:
+            target += f"?{parts.query}"
+        async with self._slots:
+            idle = self._idle.get(origin)
+            if idle:
+                try:
+                    return await self._exchange(origin, idle.pop(), target)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    # The server closed it while idle; try once more on a new one
+                    pass
+            return await self._exchange(origin, await self._connect(origin), target)
+
+    async def _connect(self, origin: Origin) -> Connection:
+        scheme, host, port = origin
+        context = None
+        if scheme == "https":
+            if self._ssl is None:
+                self._ssl = ssl.create_default_context()
+            context = self._ssl
+        return await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl=context), self.connect_timeout
+        )
+
+    async def _exchange(
+        self, origin: Origin, connection: Connection, target: str
+    ) -> Response:
+        reader, writer = connection
+        scheme, host, port = origin
+        default_port = 443 if scheme == "https" else 80
+        authority = host if port == default_port else f"{host}:{port}"
+        try:
+            writer.write(
+                (
+                    f"HEAD {target} HTTP/1.1\r\n"
+                    + f"Host: {authority}\r\n"
+                    + f"User-Agent: {self.user_agent}\r\n"
+                    + "Accept: */*\r\n\r\n"
+                ).encode("latin-1")
+            )
+            await writer.drain()
+            status_line = await reader.readline()
+            if not status_line:
+                raise ConnectionResetError("Connection closed before a response")
+            try:
+                version, status, *_ = status_line.decode("latin-1").split(None, 2)
+                code = int(status)
+            except ValueError as err:
+                raise ConnectionError(f"Malformed status line {status_line!r}") from err
+            headers: dict[str, str] = {}
+            for _ in range(self.MAX_HEADER_LINES):
+                line = await reader.readline()
+                if not line.strip():
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            else:
+                raise ConnectionError("Too many response headers")
+            connection_header = headers.get("connection", "").lower()
+            keep_alive = connection_header != "close" and (
+                version == "HTTP/1.1" or connection_header == "keep-alive"
+            )
+        except BaseException:
+            writer.close()
+            raise
+        if keep_alive:
+            self._idle.setdefault(origin, []).append(connection)
+        else:
+            writer.close()
+        return code, headers
+
+    async def close(self) -> None:
+        idle = [
+            writer for connections in self._idle.values() for _, writer in connections
+        ]
+        self._idle.clear()
+        for writer in idle:
+            writer.close()
+        for writer in idle:
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def __aenter__(self) -> "AsyncHeadClient":
+        return self
+
+    async def __aexit__(self, *exc_details: object) -> None:
+        await self.close()
@@ -0,0 +1,96 @@
+import hashlib
+import math
+import struct
+from collections.abc import Iterable
+
+
+class BloomFilter:
+    """
+    Compact set membership with no false negatives and a tunable false-positive rate.
+
+    Positions come from double hashing one 128-bit BLAKE2b digest per key, so a
+    filter serialized by one process answers identically in any other.
+    """
+
+    MAGIC = b"ASHBLOOM"
+    VERSION = 1
+    _HEADER = struct.Struct("<8sHQQQ")
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        if not 0 < error_rate < 1:
+            raise ValueError(f"error_rate must be between 0 and 1, not {error_rate}")
+        capacity = max(capacity, 1)
+        self.n_bits = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.n_hashes = max(1, round(self.n_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.n_bits + 7) // 8)
+        self.count = 0
+
+    @classmethod
+    def from_keys(cls, keys: Iterable[str], error_rate: float = 0.001) -> "BloomFilter":
+        keys = list(keys)
+        bloom = cls(len(keys), error_rate)
+        bloom.update(keys)
+        return bloom
+
+    def _positions(self, key: str) -> Iterable[int]:
+        digest = hashlib.blake2b(key.encode("utf8"), digest_size=16).digest()
+        first, second = struct.unpack("<QQ", digest)
+        second |= 1  # never a zero stride
+        n_bits = self.n_bits
+        return ((first + i * second) % n_bits for i in range(self.n_hashes))
+
+    def add(self, key: str) -> None:
+        bits = self.bits
+        for position in self._positions(key):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def update(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def error_rate(self) -> float:
+        """
+        Expected false-positive rate at the current fill.
+        """
+        fill = 1 - math.exp(-self.n_hashes * self.count / self.n_bits)
+        return fill**self.n_hashes
+
+    def to_bytes(self) -> bytes:
+        header = self._HEADER.pack(
+            self.MAGIC, self.VERSION, self.n_bits, self.n_hashes, self.count
+        )
+        return header + bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BloomFilter":
+        magic, version, n_bits, n_hashes, count = cls._HEADER.unpack_from(data)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError("Not a serialized BloomFilter of this version")
+        bits = bytearray(data[cls._HEADER.size :])
+        if len(bits) != (n_bits + 7) // 8:
+            raise ValueError("Serialized BloomFilter is truncated")
+        bloom = cls.__new__(cls)
+        bloom.n_bits = n_bits
+        bloom.n_hashes = n_hashes
+        bloom.bits = bits
+        bloom.count = count
+        return bloom
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}({self.count:,} keys, {len(self.bits):,} bytes,"
+            + f" {self.n_hashes} hashes)"
+        )
@@ -0,0 +1,349 @@
+import functools
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable, Mapping
+from importlib import metadata
+from pathlib import Path
+from typing import Any
+
+from ash import config
+
+logger = logging.getLogger(__name__)
+
+
+class ValidationCache:
+    """
+    On-disk cache of doi.org existence checks, keyed by cleaned DOI.
+
+    Positive answers are kept for the handle API's own TTL (86400 seconds); negative
+    answers expire sooner, since a DOI missing today may be registered tomorrow.
+    Beyond max_entries, the least recently used rows are evicted.
+
+    SQLite in WAL mode with a generous busy timeout keeps this safe with several
+    processes reading and writing at once.
+    """
+
+    FILENAME = "validation.sqlite3"
+    TTL = 86400
+    NEGATIVE_TTL = 3600
+    MAX_ENTRIES = 100_000
+
+    def __init__(
+        self,
+        path: Path | str | None = None,
+        ttl: float = TTL,
+        negative_ttl: float = NEGATIVE_TTL,
+        max_entries: int = MAX_ENTRIES,
+    ) -> None:
+        self.path = Path(path) if path else config.CACHE_DIR / self.FILENAME
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = _open(self.path)
+            _ = connection.execute(
+                "CREATE TABLE IF NOT EXISTS validation ("
+                + " doi TEXT PRIMARY KEY,"
+                + " found INTEGER NOT NULL,"
+                + " checked REAL NOT NULL,"
+                + " accessed REAL NOT NULL)"
+            )
+            _ = connection.execute(
+                "CREATE INDEX IF NOT EXISTS validation_accessed"
+                + " ON validation (accessed)"
+            )
+            self._connection = connection
+        return self._connection
+
+    def get(self, doi: str) -> bool | None:
+        return self.get_many([doi]).get(doi)
+
+    def get_many(self, dois: Iterable[str]) -> dict[str, bool]:
+        """
+        Unexpired answers for whichever of the DOIs are cached; touching them for LRU.
+        """
+        wanted = list(dict.fromkeys(dois))
+        if not wanted:
+            return {}
+        now = time.time()
+        found: dict[str, bool] = {}
+        with self._lock:
+            connection = self._connect()
+            for batch in _batched(wanted):
+                placeholders = ", ".join("?" * len(batch))
+                rows = connection.execute(
+                    "SELECT doi, found, checked FROM validation"
+                    + f" WHERE doi IN ({placeholders})",
+                    batch,
+                ).fetchall()
+                for doi, existence, checked in rows:
+                    ttl = self.ttl if existence else self.negative_ttl
+                    if now - checked < ttl:
+                        found[doi] = bool(existence)
+            if found:
+                _touch(
+                    connection,
+                    "UPDATE validation SET accessed = ? WHERE doi = ?",
+                    [(now, doi) for doi in found],
+                )
+        return found
+
+    def set(self, doi: str, existence: bool) -> None:
+        self.set_many({doi: existence})
+
+    def set_many(self, results: Mapping[str, bool]) -> None:
+        if not results:
+            return
+        now = time.time()
+        with self._lock, self._transaction() as connection:
+            _ = connection.executemany(
+                "INSERT INTO validation (doi, found, checked, accessed)"
+                + " VALUES (?, ?, ?, ?)"
+                + " ON CONFLICT (doi) DO UPDATE SET"
+                + " found = excluded.found,"
+                + " checked = excluded.checked,"
+                + " accessed = excluded.accessed",
+                [(doi, int(existence), now, now) for doi, existence in results.items()],
+            )
+            self._evict(connection)
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        (count,) = connection.execute("SELECT COUNT(*) FROM validation").fetchone()
+        excess = count - self.max_entries
+        if excess <= 0:
+            return
+        _ = connection.execute(
+            "DELETE FROM validation WHERE doi IN"
+            + " (SELECT doi FROM validation ORDER BY accessed LIMIT ?)",
+            (excess,),
+        )
+        logger.info(f"Evicted {excess:,} least recently used DOIs from {self.path}")
+
+    def _transaction(self) -> "_ImmediateTransaction":
+        return _ImmediateTransaction(self._connect())
+
+    def clear(self) -> None:
+        with self._lock, self._transaction() as connection:
+            _ = connection.execute("DELETE FROM validation")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = (
+                self._connect().execute("SELECT COUNT(*) FROM validation").fetchone()
+            )
+        return count
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}('{self.path}')"
+
+
+class ExtractionCache:
+    """
+    On-disk cache of the DOIs extracted from papers, keyed by a hash of the paper's
+    bytes plus the handler that extracted them, its VERSION, and Ash's version.
+
+    Beyond max_bytes of stored DOI lists, the least recently used are evicted.
+    Picklable, for worker processes, which open their own connections.
+    """
+
+    FILENAME = "extraction.sqlite3"
+    MAX_BYTES = 64 << 20
+
+    def __init__(
+        self, path: Path | str | None = None, max_bytes: int = MAX_BYTES
+    ) -> None:
+        self.path = Path(path) if path else config.CACHE_DIR / self.FILENAME
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    @staticmethod
+    def key(digest: str, handler: object) -> str:
+        kind = type(handler)
+        version = getattr(kind, "VERSION", 0)
+        return f"{digest}:{kind.__qualname__}:{version}:{package_version()}"
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = _open(self.path)
+            _ = connection.execute(
+                "CREATE TABLE IF NOT EXISTS extraction ("
+                + " key TEXT PRIMARY KEY,"
+                + " dois TEXT NOT NULL,"
+                + " size INTEGER NOT NULL,"
+                + " accessed REAL NOT NULL)"
+            )
+            _ = connection.execute(
+                "CREATE INDEX IF NOT EXISTS extraction_accessed"
+                + " ON extraction (accessed)"
+            )
+            self._connection = connection
+        return self._connection
+
+    def get(self, key: str) -> list[str] | None:
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT dois FROM extraction WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            _touch(
+                connection,
+                "UPDATE extraction SET accessed = ? WHERE key = ?",
+                [(time.time(), key)],
+            )
+        return json.loads(row[0])
+
+    def set(self, key: str, dois: Iterable[str]) -> None:
+        encoded = json.dumps(list(dois))
+        with self._lock, _ImmediateTransaction(self._connect()) as connection:
+            _ = connection.execute(
+                "INSERT OR REPLACE INTO extraction (key, dois, size, accessed)"
+                + " VALUES (?, ?, ?, ?)",
+                (key, encoded, len(encoded), time.time()),
+            )
+            self._evict(connection)
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        (total,) = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM extraction"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+        evicted = connection.execute(
+            "DELETE FROM extraction WHERE key IN (SELECT key FROM"
+            + " (SELECT key, SUM(size) OVER (ORDER BY accessed DESC, key) AS kept"
+            + " FROM extraction) WHERE kept > ?)",
+            (self.max_bytes,),
+        ).rowcount
+        logger.info(f"Evicted {evicted:,} least recently used papers from {self.path}")
+
+    def clear(self) -> None:
+        with self._lock, _ImmediateTransaction(self._connect()) as connection:
+            _ = connection.execute("DELETE FROM extraction")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {"path": self.path, "max_bytes": self.max_bytes}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(**state)
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = (
+                self._connect().execute("SELECT COUNT(*) FROM extraction").fetchone()
+            )
+        return count
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}('{self.path}')"
+
+
+BUSY_TIMEOUT = 30.0
+
+
+def _open(path: Path) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(
+        path, timeout=BUSY_TIMEOUT, isolation_level=None, check_same_thread=False
+    )
+    try:
+        _use_wal(connection)
+        _ = connection.execute("PRAGMA synchronous=NORMAL")
+    except BaseException:
+        connection.close()
+        raise
+    return connection
+
+
+def _use_wal(connection: sqlite3.Connection) -> None:
+    """
+    Switching to WAL needs the database to itself and, unlike other statements,
+    fails at once rather than waiting on the busy timeout; so several processes
+    opening a new cache together retry until it is their turn.
+    """
+    deadline = time.monotonic() + BUSY_TIMEOUT
+    delay = 0.001
+    while True:
+        (mode,) = connection.execute("PRAGMA journal_mode").fetchone()
+        if mode == "wal":
+            return
+        try:
+            _ = connection.execute("PRAGMA journal_mode=WAL")
+            return
+        except sqlite3.OperationalError as err:
+            if "locked" not in str(err) or time.monotonic() > deadline:
+                raise
+        time.sleep(delay)
+        delay = min(delay * 2, 0.1)
+
+
+@functools.cache
+def package_version() -> str:
+    """
+    Ash's installed version, so what its code derives is redone on upgrade.
+    """
+    try:
+        return metadata.version("ash-williams")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def _touch(connection: sqlite3.Connection, update: str, rows: list[Any]) -> None:
+    """
+    Mark entries as recently used, without waiting on writers: if the database is
+    busy, only eviction order suffers.
+    """
+    _ = connection.execute("PRAGMA busy_timeout = 0")
+    try:
+        with _ImmediateTransaction(connection):
+            _ = connection.executemany(update, rows)
+    except sqlite3.OperationalError as err:
+        logger.debug(f"Could not mark {len(rows):,} entries as used: {err}")
+    finally:
+        _ = connection.execute(f"PRAGMA busy_timeout = {int(BUSY_TIMEOUT * 1000)}")
+
+
+class _ImmediateTransaction:
+    """
+    BEGIN IMMEDIATE takes the write lock up front, so concurrent writers queue on the
+    busy timeout instead of failing mid-transaction on a lock upgrade.
+    """
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self.connection = connection
+
+    def __enter__(self) -> sqlite3.Connection:
+        _ = self.connection.execute("BEGIN IMMEDIATE")
+        return self.connection
+
+    def __exit__(self, exc_type: object, *exc_details: object) -> None:
+        _ = self.connection.execute("ROLLBACK" if exc_type else "COMMIT")
+
+
+def _batched(items: list[str], size: int = 500) -> Iterable[list[str]]:
+    """
+    Stay well under SQLite's limit on bound parameters per statement.
+    """
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
@@ -1,34 +1,108 @@
+# Screening modules load only once a command needs them, so --help stays quick
+# pylint: disable=import-outside-toplevel
+import json
 from pathlib import Path
 from pprint import pformat
+from typing import Any, TextIO
 
 import click
 
-from ash import config
-from ash.main import Paper, RetractionDatabase
-
-stored_database = config.read_value(table="database", key="path")
+from ash import config, instrument
 
 
 @click.command(no_args_is_help=True)
-@click.argument("paper", type=click.Path(exists=True), required=False)
+@click.argument("papers", nargs=-1)
 @click.option(
     "--database",
-    help="Path to retractions database file.",
-    default=stored_database,
-    show_default=True,
+    help="Path to retractions database file.  [default: the last one used]",
     type=click.Path(),
 )
 @click.option("--clear", help="Clear path to database file.", is_flag=True)
+@click.option(
+    "--from-file",
+    help="File listing papers, directories, or globs, one per line.",
+    type=click.Path(exists=True, dir_okay=False),
+)
+@click.option(
+    "--jobs",
+    "-j",
+    help="Worker processes for loading DATABASE and extracting papers.",
+    default=1,
+    show_default=True,
+    type=click.IntRange(min=1),
+)
+@click.option("--jsonl", help="One JSON line per paper, even for one.", is_flag=True)
+@click.option(
+    "--update",
+    help="Update DATABASE to this newer release and print what changed.",
+    type=click.Path(exists=True, dir_okay=False),
+)
+@click.option("--stats", help="Report throughput and stage timings.", is_flag=True)
+@click.option(
+    "--validate",
+    help="Check that each DOI exists at doi.org, showing answers as they arrive.",
+    is_flag=True,
+)
+@click.option(
+    "--extraction-cache",
+    help="Reuse DOIs extracted before from byte-identical papers.",
+    is_flag=True,
+)
+@click.option(
+    "--prefilter",
+    help="Check DOIs against a Bloom filter, loading DATABASE only on a possible hit.",
+    is_flag=True,
+)
+@click.option(
+    "--timings",
+    help="Write span timings and counters as JSON to this file ('-' for stdout).",
+    type=click.File("w"),
+)
+@click.option(
+    "--serve",
+    help="Keep DATABASE loaded and serve reports over HTTP.",
+    is_flag=True,
+)
+@click.option("--host", help="Address to serve on.", default="127.0.0.1")
+@click.option("--port", help="Port to serve on.", default=8000, type=int)
+@click.option(
+    "--socket",
+    "socket_path",
+    help="Serve on this Unix socket instead of a port.",
+    type=click.Path(),
+)
 @click.pass_context
 def ash_cli(
     ctx: click.Context,
-    paper: str | None,
+    papers: tuple[str, ...],
     database: str | Path | None,
     clear: bool,
+    from_file: str | None,
+    jobs: int,
+    jsonl: bool,
+    update: str | None,
+    stats: bool,
+    validate: bool,
+    extraction_cache: bool,
+    prefilter: bool,
+    timings: TextIO | None,
+    serve: bool,
+    host: str,
+    port: int,
+    socket_path: str | None,
 ):
     """
-    Simple program that runs Ash on PAPER using DATABASE.
+    Simple program that runs Ash on PAPERS using DATABASE.
+
+    PAPERS may be files, directories (searched for supported files), or globs.
+    Several papers are screened as a stream of JSON lines, closing with a summary.
+
+    With --serve, DATABASE is loaded once and papers are instead POSTed to /report.
     """
+    config.setup_logging()
+    if timings is not None:
+        instrument.enable()
+        _ = ctx.call_on_close(lambda: instrument.dump(timings))
     if clear:
         _ = config.write_value(
             table="database", key="path", value=""
@@ -41,14 +115,52 @@ def ash_cli(
             "Error: You must specify the path of a retractions database with --database."
         )
         ctx.exit()
-    click.echo(f"Database path: {database.resolve()}.")
-    if paper is None:
+    if update:
+        click.echo(json.dumps(update_database(database, update)))
         ctx.exit()
-    print_basic_report(paper, database)
+    if serve:
+        where = socket_path or f"http://{host}:{port}"
+        click.echo(f"Serving reports on {where} using {database}.")
+        from ash import server
+
+        server.serve(database, host=host, port=port, socket_path=socket_path, jobs=jobs)
+        return
+    from ash.corpus import expand_paper_paths, read_path_list
+
+    specs = list(papers) + (read_path_list(from_file) if from_file else [])
+    single = len(specs) == 1 and not (
+        jsonl or from_file or glob_chars_in(specs[0]) or Path(specs[0]).is_dir()
+    )
+    # Keep stdout clean for JSON lines
+    click.echo(f"Database path: {database.resolve()}.", err=bool(specs) and not single)
+    if not specs:
+        ctx.exit()
+    if single:
+        if not Path(specs[0]).exists():
+            raise click.BadParameter(
+                f"Path '{specs[0]}' does not exist.", param_hint="'[PAPERS]...'"
+            )
+        print_basic_report(
+            specs[0],
+            database,
+            prefilter=prefilter,
+            extraction_cache=extraction_cache,
+            validate=validate,
+        )
+        return
+    print_corpus_report(
+        expand_paper_paths(specs),
+        database,
+        jobs=jobs,
+        stats=stats,
+        prefilter=prefilter,
+        extraction_cache=extraction_cache,
+        validate=validate,
+    )
 
 
 def locate_database(database: str | Path | None) -> Path | None:
-    database = database or stored_database
+    database = database or config.read_value(table="database", key="path")
     if database is None or database == "":
         return None
     database_path = Path(database).resolve()
@@ -56,8 +168,86 @@ def locate_database(database: str | Path | None) -> Path | None:
     return database_path
 
 
-def print_basic_report(paper_spec: str, database_spec: str | Path):
+def update_database(database_spec: str | Path, new_release: str | Path):
+    from ash.main import RetractionDatabase
+
     db = RetractionDatabase(database_spec)
-    paper = Paper.from_path(paper_spec)
-    prettied = pformat(paper.report(db, validate_dois=False))
+    diff = db.update(new_release)
+    _ = config.write_value(table="database", key="path", value=str(db.path))
+    return diff
+
+
+def glob_chars_in(spec: str) -> bool:
+    from ash.corpus import GLOB_CHARACTERS
+
+    return bool(GLOB_CHARACTERS.intersection(spec))
+
+
+def open_database(database_spec: str | Path, prefilter: bool = False, jobs: int = 1):
+    from ash.main import PrefilteredDatabase, RetractionDatabase
+
+    if prefilter:
+        return PrefilteredDatabase(database_spec, jobs=jobs)
+    return RetractionDatabase(database_spec, jobs=jobs)
+
+
+def print_basic_report(
+    paper_spec: str,
+    database_spec: str | Path,
+    prefilter: bool = False,
+    extraction_cache: bool = False,
+    validate: bool = False,
+):
+    from ash.cache import ExtractionCache
+    from ash.main import Paper
+
+    db = open_database(database_spec, prefilter)
+    cache = ExtractionCache() if extraction_cache else None
+    paper = Paper.from_path(paper_spec, cache=cache)
+    # Answers from doi.org trickle in, so show each as it comes; stdout keeps
+    # just the full report
+    on_item = echo_report_item if validate else None
+    prettied = pformat(paper.report(db, validate_dois=validate, on_item=on_item))
     click.echo(prettied)
+
+
+def echo_report_item(kind: str, item: dict[str, Any]) -> None:
+    if kind == "zombie":
+        click.echo(
+            f"Zombie {item['Zombie']}: {item['Item']}, {item['Date']},"
+            + f" {item['Notice DOI']}",
+            err=True,
+        )
+        return
+    validity = {True: "valid", False: "not found", None: "unchecked"}
+    checked = item.get("Validation", validity[item.get("DOI is valid")])
+    click.echo(
+        f"{item['DOI']}: {'retracted' if item['Retracted'] else 'not retracted'},"
+        + f" {checked}",
+        err=True,
+    )
+
+
+def print_corpus_report(
+    paths: list[Path],
+    database_spec: str | Path,
+    jobs: int,
+    stats: bool,
+    prefilter: bool = False,
+    extraction_cache: bool = False,
+    validate: bool = False,
+):
+    from ash.cache import ExtractionCache
+    from ash.corpus import CorpusSummary, screen_corpus
+
+    db = open_database(database_spec, prefilter, jobs)
+    cache = ExtractionCache() if extraction_cache else None
+    summary = CorpusSummary()
+    for result in screen_corpus(
+        paths, db, jobs=jobs, validate_dois=validate, cache=cache
+    ):
+        summary.add(result)
+        if not stats:
+            _ = result.pop("timings", None)
+        click.echo(json.dumps(result))
+    click.echo(json.dumps({"summary": summary.as_dict(with_stats=stats)}))
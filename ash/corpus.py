@@ -0,0 +1,183 @@
+import glob
+import mimetypes
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from io import BytesIO
+from pathlib import Path
+from typing import Any
+
+from ash import instrument
+from ash.cache import ExtractionCache
+from ash.main import Paper, RetractionLookup, path_to_mime_type
+
+GLOB_CHARACTERS = frozenset("*?[")
+
+
+def expand_paper_paths(specs: Iterable[str | Path]) -> list[Path]:
+    """
+    Directories are searched recursively for files of a supported MIME type, globs
+    are expanded, and anything else is taken as given. Order is kept, repeats dropped.
+    """
+    found: dict[Path, None] = {}
+    for spec in specs:
+        spec = str(spec)
+        if GLOB_CHARACTERS.intersection(spec):
+            matches = [Path(p) for p in sorted(glob.glob(spec, recursive=True))]
+            found.update(dict.fromkeys(p for p in matches if p.is_file()))
+        elif Path(spec).is_dir():
+            found.update(dict.fromkeys(_supported_files_under(Path(spec))))
+        else:
+            found[Path(spec)] = None
+    return list(found)
+
+
+def read_path_list(path: Path | str) -> list[str]:
+    """
+    One path, directory, or glob per line; blank lines and #comments skipped.
+    """
+    lines = Path(path).read_text(encoding="utf8").splitlines()
+    return [s.strip() for s in lines if s.strip() and not s.startswith("#")]
+
+
+def _supported_files_under(directory: Path) -> Iterator[Path]:
+    for path in sorted(directory.rglob("*")):
+        guessed_mime, _ = mimetypes.guess_type(path)
+        if path.is_file() and guessed_mime and Paper.supports(guessed_mime):
+            yield path
+
+
+def extract_dois(
+    paper: bytes | Path | str, mime_type: str, cache: ExtractionCache | None = None
+) -> list[str]:
+    """
+    Worker-side half of a report, from a paper's bytes or path: no database needed,
+    so only DOIs travel back.
+    """
+    if isinstance(paper, bytes):
+        return Paper(BytesIO(paper), mime_type).dois
+    return Paper.from_path(paper, mime_type=mime_type, cache=cache).dois
+
+
+def extract_paper(
+    path: Path | str, cache: ExtractionCache | None = None
+) -> dict[str, Any]:
+    """
+    A paper's DOIs with its MIME type and the time each stage took, or the error.
+    """
+    timings: dict[str, float] = {}
+    start = time.perf_counter()
+    try:
+        mime_type = path_to_mime_type(path)
+        timings["mime"] = time.perf_counter() - start
+        dois = extract_dois(path, mime_type, cache)
+        timings["extract"] = time.perf_counter() - start - timings["mime"]
+    except Exception as err:  # pylint: disable=broad-exception-caught
+        return {"path": str(path), "error": f"{type(err).__name__}: {err}"}
+    return {
+        "path": str(path),
+        "mime_type": mime_type,
+        "dois": dois,
+        "timings": timings,
+    }
+
+
+def screen_corpus(
+    paths: Iterable[Path | str],
+    db: RetractionLookup,
+    jobs: int = 1,
+    validate_dois: bool = False,
+    cache: ExtractionCache | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Yield one result per paper as each finishes, reported against the one database.
+
+    With jobs > 1 the extraction is spread across a process pool. With a cache,
+    papers already extracted are not extracted again.
+    """
+    for extracted in _extract_all(paths, jobs, cache):
+        if "error" in extracted:
+            yield extracted
+            continue
+        start = time.perf_counter()
+        paper = Paper.from_dois(extracted.pop("dois"), extracted["mime_type"])
+        extracted["report"] = paper.report(db, validate_dois=validate_dois)
+        extracted["timings"]["report"] = time.perf_counter() - start
+        yield extracted
+
+
+def _extract_all(
+    paths: Iterable[Path | str], jobs: int, cache: ExtractionCache | None = None
+) -> Iterator[dict[str, Any]]:
+    if jobs <= 1:
+        yield from (extract_paper(path, cache) for path in paths)
+        return
+    instrumented = instrument.enabled()
+    worker = _extract_instrumented if instrumented else extract_paper
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=instrument.enable if instrumented else None
+    ) as pool:
+        futures: list[Future[dict[str, Any]]] = [
+            pool.submit(worker, path, cache) for path in paths
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            instrument.merge(result.pop("instrumentation", {}))
+            yield result
+
+
+def _extract_instrumented(
+    path: Path | str, cache: ExtractionCache | None = None
+) -> dict[str, Any]:
+    """
+    Workers hand back what they measured for each paper, for the parent to merge.
+    """
+    result = extract_paper(path, cache)
+    result["instrumentation"] = instrument.as_dict()
+    instrument.reset()
+    return result
+
+
+class CorpusSummary:
+    """
+    Running totals over screened papers, with throughput and per-stage timings.
+    """
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.papers = 0
+        self.failed = 0
+        self.dois = 0
+        self.zombies = 0
+        self.papers_with_zombies = 0
+        self.stage_seconds: dict[str, float] = {}
+
+    def add(self, result: dict[str, Any]) -> None:
+        self.papers += 1
+        if "error" in result:
+            self.failed += 1
+            return
+        report = result["report"]
+        self.dois += len(report["dois"])
+        self.zombies += len(report["zombies"])
+        self.papers_with_zombies += bool(report["zombies"])
+        for stage, seconds in result["timings"].items():
+            self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+
+    def as_dict(self, with_stats: bool = False) -> dict[str, Any]:
+        summary: dict[str, Any] = {
+            "papers": self.papers,
+            "failed": self.failed,
+            "dois": self.dois,
+            "zombies": self.zombies,
+            "papers_with_zombies": self.papers_with_zombies,
+        }
+        if with_stats:
+            elapsed = time.perf_counter() - self.start
+            summary["seconds"] = round(elapsed, 3)
+            summary["papers_per_second"] = round(self.papers / elapsed, 2)
+            summary["stage_seconds"] = {
+                stage: round(seconds, 3)
+                for stage, seconds in self.stage_seconds.items()
+            }
+        return summary
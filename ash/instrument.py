@@ -0,0 +1,187 @@
+"""
+Opt-in timing spans, counters, and histograms for the stages of screening a paper.
+
+Off by default. While off, `span` hands back one shared do-nothing context manager
+and `count` returns at once, so instrumented code pays about a function call.
+
+    instrument.enable()
+    with instrument.span("extract"):
+        ...
+    instrument.count("dois.extracted", len(dois))
+    print(instrument.to_json())
+"""
+
+import functools
+import json
+import math
+import threading
+import time
+from collections.abc import Callable, Mapping
+from typing import IO, Any, ParamSpec, TypeVar
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+_state = {"enabled": False}
+_lock = threading.Lock()
+_spans: dict[str, "Histogram"] = {}
+_counters: dict[str, int] = {}
+
+
+class Histogram:
+    """
+    Count, total, and extremes of durations, plus counts in power-of-two buckets
+    of microseconds.
+    """
+
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.buckets: dict[int, int] = {}
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        bound = 1 << max(0, math.ceil(math.log2(max(seconds * 1e6, 1))))
+        self.buckets[bound] = self.buckets.get(bound, 0) + 1
+
+    def merge(self, other: Mapping[str, Any]) -> None:
+        self.count += other["count"]
+        self.total += other["total"]
+        self.min = min(self.min, other["min"])
+        self.max = max(self.max, other["max"])
+        for bound, n in other["buckets_us"].items():
+            self.buckets[int(bound)] = self.buckets.get(int(bound), 0) + n
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "buckets_us": {str(b): n for b, n in sorted(self.buckets.items())},
+        }
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_details: object) -> None:
+        observe(self.name, time.perf_counter() - self.start)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc_details: object) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def enable(on: bool = True) -> None:
+    _state["enabled"] = on
+
+
+def disable() -> None:
+    enable(False)
+
+
+def enabled() -> bool:
+    return _state["enabled"]
+
+
+def reset() -> None:
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+
+
+def span(name: str) -> _Span | _NullSpan:
+    """
+    Time the enclosed block under the name, if instrumentation is on.
+    """
+    if not _state["enabled"]:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def timed(name: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """
+    Decorator form of span.
+    """
+
+    def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            if not _state["enabled"]:
+                return func(*args, **kwargs)
+            with _Span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def observe(name: str, seconds: float) -> None:
+    if not _state["enabled"]:
+        return
+    with _lock:
+        histogram = _spans.get(name)
+        if histogram is None:
+            histogram = _spans[name] = Histogram()
+        histogram.add(seconds)
+
+
+def count(name: str, n: int = 1) -> None:
+    if not _state["enabled"]:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def as_dict() -> dict[str, Any]:
+    with _lock:
+        return {
+            "spans": {name: h.as_dict() for name, h in sorted(_spans.items())},
+            "counters": dict(sorted(_counters.items())),
+        }
+
+
+def merge(collected: Mapping[str, Any]) -> None:
+    """
+    Fold in what as_dict gave elsewhere, e.g., in a worker process.
+    """
+    with _lock:
+        for name, other in collected.get("spans", {}).items():
+            _spans.setdefault(name, Histogram()).merge(other)
+        for name, n in collected.get("counters", {}).items():
+            _counters[name] = _counters.get(name, 0) + n
+
+
+def to_json(indent: int | None = None) -> str:
+    return json.dumps(as_dict(), indent=indent)
+
+
+def dump(stream: IO[str]) -> None:
+    _ = stream.write(to_json(indent=2) + "\n")
@@ -1,24 +1,103 @@
-﻿import csv
+﻿import codecs
+import contextlib
+import functools
+import hashlib
 import logging
 import mimetypes
+import os
+import pickle
 import re
+import sqlite3
+import tempfile
+import threading
+import time
 import zipfile
 from abc import abstractmethod
 from collections import Counter, defaultdict
-from collections.abc import Callable
-from itertools import chain
+from collections.abc import Callable, Generator, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from io import BytesIO
+from itertools import chain, islice, takewhile
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Protocol
-from xml.etree.ElementTree import XML
+from types import MappingProxyType
+from typing import IO, TYPE_CHECKING, Any, Protocol, TypeVar
+from xml.etree.ElementTree import Element, iterparse
+
+from ash import config, instrument
+from ash.bloom import BloomFilter
+from ash.cache import ExtractionCache, ValidationCache, package_version
+from ash.records import (
+    CSVSource,
+    RecordStore,
+    fingerprint,
+    iter_csv_records,
+    parse_record,
+    read_csv_rows,
+    split_csv_records,
+)
+
+# Third-party imports for handlers and the API are deferred to first use, keeping
+# `import ash` and the CLI quick to start
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    import urllib3
+    from pypdf import PdfReader
 
-import filetype  # type: ignore
-import urllib3
-from pypdf import PdfReader
-from striprtf.striprtf import rtf_to_text
+    from ash.aio import AsyncHeadClient
 
-from ash.config import log_this
+MAX_CONNECTIONS = 8
+# Seconds; an unreachable host should cost a few seconds, not the OS's minutes
+CONNECT_TIMEOUT = 3.0
+READ_TIMEOUT = 10.0
+
+
+class LazyPoolManager:
+    """
+    Stands in for a urllib3.PoolManager, building it (and importing urllib3) only
+    when the first request goes out.
 
-http = urllib3.PoolManager()
+    Failed connections and reads are not retried; a failing API is the circuit
+    breaker's business.
+    """
+
+    def __init__(
+        self,
+        connect_timeout: float | None = None,
+        read_timeout: float | None = None,
+        **pool_options: Any,
+    ) -> None:
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._pool_options = pool_options
+        self._pool: "urllib3.PoolManager | None" = None
+        self._lock = threading.Lock()
+
+    @property
+    def pool(self) -> "urllib3.PoolManager":
+        with self._lock:
+            if self._pool is None:
+                import urllib3  # pylint: disable=import-outside-toplevel
+
+                self._pool = urllib3.PoolManager(
+                    timeout=urllib3.Timeout(
+                        connect=self.connect_timeout, read=self.read_timeout
+                    ),
+                    retries=urllib3.Retry(total=3, connect=0, read=0, other=0),
+                    **self._pool_options,
+                )
+        return self._pool
+
+    def request(
+        self, method: str, url: str, **kwargs: Any
+    ) -> "urllib3.BaseHTTPResponse":
+        return self.pool.request(method, url, **kwargs)
+
+
+http = LazyPoolManager(
+    maxsize=MAX_CONNECTIONS, connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT
+)
 
 
 logger = logging.getLogger(__name__)
@@ -28,6 +107,68 @@ class InvalidDOIError(ValueError):
     pass
 
 
+class ValidationSkipped(Exception):
+    """
+    A DOI left unchecked, because the API is failing or has asked us to back off.
+    """
+
+
+class CircuitBreaker:
+    """
+    Refuses calls to a failing service, so they fail at once rather than each
+    waiting out its timeout.
+
+    Trips after threshold consecutive failures, or when told to (e.g., on 429),
+    and stays open for the cooldown. Then one trial call is let through: success
+    closes the breaker; failure opens it for another cooldown. Thread-safe.
+    """
+
+    def __init__(self, threshold: int = 3, cooldown: float = 60.0) -> None:
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._open_until = 0.0  # time.monotonic(); 0.0 while closed
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return bool(self._open_until)
+
+    def allow(self) -> bool:
+        with self._lock:
+            if not self._open_until:
+                return True
+            now = time.monotonic()
+            if now < self._open_until:
+                return False
+            # The trial call; should it never report back, another follows later
+            self._open_until = now + self.cooldown
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._open_until = 0.0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._open_until or self._failures >= self.threshold:
+                self._open(self.cooldown)
+
+    def trip(self, seconds: float | None = None) -> None:
+        with self._lock:
+            self._open(self.cooldown if seconds is None else seconds)
+
+    def _open(self, seconds: float) -> None:
+        if not self._open_until:
+            logger.info(f"Circuit breaker open; skipping calls for {seconds:.0f} s")
+        self._open_until = max(self._open_until, time.monotonic() + seconds)
+
+    def reset(self) -> None:
+        self.record_success()
+
+
 class DOI:
     """
     See https://www.crossref.org/blog/dois-and-matching-regular-expressions/
@@ -53,16 +194,39 @@ class DOI:
     ]
 
     REGEXES = [re.compile(s, flags=re.IGNORECASE) for s in CROSSREF_PATTERNS]
+
+    # One alternation anchored on the shared "10." prefix, for a single pass over
+    # text. At each position the first alternative to match wins, so the broader
+    # 10.1002 pattern and the more specific SICI and 10.1207 patterns go first.
+    SCAN_ORDER = (1, 2, 4, 0, 3)
+    PATTERN = re.compile(
+        "10.(?:"
+        + "|".join(
+            p.removeprefix("10.") for p in itemgetter(*SCAN_ORDER)(CROSSREF_PATTERNS)
+        )
+        + ")",
+        flags=re.IGNORECASE,
+    )
     DOI_FIXES = {
         "10.1177/ 0020720920940575": "10.1177/0020720920940575",
     }
+    # Reason codes from normalize_many
+    VALID = ""
+    EMPTY = "empty"
+    NO_SLASH = "no slash"
+    NO_MATCH = "no match"
 
     API_URL = "https://doi.org/api/handles/{doi}"
     API_RESPONSE_MAP: dict[int, bool] = {
         200: True,
         404: False,
     }
+    MAX_WORKERS = MAX_CONNECTIONS  # match the pool size so connections are reused
+    # Shared by the threaded and asyncio paths, so either one backs both off
+    breaker = CircuitBreaker()
     _cached_api_results: dict[str, bool] = {}
+    use_persistent_cache = True
+    _persistent_cache: ValidationCache | None = None
 
     def __init__(self, raw: str) -> None:
         self.raw = raw
@@ -72,12 +236,55 @@ class DOI:
 
     @classmethod
     def _validate_via_regex(cls, doi: str) -> None:
-        # Fail fast on a range of things that are obviously not dois
-        if not "/" in doi:
+        if cls.invalid_reason(doi):
             cls._report_bad_doi(doi)
+
+    @classmethod
+    def invalid_reason(cls, cleaned: str) -> str:
+        """
+        Why a cleaned value is not a DOI, or VALID if it is.
+        """
+        if not cleaned:
+            return cls.EMPTY
+        # Fail fast on a range of things that are obviously not dois
+        if "/" not in cleaned:
+            return cls.NO_SLASH
         # Slightly more slowly identify by regex
-        if not any(pattern.match(doi) for pattern in cls.REGEXES):
-            cls._report_bad_doi(doi)
+        if not cls.PATTERN.match(cleaned):
+            return cls.NO_MATCH
+        return cls.VALID
+
+    @classmethod
+    def normalize_many(
+        cls, raws: Iterable[str]
+    ) -> tuple[list[str], list[bool], list[str]]:
+        """
+        Clean and check many raw values without raising: the cleaned values, a mask
+        of which are valid DOIs, and a reason code for each.
+        """
+        cleaned: list[str] = []
+        reasons: list[str] = []
+        normalize = cls._normalize
+        for raw in raws:
+            doi, reason = normalize(raw)
+            cleaned.append(doi)
+            reasons.append(reason)
+        return cleaned, [not reason for reason in reasons], reasons
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1 << 16)
+    def _normalize(raw: str) -> tuple[str, str]:
+        """
+        Memoized for the same strings turning up again and again, across papers
+        and among the junk values of the database.
+        """
+        cleaned = DOI.clean(raw)
+        return cleaned, DOI.invalid_reason(cleaned)
+
+    @staticmethod
+    def cleaned_if_valid(raw: str) -> str | None:
+        cleaned, reason = DOI._normalize(raw)
+        return None if reason else cleaned
 
     @staticmethod
     def _report_bad_doi(doi: Any) -> None:
@@ -86,29 +293,243 @@ class DOI:
         raise InvalidDOIError(f'Bad DOI: "{doi}"')
 
     def exists(self) -> bool | None:
-        self._does_exist = self._cached_api_results.get(self.cleaned)
+        self._does_exist = self._lookup_cached([self.cleaned]).get(self.cleaned)
         if self._does_exist is None:
-            self._does_exist = self._exists_at_api(self.cleaned)
-        # But only bother to cache if there's a real answer
-        if self._does_exist is not None:
-            self._cached_api_results[self.cleaned] = self._does_exist
+            try:
+                self._does_exist = self._exists_at_api(self.cleaned)
+            except ValidationSkipped:
+                return None
+            # But only bother to cache if there's a real answer
+            if self._does_exist is not None:
+                self._store_cached({self.cleaned: self._does_exist})
         return self._does_exist
 
     @classmethod
-    def _exists_at_api(cls, doi: str) -> bool | None:
+    def persistent_cache(cls) -> ValidationCache | None:
+        if not cls.use_persistent_cache:
+            return None
+        if cls._persistent_cache is None:
+            cls._persistent_cache = ValidationCache()
+        return cls._persistent_cache
+
+    @classmethod
+    def _lookup_cached(cls, cleaned: Iterable[str]) -> dict[str, bool]:
+        """
+        In-process answers first, then the on-disk cache; disk hits are kept in memory.
+        """
+        found: dict[str, bool] = {}
+        missing: list[str] = []
+        for doi in cleaned:
+            existence = cls._cached_api_results.get(doi)
+            if existence is None:
+                missing.append(doi)
+            else:
+                found[doi] = existence
+        persistent = cls.persistent_cache()
+        if missing and persistent is not None:
+            try:
+                from_disk = persistent.get_many(missing)
+            except sqlite3.Error as err:
+                logger.info(f"Validation cache unavailable: {err}")
+                from_disk = {}
+            cls._cached_api_results.update(from_disk)
+            found.update(from_disk)
+        return found
+
+    @classmethod
+    def _store_cached(cls, results: dict[str, bool]) -> None:
+        cls._cached_api_results.update(results)
+        persistent = cls.persistent_cache()
+        if results and persistent is not None:
+            try:
+                persistent.set_many(results)
+            except sqlite3.Error as err:
+                logger.info(f"Validation cache unavailable: {err}")
+
+    @classmethod
+    def exists_many(
+        cls,
+        dois: Iterable[str],
+        max_workers: int | None = None,
+        timeout: float | None = None,
+    ) -> dict[str, bool | None]:
+        """
+        DOIs skipped while the circuit breaker is open are left out.
+        """
+        return dict(cls.iter_exists(dois, max_workers=max_workers, timeout=timeout))
+
+    @classmethod
+    def iter_exists(
+        cls,
+        dois: Iterable[str],
+        max_workers: int | None = None,
+        timeout: float | None = None,
+    ) -> Iterator[tuple[str, bool | None]]:
+        """
+        Check many DOIs against the API concurrently over the shared connection pool,
+        yielding (doi, existence) as each answer arrives. Cached answers come first;
+        DOIs skipped while the circuit breaker is open are not yielded.
+        """
+        cleaned = {doi: cls.clean(doi) for doi in dois}
+        cached = cls._lookup_cached(cleaned.values())
+        instrument.count("validate.cached", len(cached))
+        pending: list[str] = []
+        for doi, key in cleaned.items():
+            if key in cached:
+                yield doi, cached[key]
+            else:
+                pending.append(doi)
+        if not pending:
+            return
+        instrument.count("validate.requested", len(pending))
+        workers = min(max_workers or cls.MAX_WORKERS, len(pending))
+        pool = ThreadPoolExecutor(max_workers=workers)
+        answered: dict[str, bool] = {}
+        try:
+            futures = {
+                pool.submit(cls._exists_at_api, cleaned[doi], timeout): doi
+                for doi in pending
+            }
+            for future in as_completed(futures):
+                doi = futures[future]
+                try:
+                    existence = future.result()
+                except ValidationSkipped:
+                    instrument.count("validate.skipped")
+                    continue
+                if existence is not None:
+                    answered[cleaned[doi]] = existence
+                yield doi, existence
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+            cls._store_cached(answered)
+
+    @classmethod
+    async def aexists_many(
+        cls,
+        dois: Iterable[str],
+        timeout: float | None = None,
+        client: "AsyncHeadClient | None" = None,
+    ) -> dict[str, bool | None]:
+        """
+        exists_many for the event loop: requests go out together over the client's
+        connections, each given up after the timeout. Cancelling abandons them all.
+        """
+        # Only reached from a running loop, by which time asyncio is loaded anyway
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        from ash.aio import (  # pylint: disable=import-outside-toplevel
+            AsyncHeadClient,
+        )
+
+        cleaned = {doi: cls.clean(doi) for doi in dois}
+        cached = cls._lookup_cached(cleaned.values())
+        instrument.count("validate.cached", len(cached))
+        found: dict[str, bool | None] = {
+            doi: cached[key] for doi, key in cleaned.items() if key in cached
+        }
+        pending = [doi for doi in cleaned if doi not in found]
+        if not pending:
+            return found
+        instrument.count("validate.requested", len(pending))
+        owned = client is None
+        client = client or AsyncHeadClient(
+            max_connections=cls.MAX_WORKERS, connect_timeout=CONNECT_TIMEOUT
+        )
+        # As with the threads, a request waiting its turn sees whether the ones
+        # before it tripped the breaker
+        turns = asyncio.Semaphore(cls.MAX_WORKERS)
+
+        async def check(doi: str) -> tuple[str, bool | None] | None:
+            async with turns:
+                try:
+                    return doi, await cls._aexists_at_api(client, cleaned[doi], timeout)
+                except ValidationSkipped:
+                    instrument.count("validate.skipped")
+                    return None
+
+        try:
+            answers = [
+                answer
+                for answer in await asyncio.gather(*(check(doi) for doi in pending))
+                if answer is not None
+            ]
+        finally:
+            if owned:
+                await client.close()
+        found.update(answers)
+        cls._store_cached(
+            {
+                cleaned[doi]: existence
+                for doi, existence in answers
+                if existence is not None
+            }
+        )
+        return found
+
+    @classmethod
+    async def _aexists_at_api(
+        cls, client: "AsyncHeadClient", doi: str, timeout: float | None = None
+    ) -> bool | None:
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        if not cls.breaker.allow():
+            raise ValidationSkipped(doi)
         url = cls.API_URL.format(doi=doi)
         logger.info(f"{doi} | {url} | ...")
+        if timeout is None:
+            timeout = CONNECT_TIMEOUT + READ_TIMEOUT
         try:
-            resp = http.request("HEAD", url)
-            resp_status = resp.status
-            existence = cls.API_RESPONSE_MAP.get(resp.status)
+            with instrument.span("validate.request"):
+                resp_status, headers = await asyncio.wait_for(client.head(url), timeout)
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            logger.info(repr(err))
+            cls.breaker.record_failure()
+            resp_status = "Connection to API failed"
+            existence = None
+        else:
+            existence = cls._judge(doi, resp_status, headers.get("retry-after"))
+        logger.info(f"{doi} | {url} | {resp_status} = {existence}")
+        return existence
+
+    @classmethod
+    @instrument.timed("validate.request")
+    def _exists_at_api(cls, doi: str, timeout: float | None = None) -> bool | None:
+        if not cls.breaker.allow():
+            raise ValidationSkipped(doi)
+        url = cls.API_URL.format(doi=doi)
+        logger.info(f"{doi} | {url} | ...")
+        request_options: dict[str, Any] = (
+            {} if timeout is None else {"timeout": timeout}
+        )
+        try:
+            resp = http.request("HEAD", url, **request_options)
         except Exception as err:  # pylint: disable=broad-exception-caught
             logger.info(str(err))
+            cls.breaker.record_failure()
             resp_status = "Connection to API failed"
             existence = None
+        else:
+            resp_status = resp.status
+            existence = cls._judge(doi, resp.status, resp.headers.get("Retry-After"))
         logger.info(f"{doi} | {url} | {resp_status} = {existence}")
         return existence
 
+    @classmethod
+    def _judge(cls, doi: str, status: int, retry_after: str | None) -> bool | None:
+        """
+        Existence from the API's answer, telling the breaker how the call went.
+        """
+        if status == 429:
+            cls.breaker.trip(retry_after_seconds(retry_after))
+            logger.info(f"{doi} | Too many requests; retry after {retry_after}")
+            raise ValidationSkipped(doi)
+        if status >= 500:
+            cls.breaker.record_failure()
+        else:
+            cls.breaker.record_success()
+        return cls.API_RESPONSE_MAP.get(status)
+
     @classmethod
     def clean(cls, s: str) -> str:
         s = str(s)
@@ -122,60 +543,516 @@ class DOI:
         return f"""{self.__class__.__name__}("{self.cleaned}")"""
 
 
+def retry_after_seconds(value: str | None) -> float | None:
+    """
+    Seconds to wait from a Retry-After header, given as seconds or an HTTP date.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    from email.utils import (  # pylint: disable=import-outside-toplevel
+        parsedate_to_datetime,
+    )
+
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+Records = tuple[Mapping[str, str], ...]
+
+
+class RetractionLookup(Protocol):
+    """
+    What a report needs of a database.
+    """
+
+    def lookup_many(self, dois: Iterable[str]) -> dict[str, Records]: ...
+
+
+def file_signature(path: Path) -> dict[str, Any]:
+    stat = path.stat()
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": file_sha256(path),
+    }
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as stream:
+        while block := stream.read(1 << 20):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_signature(source: Path, **params: Any) -> dict[str, Any]:
+    """
+    What a file derived from the source records, to tell later whether it is still
+    current: how it was derived (the params, Ash's version) and from what.
+    """
+    return {**params, "ash": package_version(), **file_signature(source)}
+
+
+def matches_source(signature: Mapping[str, Any], source: Path, **params: Any) -> bool:
+    """
+    Whether a signature still fits the params and the source file; checked
+    cheaply (size, then mtime) before falling back on the content hash.
+    """
+    expected = {**params, "ash": package_version()}
+    if any(signature.get(name) != value for name, value in expected.items()):
+        return False
+    stat = source.stat()
+    if signature.get("size") != stat.st_size:
+        return False
+    return signature.get("mtime_ns") == stat.st_mtime_ns or signature.get(
+        "sha256"
+    ) == file_sha256(source)
+
+
+@contextlib.contextmanager
+def write_atomically(target: Path) -> Generator[IO[bytes], None, None]:
+    """
+    Write to a temporary file beside the target, renamed into place once done, so
+    readers never see a partial file; it is removed should writing fail.
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        dir=target.parent, prefix=target.name, delete=False
+    ) as stream:
+        try:
+            yield stream
+            stream.close()
+            os.replace(stream.name, target)
+        except BaseException:
+            stream.close()
+            with contextlib.suppress(OSError):
+                os.unlink(stream.name)
+            raise
+
+
+def load_derived(
+    path: Path, source: Path, **params: Any
+) -> tuple[Any, dict[str, Any]] | None:
+    """
+    The payload saved by save_derived and its signature, or None if the file is
+    missing or no longer matches the source and params.
+    """
+    try:
+        with path.open("rb") as stream:
+            signature: dict[str, Any] = pickle.load(stream)
+            if not matches_source(signature, source, **params):
+                return None
+            return pickle.load(stream), signature
+    except FileNotFoundError:
+        return None
+
+
+def save_derived(path: Path, signature: Mapping[str, Any], payload: Any) -> None:
+    with write_atomically(path) as stream:
+        pickle.dump(dict(signature), stream, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(payload, stream, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+class RetractionIndex:
+    """
+    Immutable DOI -> retraction records lookup, built once per database.
+
+    DOIs are case-insensitive, so the store is keyed by normalized (cleaned and
+    lowercased) DOIs and any casing can be looked up. Keys are also grouped by
+    registrant prefix, "10.1234".
+    """
+
+    __slots__ = ("_store", "_prefixes", "_dois")
+
+    def __init__(self, store: RecordStore) -> None:
+        self._store = store
+        prefixes: defaultdict[str, list[str]] = defaultdict(list)
+        for key in store:
+            prefixes[self.prefix_of(key)].append(key)
+        self._prefixes: Mapping[str, tuple[str, ...]] = MappingProxyType(
+            {prefix: tuple(keys) for prefix, keys in prefixes.items()}
+        )
+        self._dois: frozenset[str] | None = None
+
+    @staticmethod
+    def normalize(doi: str) -> str:
+        return DOI.clean(doi).lower()
+
+    @staticmethod
+    def prefix_of(doi: str) -> str:
+        return doi.partition("/")[0].lower()
+
+    @property
+    def dois(self) -> frozenset[str]:
+        if self._dois is None:
+            self._dois = frozenset(self._store)
+        return self._dois
+
+    def get(self, doi: str) -> Records:
+        return tuple(self._store[self.normalize(doi)])
+
+    def lookup_many(self, dois: Iterable[str]) -> dict[str, Records]:
+        """
+        Single pass over the given DOIs, returning only those that are retracted,
+        keyed as given.
+        """
+        found: dict[str, Records] = {}
+        with instrument.span("lookup"):
+            for doi in dois:
+                key = self.normalize(doi)
+                if key in self._store:
+                    found[doi] = tuple(self._store[key])
+        instrument.count("lookup.retracted", len(found))
+        return found
+
+    def with_prefix(self, prefix: str) -> frozenset[str]:
+        return frozenset(self._prefixes.get(prefix.lower(), ()))
+
+    @property
+    def prefixes(self) -> frozenset[str]:
+        return frozenset(self._prefixes)
+
+    def __contains__(self, doi: object) -> bool:
+        return isinstance(doi, str) and self.normalize(doi) in self._store
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._store)
+
+
+class _StoreBuilder:
+    """
+    Collects valid rows of a CSV for a RecordStore, keeping only the given columns.
+    """
+
+    # Rows whose DOIs are checked together
+    BATCH = 4096
+
+    def __init__(
+        self, path: Path, columns: list[str], kept: list[str], lazy: bool
+    ) -> None:
+        self.path = path
+        self.columns = columns
+        self.kept = kept
+        self.lazy = lazy
+        self._doi_column = columns.index("OriginalPaperDOI")
+        self._kept_indices = [columns.index(c) for c in kept]
+        self._project = kept != columns
+        self.rows: list[list[str]] = []
+        self.keys: list[str] = []
+        self.offsets: list[int] = []
+        self.fingerprints: list[int] = []
+        self.invalid_dois: list[str] = []
+
+    def add(self, offset: int, digest: int, row: list[str]) -> bool:
+        """
+        Add a parsed row, unless its DOI is invalid.
+        """
+        return self.add_many([(offset, digest, row)])[0]
+
+    def add_many(self, entries: Sequence[tuple[int, int, list[str]]]) -> list[bool]:
+        """
+        Add parsed rows, checking their DOIs all at once; which were added.
+        """
+        width, column = len(self.columns), self._doi_column
+        for _, _, row in entries:
+            row += [""] * (width - len(row))
+        dois, valid, _ = DOI.normalize_many(row[column] for _, _, row in entries)
+        for (offset, digest, row), doi, ok in zip(entries, dois, valid):
+            if not ok:
+                self.invalid_dois.append(row[column])
+                continue
+            if self._project:
+                row = [row[i] for i in self._kept_indices]
+            self.add_valid(offset, digest, row, doi.lower())
+        return valid
+
+    def add_valid(self, offset: int, digest: int, values: list[str], key: str) -> None:
+        self.rows.append(values)
+        self.keys.append(key)
+        self.fingerprints.append(digest)
+        if self.lazy:
+            self.offsets.append(offset)
+
+    def build(self) -> RecordStore:
+        source = CSVSource(self.path, self.columns) if self.lazy else None
+        return RecordStore(
+            self.kept, self.rows, self.keys, source, self.offsets, self.fingerprints
+        )
+
+
+def _build_chunk(
+    template: _StoreBuilder, start: int, stop: int
+) -> tuple[RecordStore, list[str]]:
+    """
+    Store of the rows in one byte range of the CSV, built as the template would,
+    plus the invalid DOIs passed over.
+    """
+    builder = _StoreBuilder(
+        template.path, template.columns, template.kept, template.lazy
+    )
+    with template.path.open("rb") as stream:
+        _ = stream.seek(start)
+        entries = (
+            (offset, fingerprint(record), row)
+            for offset, record, row in takewhile(
+                lambda parsed: parsed[0] < stop, read_csv_rows(stream)
+            )
+        )
+        while batch := list(islice(entries, _StoreBuilder.BATCH)):
+            _ = builder.add_many(batch)
+    return builder.build(), builder.invalid_dois
+
+
 class RetractionDatabase:
     """
     Load and cache the database of retractions from provided CSV.
-    """
 
-    _path_cache: dict[Path, defaultdict[str, list[dict[str, str]]]] = {}
+    The parsed data is also written as a snapshot in the user cache directory, which
+    later loads reuse until the CSV changes size, mtime, and content hash.
+    """
 
-    @log_this
-    def __init__(self, path: Path | str) -> None:
+    SNAPSHOT_VERSION = 4
+    # Below this, starting processes costs more than parsing in parallel saves
+    PARALLEL_LOAD_BYTES = 8 << 20
+    # What a lazy load keeps in memory: the key, the columns reports read, and the ID
+    LAZY_COLUMNS = (
+        "Record ID",
+        "OriginalPaperDOI",
+        "RetractionDate",
+        "RetractionDOI",
+        "RetractionNature",
+    )
+
+    _path_cache: dict[tuple[Path, bool], tuple[RecordStore, RetractionIndex]] = {}
+
+    def __init__(
+        self,
+        path: Path | str,
+        use_snapshot: bool = True,
+        lazy: bool = False,
+        jobs: int = 1,
+    ) -> None:
         self.path = Path(path).resolve()
+        self.use_snapshot = use_snapshot
+        self.lazy = lazy
+        self.jobs = jobs
         self._invalid_dois: list[str] = []
-        self.data = self._get_data()
+        self._dois: frozenset[str] | None = None
+        with instrument.span("load"):
+            self.data, self.index = self._get_data()
 
-    def _get_data(self) -> defaultdict[str, list[dict[str, str]]]:
-        cached_data = self._path_cache.get(self.path)
-        if cached_data is not None:
+    def _get_data(
+        self,
+    ) -> tuple[RecordStore, RetractionIndex]:
+        cached = self._path_cache.get((self.path, self.lazy))
+        if cached is not None:
             logger.info(f"Using cached data from {self.path}")
-            return cached_data
-        data = self._build_data()
-        self._path_cache[self.path] = data
-        return data
+            return cached
+        data = self._load_snapshot() if self.use_snapshot else None
+        if data is None:
+            data = self._build_data()
+            if self.use_snapshot:
+                self._write_snapshot(data, self._source_signature())
+        loaded = (data, RetractionIndex(data))
+        self._path_cache[self.path, self.lazy] = loaded
+        return loaded
 
     @property
-    def dois(self) -> set[str]:
-        return set(self.data.keys())
+    def snapshot_path(self) -> Path:
+        mode = "-lazy" if self.lazy else ""
+        return self.cache_path(self.path, f"{mode}.snapshot")
+
+    @staticmethod
+    def cache_path(path: Path, suffix: str) -> Path:
+        """
+        Where to keep something derived from the CSV at this path.
+        """
+        path_digest = hashlib.sha256(str(path).encode("utf8")).hexdigest()
+        return config.CACHE_DIR / f"{path.stem}-{path_digest[:16]}{suffix}"
+
+    def _source_signature(self) -> dict[str, Any]:
+        return source_signature(self.path, version=self.SNAPSHOT_VERSION)
+
+    @instrument.timed("load.snapshot")
+    def _load_snapshot(self) -> RecordStore | None:
+        """
+        A touched but unchanged CSV gets its snapshot re-stamped, so that its content
+        is hashed only the once.
+        """
+        try:
+            loaded = load_derived(
+                self.snapshot_path, self.path, version=self.SNAPSHOT_VERSION
+            )
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            logger.info(f"Ignoring unreadable snapshot {self.snapshot_path}: {err}")
+            return None
+        if loaded is None:
+            return None
+        (data, self._invalid_dois), source = loaded
+        mtime_ns = self.path.stat().st_mtime_ns
+        if source["mtime_ns"] == mtime_ns:
+            logger.info(f"Using snapshot {self.snapshot_path}")
+            return data
+        if data.source is not None:
+            data.source.mtime_ns = mtime_ns
+        logger.info(f"Using snapshot {self.snapshot_path} (re-stamping unchanged CSV)")
+        self._write_snapshot(data, {**source, "mtime_ns": mtime_ns})
+        return data
+
+    def _write_snapshot(self, data: RecordStore, source: dict[str, Any]) -> None:
+        target = self.snapshot_path
+        try:
+            save_derived(target, source, (data, self._invalid_dois))
+        except OSError as err:
+            logger.info(f"Could not write snapshot {target}: {err}")
+            return
+        logger.info(f"Wrote snapshot {target}")
 
-    def _build_data(self) -> defaultdict[str, list[dict[str, str]]]:
+    @property
+    def dois(self) -> frozenset[str]:
+        """
+        Retracted DOIs as the database writes them; `db.index.dois` has them
+        normalized (lowercase), and `doi in db.index` looks them up in any case.
+        """
+        if self._dois is None:
+            store = self.data
+            self._dois = frozenset(
+                DOI.clean(store.value(row, "OriginalPaperDOI"))
+                for row in range(store.n_rows)
+            )
+        return self._dois
+
+    def lookup_many(self, dois: Iterable[str]) -> dict[str, Records]:
+        return self.index.lookup_many(dois)
+
+    @instrument.timed("load.build")
+    def _build_data(self) -> RecordStore:
         """
-        Build dict of doi -> database columns.
+        Build columnar store of normalized doi -> database rows.
 
-        Consider caching long term, e.g., outfile.write_text(json.dumps(self._data))
+        With several jobs and a large enough CSV, the rows are split into chunks of
+        whole records, each parsed and encoded in a process, and the chunks' stores
+        joined back in file order.
         """
         logger.info(f"Loading retraction database from {self.path.absolute()}...")
+        with self.path.open("rb") as stream:
+            first_offset, header, columns = next(
+                read_csv_rows(stream), (0, b"", list[str]())
+            )
+            builder = self._builder(self.path, columns)
+            start, size = first_offset + len(header), os.fstat(stream.fileno()).st_size
+            if self.jobs > 1 and size - start >= self.PARALLEL_LOAD_BYTES:
+                chunks = split_csv_records(stream, start, size, self.jobs * 4)
+            else:
+                chunks = [(start, size)]
+        if len(chunks) > 1:
+            logger.info(f"... Parsing {len(chunks)} chunks in {self.jobs} processes.")
+            with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+                starts, stops = zip(*chunks)
+                parts = list(
+                    pool.map(functools.partial(_build_chunk, builder), starts, stops)
+                )
+            data = RecordStore.concat([store for store, _ in parts])
+            self._invalid_dois = [doi for _, invalid in parts for doi in invalid]
+        else:
+            data, self._invalid_dois = _build_chunk(builder, start, size)
+        self._log_data_details(data)
+        return data
 
-        data: defaultdict[str, list[dict[str, str]]] = defaultdict(list)
-        with self.path.open(encoding="utf8", errors="backslashreplace") as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                raw_doi = row.get("OriginalPaperDOI", "")
-                try:
-                    doi = DOI(raw_doi)
-                except InvalidDOIError:
-                    self._invalid_dois.append(raw_doi)
+    def _builder(self, path: Path, columns: list[str]) -> "_StoreBuilder":
+        if "OriginalPaperDOI" not in columns:
+            raise ValueError(f"No OriginalPaperDOI column in {path}")
+        kept = [c for c in self.LAZY_COLUMNS if c in columns] if self.lazy else columns
+        return _StoreBuilder(path, columns, kept, self.lazy)
+
+    def update(self, path: Path | str) -> dict[str, Any]:
+        """
+        Move onto a newer release of the CSV. Rows are matched by Record ID, and rows
+        that are byte-for-byte unchanged are carried over without being parsed.
+
+        Returns the diff: Record IDs of rows added, changed, and removed (counting
+        only rows with a valid DOI), how many are unchanged, and which DOIs are newly
+        retracted or no longer listed.
+        """
+        old = self.data
+        new_path = Path(path).resolve()
+        logger.info(f"Updating retraction database from {new_path}...")
+        with new_path.open("rb") as stream:
+            records = iter_csv_records(stream)
+            columns = parse_record(next(records, (0, b""))[1])
+            if "Record ID" not in columns or "Record ID" not in old.columns:
+                raise ValueError(
+                    f"Cannot update {self.path} to {new_path}: no Record ID"
+                )
+            builder = self._builder(new_path, columns)
+            # Rows repeated byte for byte share a fingerprint, so each is one match
+            reusable: dict[int, list[int]] = {}
+            if columns == list(old.columns):
+                for row in reversed(range(old.n_rows)):
+                    reusable.setdefault(old.fingerprints[row], []).append(row)
+            else:
+                logger.info("... Columns differ, so every row will be parsed.")
+            old_keys = old.row_keys()
+            old_ids = {old.value(row, "Record ID"): row for row in range(old.n_rows)}
+            id_column = columns.index("Record ID")
+            added: list[str] = []
+            changed: list[str] = []
+            seen: set[int] = set()
+            for offset, record in records:
+                digest = fingerprint(record)
+                if matches := reusable.get(digest):
+                    old_row = matches.pop()
+                    values = [old.value(old_row, c) for c in old.stored_columns]
+                    builder.add_valid(offset, digest, values, old_keys[old_row])
+                    seen.add(old_row)
+                    continue
+                row = parse_record(record)
+                if not row:
                     continue
-                row_dict = {str(k): str(v) for k, v in row.items()}
-                data[str(doi)].append(row_dict)
+                valid = builder.add(offset, digest, row)
+                old_row = old_ids.get(row[id_column])
+                if old_row is None:
+                    if valid:
+                        added.append(row[id_column])
+                elif valid:
+                    changed.append(row[id_column])
+                    seen.add(old_row)
+        removed = [
+            old.value(row, "Record ID") for row in range(old.n_rows) if row not in seen
+        ]
+        old_dois = self.dois
+        data = builder.build()
+        self.path = new_path
+        self._invalid_dois = builder.invalid_dois
+        self.data, self.index = data, RetractionIndex(data)
+        self._dois = None
+        self._path_cache[self.path, self.lazy] = (self.data, self.index)
+        if self.use_snapshot:
+            self._write_snapshot(data, self._source_signature())
         self._log_data_details(data)
-        return data
+        return {
+            "added": added,
+            "changed": changed,
+            "removed": removed,
+            "unchanged": len(seen) - len(changed),
+            "newly_retracted": sorted(self.dois - old_dois),
+            "no_longer_listed": sorted(old_dois - self.dois),
+        }
 
-    def _log_data_details(self, data: defaultdict[str, list[dict[str, str]]]) -> None:
-        n_valid_entries = sum(len(subdict) for subdict in data.values())
+    def _log_data_details(self, data: RecordStore) -> None:
         logger.info(
             f"... Loaded {len(data):,} valid DOIs"
-            + f" with {n_valid_entries:,} total records."
+            + f" with {data.n_rows:,} total records."
         )
         counted_errors = Counter(self._invalid_dois)
         logger.info(f"... Ignored {len(self._invalid_dois):,} invalid DOIs.")
@@ -192,12 +1069,114 @@ class RetractionDatabase:
             return f"{self.__class__.__name__}(...)"
 
 
+class PrefilteredDatabase:
+    """
+    Screen DOIs against a Bloom filter of the retracted DOIs first, loading the
+    database itself only once some DOI might be retracted.
+
+    The filter takes about 1.8 bytes per DOI at the default error rate. It is kept
+    in the user cache directory and rebuilt whenever the CSV changes.
+    """
+
+    FILTER_VERSION = 1
+    ERROR_RATE = 0.001
+
+    def __init__(
+        self,
+        path: Path | str,
+        use_snapshot: bool = True,
+        lazy: bool = False,
+        error_rate: float = ERROR_RATE,
+        jobs: int = 1,
+    ) -> None:
+        self.path = Path(path).resolve()
+        self.use_snapshot = use_snapshot
+        self.lazy = lazy
+        self.error_rate = error_rate
+        self.jobs = jobs
+        self._database: RetractionDatabase | None = None
+        # An empty filter is falsy, so test for a missing one explicitly
+        if (bloom := self._load_filter()) is None:
+            bloom = self._build_filter()
+        self.bloom = bloom
+
+    @property
+    def filter_path(self) -> Path:
+        return RetractionDatabase.cache_path(self.path, ".bloom")
+
+    @property
+    def database(self) -> RetractionDatabase:
+        if self._database is None:
+            logger.info(f"Possible retraction; loading {self.path}")
+            self._database = RetractionDatabase(
+                self.path,
+                use_snapshot=self.use_snapshot,
+                lazy=self.lazy,
+                jobs=self.jobs,
+            )
+        return self._database
+
+    def might_be_retracted(self, doi: str) -> bool:
+        return RetractionIndex.normalize(doi) in self.bloom
+
+    def lookup_many(self, dois: Iterable[str]) -> dict[str, Records]:
+        with instrument.span("prefilter"):
+            candidates = [doi for doi in dois if self.might_be_retracted(doi)]
+        instrument.count("prefilter.passed", len(candidates))
+        if not candidates:
+            return {}
+        return self.database.lookup_many(candidates)
+
+    def _load_filter(self) -> BloomFilter | None:
+        try:
+            loaded = load_derived(
+                self.filter_path,
+                self.path,
+                version=self.FILTER_VERSION,
+                error_rate=self.error_rate,
+            )
+            if loaded is None:
+                return None
+            bloom = BloomFilter.from_bytes(loaded[0])
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            logger.info(f"Ignoring unreadable filter {self.filter_path}: {err}")
+            return None
+        logger.info(f"Using filter {self.filter_path}")
+        return bloom
+
+    def _build_filter(self) -> BloomFilter:
+        bloom = BloomFilter.from_keys(self.database.index, self.error_rate)
+        source = source_signature(
+            self.path, version=self.FILTER_VERSION, error_rate=self.error_rate
+        )
+        target = self.filter_path
+        try:
+            save_derived(target, source, bloom.to_bytes())
+        except OSError as err:
+            logger.info(f"Could not write filter {target}: {err}")
+        else:
+            logger.info(f"Wrote filter {target} ({bloom!r})")
+        return bloom
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}('{self.path}')"
+
+
 class MIMEHandler(Protocol):
 
+    # Bump in a handler whenever a change to it could change the DOIs it finds
+    VERSION = 1
+
     @abstractmethod
     def extract_dois(self, data: Any) -> list[str]: ...
 
 
+H = TypeVar("H", bound=type[MIMEHandler])
+
+# ("zombie" or "doi", details), as Paper.iter_report yields them
+ReportItem = tuple[str, dict[str, Any]]
+
+
 class Paper:
 
     _MIME_handlers: dict[str, type[MIMEHandler]] = {}
@@ -205,44 +1184,198 @@ class Paper:
     def __init__(self, data: Any, mime_type: str) -> None:
         self.mime_type = mime_type
         handler = self._get_handler(self.mime_type)
-        self.dois = handler.extract_dois(data)
+        with instrument.span("extract"):
+            self.dois = handler.extract_dois(data)
+        instrument.count("dois.extracted", len(self.dois))
 
     @classmethod
-    def from_path(cls, path: Path | str, mime_type: str | None = None) -> "Paper":
+    def from_path(
+        cls,
+        path: Path | str,
+        mime_type: str | None = None,
+        cache: ExtractionCache | None = None,
+    ) -> "Paper":
+        """
+        With a cache, DOIs extracted before from the same bytes are reused rather
+        than extracted again.
+        """
         path = Path(path)
         if not path.exists():
             raise FileNotFoundError(path)
         mime_type = mime_type or path_to_mime_type(path)
+        if cache is None:
+            with path.open("rb") as stream:
+                return cls(stream, mime_type)
+        key = cache.key(file_sha256(path), cls._get_handler(mime_type))
+        try:
+            cached = cache.get(key)
+        except sqlite3.Error as err:
+            logger.info(f"Extraction cache unavailable: {err}")
+            cached = None
+        if cached is not None:
+            instrument.count("extract.cached")
+            return cls.from_dois(cached, mime_type)
         with path.open("rb") as stream:
-            return cls(stream, mime_type)
+            paper = cls(stream, mime_type)
+        try:
+            cache.set(key, paper.dois)
+        except sqlite3.Error as err:
+            logger.info(f"Extraction cache unavailable: {err}")
+        return paper
+
+    @classmethod
+    async def afrom_path(
+        cls,
+        path: Path | str,
+        mime_type: str | None = None,
+        cache: ExtractionCache | None = None,
+        executor: "Executor | None" = None,
+    ) -> "Paper":
+        """
+        from_path in the executor (the loop's default thread pool if none), so the
+        event loop keeps running while the file is read.
+        """
+        import asyncio  # pylint: disable=import-outside-toplevel
 
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, functools.partial(cls.from_path, path, mime_type, cache)
+        )
+
+    @classmethod
+    def from_dois(cls, dois: Iterable[str], mime_type: str = "text/plain") -> "Paper":
+        """
+        For DOIs already extracted elsewhere, e.g., in a worker process.
+        """
+        paper = cls.__new__(cls)
+        paper.mime_type = mime_type
+        paper.dois = list(dois)
+        return paper
+
+    @classmethod
+    def supports(cls, mime_type: str) -> bool:
+        return mime_type in cls._MIME_handlers
+
+    @instrument.timed("report")
     def report(
         self,
-        db: RetractionDatabase | Path | str,
+        db: RetractionLookup | Path | str,
         validate_dois: bool = True,
+        on_item: Callable[[str, dict[str, Any]], None] | None = None,
     ) -> dict[str, Any]:
-        if isinstance(db, (Path, str)):
-            db = RetractionDatabase(db)
-        dois_report = self._generate_dois_report(db, validate=validate_dois)
-        zombie_report = self._generate_zombie_report(db)
+        """
+        With on_item, each piece of the report is also passed to it as soon as it
+        is known, as iter_report yields them.
+        """
+        zombie_report: list[dict[str, Any]] = []
+        found: dict[str, dict[str, Any]] = {}
+        for kind, item in self.iter_report(db, validate_dois):
+            if on_item is not None:
+                on_item(kind, item)
+            if kind == "zombie":
+                zombie_report.append(item)
+            else:
+                found[item["DOI"]] = item
+        dois_report = {
+            doi: {key: value for key, value in found[doi].items() if key != "DOI"}
+            for doi in self.dois
+        }
         return {"dois": dois_report, "zombies": zombie_report}
 
-    def _generate_dois_report(
-        self, db: RetractionDatabase, validate: bool
+    def iter_report(
+        self,
+        db: RetractionLookup | Path | str,
+        validate_dois: bool = True,
+    ) -> Iterator[ReportItem]:
+        """
+        The report piece by piece: first ("zombie", entry) for each retraction
+        record cited, then ("doi", {"DOI": doi, ...}) for each DOI. When validating,
+        DOIs come in the order their answers arrive, cached ones first.
+        """
+        if isinstance(db, (Path, str)):
+            db = RetractionDatabase(db)
+        retracted = db.lookup_many(self.dois)
+        for zombie in self._generate_zombie_report(retracted):
+            yield "zombie", zombie
+        if not validate_dois:
+            for doi in dict.fromkeys(self.dois):
+                yield "doi", {"DOI": doi, **self._doi_entry(doi, retracted, None)}
+            return
+        unanswered = dict.fromkeys(self.dois)
+        with instrument.span("validate"):
+            for doi, existence in DOI.iter_exists(self.dois):
+                _ = unanswered.pop(doi, None)
+                entry = self._doi_entry(doi, retracted, {doi: existence})
+                yield "doi", {"DOI": doi, **entry}
+        for doi in unanswered:
+            yield "doi", {"DOI": doi, **self._doi_entry(doi, retracted, {})}
+
+    async def areport(
+        self,
+        db: RetractionLookup | Path | str,
+        validate_dois: bool = True,
+        timeout: float | None = None,
+        client: "AsyncHeadClient | None" = None,
     ) -> dict[str, Any]:
-        if not validate:
-            return {doi: {"Retracted": (doi in db.dois)} for doi in self.dois}
+        """
+        report for the event loop. A database given by path is loaded in a thread;
+        DOIs are validated without blocking, each request given up after the
+        timeout, over the client's connections if given.
+        """
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        with instrument.span("report"):
+            if isinstance(db, (Path, str)):
+                db = await asyncio.to_thread(RetractionDatabase, db)
+            retracted = db.lookup_many(self.dois)
+            existence = None
+            if validate_dois:
+                with instrument.span("validate"):
+                    existence = await DOI.aexists_many(self.dois, timeout, client)
+            return self.assemble_report(retracted, existence)
 
+    def assemble_report(
+        self,
+        retracted: Mapping[str, Records],
+        existence: Mapping[str, bool | None] | None = None,
+    ) -> dict[str, Any]:
+        """
+        The report from answers already in hand, which may cover more DOIs than this
+        paper cites; without existence, DOIs are left unvalidated.
+        """
+        cited = {doi: retracted[doi] for doi in self.dois if doi in retracted}
         return {
-            doi: {
-                "DOI is valid": DOI(doi).exists(),
-                "Retracted": (doi in db.dois),
-            }
-            for doi in self.dois
+            "dois": self._dois_report(cited, existence),
+            "zombies": self._generate_zombie_report(cited),
         }
 
-    def _generate_zombie_report(self, db: RetractionDatabase) -> list[dict[str, Any]]:
-        zombies = sorted([doi for doi in self.dois if doi in db.dois])
+    def _dois_report(
+        self,
+        retracted: Mapping[str, Records],
+        existence: Mapping[str, bool | None] | None,
+    ) -> dict[str, Any]:
+        return {doi: self._doi_entry(doi, retracted, existence) for doi in self.dois}
+
+    @staticmethod
+    def _doi_entry(
+        doi: str,
+        retracted: Mapping[str, Records],
+        existence: Mapping[str, bool | None] | None,
+    ) -> dict[str, Any]:
+        if existence is None:
+            return {"Retracted": (doi in retracted)}
+        if doi not in existence:
+            # Not a failed check but none at all, as the API was backed off from
+            return {
+                "DOI is valid": None,
+                "Retracted": (doi in retracted),
+                "Validation": "skipped",
+            }
+        return {"DOI is valid": existence[doi], "Retracted": (doi in retracted)}
+
+    def _generate_zombie_report(
+        self, retracted: Mapping[str, Records]
+    ) -> list[dict[str, Any]]:
         zombie_report = [
             {
                 "Zombie": doi,
@@ -250,17 +1383,15 @@ class Paper:
                 "Date": record["RetractionDate"],
                 "Notice DOI": f"https://doi.org/{record.get('RetractionDOI')}",
             }
-            for doi in zombies
-            for record in db.data[doi]
+            for doi in sorted(retracted)
+            for record in retracted[doi]
         ]
         return zombie_report
 
     @classmethod
-    def register_handler(
-        cls, mime_type: str
-    ) -> Callable[[type[MIMEHandler]], type[MIMEHandler]]:
+    def register_handler(cls, mime_type: str) -> Callable[[H], H]:
 
-        def registrar_decorator(delegate: type[MIMEHandler]) -> type[MIMEHandler]:
+        def registrar_decorator(delegate: H) -> H:
             cls._MIME_handlers[mime_type] = delegate
             return delegate
 
@@ -277,14 +1408,185 @@ class Paper:
         return handler()
 
 
+class PaperBatch:
+    """
+    Many papers reported together. Each DOI cited anywhere in the batch is looked
+    up, and validated, once; the answers are then shared out to every paper that
+    cites it, as if each had been reported alone.
+
+    Papers are named by their path, or by their position if given as Papers.
+    """
+
+    MOST_CITED = 10
+
+    def __init__(
+        self,
+        papers: Iterable["Paper | Path | str"] = (),
+        cache: ExtractionCache | None = None,
+    ) -> None:
+        self.papers: dict[str, Paper] = {}
+        self.cache = cache
+        for paper in papers:
+            self.add(paper)
+
+    def add(self, paper: "Paper | Path | str", name: str | None = None) -> None:
+        if not isinstance(paper, Paper):
+            name = name or str(paper)
+            paper = Paper.from_path(paper, cache=self.cache)
+        self.papers[name or str(len(self.papers))] = paper
+
+    @property
+    def dois(self) -> list[str]:
+        """
+        Every DOI cited in the batch, once each, in order of first citation.
+        """
+        return list(
+            dict.fromkeys(chain.from_iterable(p.dois for p in self.papers.values()))
+        )
+
+    @instrument.timed("report")
+    def report(
+        self,
+        db: RetractionLookup | Path | str,
+        validate_dois: bool = True,
+        most_cited: int = MOST_CITED,
+    ) -> dict[str, Any]:
+        """
+        {"papers": {name: report}, "summary": {...}}, each report the same as
+        Paper.report gives, the summary ranking the retracted works cited by the
+        most papers.
+        """
+        if isinstance(db, (Path, str)):
+            db = RetractionDatabase(db)
+        dois = self.dois
+        instrument.count("batch.unique_dois", len(dois))
+        retracted = db.lookup_many(dois)
+        existence = None
+        if validate_dois:
+            with instrument.span("validate"):
+                existence = DOI.exists_many(dois)
+        reports = {
+            name: paper.assemble_report(retracted, existence)
+            for name, paper in self.papers.items()
+        }
+        return {
+            "papers": reports,
+            "summary": self._summarize(reports, retracted, len(dois), most_cited),
+        }
+
+    @staticmethod
+    def _summarize(
+        reports: Mapping[str, Any],
+        retracted: Mapping[str, Records],
+        n_unique: int,
+        most_cited: int,
+    ) -> dict[str, Any]:
+        # DOIs differing only in case are the same work
+        citing: defaultdict[str, list[str]] = defaultdict(list)
+        shown: dict[str, str] = {}
+        for name, report in reports.items():
+            for doi in dict.fromkeys(
+                RetractionIndex.normalize(z["Zombie"]) for z in report["zombies"]
+            ):
+                citing[doi].append(name)
+        for doi in retracted:
+            _ = shown.setdefault(RetractionIndex.normalize(doi), doi)
+        ranked = sorted(citing, key=lambda doi: (-len(citing[doi]), doi))
+        return {
+            "papers": len(reports),
+            "dois": sum(len(r["dois"]) for r in reports.values()),
+            "unique_dois": n_unique,
+            "zombies": sum(len(r["zombies"]) for r in reports.values()),
+            "papers_with_zombies": sum(bool(r["zombies"]) for r in reports.values()),
+            "most_cited_retracted": [
+                {
+                    "DOI": shown[doi],
+                    "Cited by": len(citing[doi]),
+                    "Papers": citing[doi],
+                    "Item": retracted[shown[doi]][0]["RetractionNature"],
+                }
+                for doi in ranked[:most_cited]
+            ],
+        }
+
+    def __len__(self) -> int:
+        return len(self.papers)
+
+
 @Paper.register_handler("application/pdf")
 @Paper.register_handler("application/acrobat")
 class PDFHandler(MIMEHandler):
+    """
+    Pages are extracted and scanned one at a time, so only about a page of text is
+    held at once. With processes > 1, PDFs of at least pages_per_process * 2 pages
+    have their page ranges spread across worker processes.
+    """
+
+    processes = 1
+    pages_per_process = 16
+
+    # A DOI cut off by the page break, e.g. "10.1016/S0140-" + "6736(14)60921-1"
+    DANGLING_DOI = re.compile(r"10.\d{4,9}/\S*-$")
 
     def extract_dois(self, data: Any) -> list[str]:
+        from pypdf import PdfReader  # pylint: disable=import-outside-toplevel
+
         reader = PdfReader(stream=data)  # type: ignore -- it takes FileStorage fine
-        complete_text = "\n".join(page.extract_text() for page in reader.pages)
-        return text_to_dois(complete_text)
+        n_pages = len(reader.pages)
+        workers = min(self.processes, n_pages // self.pages_per_process)
+        if workers > 1:
+            return self._extract_in_processes(data, n_pages, workers)
+        return self.scan_pages(reader, 0, n_pages)
+
+    @classmethod
+    def scan_pages(cls, reader: "PdfReader", start: int, stop: int) -> list[str]:
+        """
+        Pages are joined by newlines, except that a page ending in a dangling DOI is
+        glued to the first token of the next page -- even past `stop`.
+        """
+        stream = DOIStream()
+        found: list[str] = []
+        dangling = False
+        for number in range(start, stop):
+            text = reader.pages[number].extract_text()
+            if dangling:
+                text = text.lstrip()
+            elif number > start:
+                found += stream.feed("\n")
+            dangling = cls._is_dangling(text)
+            found += stream.feed(text.rstrip() if dangling else text)
+        if dangling and stop < len(reader.pages):
+            following = reader.pages[stop].extract_text().split(maxsplit=1)
+            found += stream.feed(following[0] if following else "")
+        found += stream.close()
+        return found
+
+    @classmethod
+    def _is_dangling(cls, text: str) -> bool:
+        return bool(cls.DANGLING_DOI.search(text[-256:].rstrip()))
+
+    def _extract_in_processes(self, data: Any, n_pages: int, workers: int) -> list[str]:
+        # Workers reopen the file by name if there is one, rather than take a copy
+        source: str | bytes = getattr(data, "name", None) or b""
+        if not isinstance(source, str) or not Path(source).is_file():
+            _ = data.seek(0)
+            source = data.read()
+        bounds = [n_pages * i // workers for i in range(workers + 1)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(
+                _scan_pdf_page_range,
+                [source] * workers,
+                bounds[:-1],
+                bounds[1:],
+            )
+            return list(dict.fromkeys(chain.from_iterable(results)))
+
+
+def _scan_pdf_page_range(source: str | bytes, start: int, stop: int) -> list[str]:
+    stream = BytesIO(source) if isinstance(source, bytes) else source
+    from pypdf import PdfReader  # pylint: disable=import-outside-toplevel
+
+    return PDFHandler.scan_pages(PdfReader(stream), start, stop)
 
 
 @Paper.register_handler(
@@ -299,20 +1601,41 @@ class DOCXHandler(MIMEHandler):
     WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
     PARA = WORD_NAMESPACE + "p"
     TEXT = WORD_NAMESPACE + "t"
+    PARTS = ("word/document.xml", "word/footnotes.xml", "word/endnotes.xml")
 
     def extract_dois(self, data: Any) -> list[str]:
+        return list(self.iter_dois(data))
 
+    def iter_dois(self, data: Any) -> Iterator[str]:
+        stream = DOIStream()
         with zipfile.ZipFile(data) as document:
-            xml_content = document.read("word/document.xml")
-        tree = XML(xml_content)
+            present = set(document.namelist())
+            for part in self.PARTS:
+                if part not in present:
+                    continue
+                with document.open(part) as xml_stream:
+                    for paragraph in self._iter_paragraphs(xml_stream):
+                        yield from stream.feed(paragraph + "\n\n")
+        yield from stream.close()
 
-        paragraphs: list[str] = []
-        for paragraph in tree.iter(self.PARA):
-            texts = [node.text for node in paragraph.iter(self.TEXT) if node.text]
-            if texts:
-                paragraphs.append("".join(texts))
-        result = "\n\n".join(paragraphs)
-        return text_to_dois(result)
+    def _iter_paragraphs(self, xml_stream: IO[bytes]) -> Iterator[str]:
+        """
+        Paragraphs are cleared once read, and finished children of the root and body
+        are dropped, so memory stays flat however long the document.
+        """
+        ancestors: list[Element] = []
+        for event, element in iterparse(xml_stream, events=("start", "end")):
+            if event == "start":
+                ancestors.append(element)
+                continue
+            _ = ancestors.pop()
+            if element.tag == self.PARA:
+                texts = [node.text for node in element.iter(self.TEXT) if node.text]
+                if texts:
+                    yield "".join(texts)
+                element.clear()
+            if 0 < len(ancestors) <= 2:
+                ancestors[-1].clear()
 
 
 @Paper.register_handler("application/rtf")  # .rtf on Linux
@@ -321,6 +1644,9 @@ class RTFHandler(MIMEHandler):
 
     def extract_dois(self, data: Any) -> list[str]:
         ingested_rtf = data.read().decode()
+        # pylint: disable-next=import-outside-toplevel
+        from striprtf.striprtf import rtf_to_text  # type: ignore
+
         text: str = rtf_to_text(ingested_rtf)  # type: ignore
         return text_to_dois(text)  # type: ignore
 
@@ -331,17 +1657,33 @@ class RTFHandler(MIMEHandler):
 @Paper.register_handler("text/x-latex")
 @Paper.register_handler("application/x-latex")
 class PlainTextHandler(MIMEHandler):
+    """
+    Streams are read CHUNK_SIZE at a time and decoded incrementally, so a UTF-8
+    character split between chunks survives, and memory is bounded by the chunk
+    size rather than the file size. DOIStream carries over enough of each chunk
+    to finish any DOI cut off at its end.
+    """
 
-    def extract_dois(self, data: Any) -> list[str]:
-        if isinstance(data, str):
-            return text_to_dois(data)
-        first_read = data.read()
-        if isinstance(first_read, str):
-            return text_to_dois(first_read)
-        return text_to_dois(first_read.decode("utf-8"))
+    CHUNK_SIZE = 1 << 20
 
+    def extract_dois(self, data: Any) -> list[str]:
+        return list(self.iter_dois(data))
 
-@log_this
+    def iter_dois(self, data: Any) -> Iterator[str]:
+        if isinstance(data, str):
+            yield from text_to_dois(data)
+            return
+        stream = DOIStream()
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        while chunk := data.read(self.CHUNK_SIZE):
+            yield from stream.feed(
+                chunk if isinstance(chunk, str) else decoder.decode(chunk)
+            )
+        yield from stream.feed(decoder.decode(b"", final=True))
+        yield from stream.close()
+
+
+@instrument.timed("mime")
 def path_to_mime_type(path: str | Path) -> str:
     """
     We will usually expect to have the path available, and so we can use the builtin
@@ -360,13 +1702,97 @@ def binary_mime_check(obj: Any) -> str:
 
     Note that the filetype package lacks correct typing.
     """
+    import filetype  # type: ignore # pylint: disable=import-outside-toplevel
+
     kind = filetype.guess(obj)  # type: ignore
     if kind is None:
         raise TypeError(f"Could not determine MIME type of {obj}")
     return kind.mime
 
 
+class DOIStream:
+    """
+    Scan text arriving in chunks for DOIs, with the same results as scanning the
+    whole text at once, emitting each DOI only the first time it is seen.
+
+    Matches ending within OVERLAP characters of the end of what has arrived might yet
+    grow, so they are held back and that tail carried over into the next chunk.
+    """
+
+    OVERLAP = 1024
+    # Punctuation after a DOI in running text, which the patterns (the broad
+    # 10.1002 one especially) take in along with the DOI
+    TRAILING_PUNCTUATION = ",;:.)]"
+    # Marks closing around a DOI, as in {10.1002/abc} or "10.1002/abc", which the
+    # broad 10.1002 pattern runs on through but the general pattern stops at
+    CLOSING_MARKS = "\"'}>\u201d\u2019\u00bb"
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._seen: set[str] = set()
+
+    def feed(self, chunk: str) -> list[str]:
+        self._buffer += chunk
+        return self._scan(final=False)
+
+    def close(self) -> list[str]:
+        return self._scan(final=True)
+
+    @instrument.timed("scan")
+    def _scan(self, final: bool) -> list[str]:
+        buffer = self._buffer
+        safe_end = len(buffer) if final else len(buffer) - self.OVERLAP
+        cut = max(safe_end, 0)
+        found: list[str] = []
+        for match in DOI.PATTERN.finditer(buffer):
+            if not final and match.end() >= safe_end:
+                cut = match.start()
+                break
+            found.append(self._trimmed(self._delimited(match)))
+        self._buffer = buffer[cut:]
+        return self._new_dois(found)
+
+    @classmethod
+    def _delimited(cls, match: re.Match[str]) -> str:
+        """
+        The general pattern's reading where the match runs on past a closing mark,
+        so `doi = {10.1002/abc},` gives 10.1002/abc; SICI DOIs, which go on past
+        the general pattern at their "<", are kept whole.
+        """
+        general = DOI.REGEXES[0].match(match.string, match.start())
+        if (
+            general is not None
+            and general.end() < match.end()
+            and match.string[general.end()] in cls.CLOSING_MARKS
+        ):
+            return general.group()
+        return match.group()
+
+    @classmethod
+    def _trimmed(cls, text: str) -> str:
+        """
+        Without trailing punctuation, as in "(doi:10.1002/abc.123), and", though a
+        closing parenthesis is kept where it closes one in the DOI.
+        """
+        while text and text[-1] in cls.TRAILING_PUNCTUATION:
+            if text[-1] == ")" and text.count("(") >= text.count(")"):
+                break
+            text = text[:-1]
+        return text
+
+    def _new_dois(self, raw: Iterable[str]) -> list[str]:
+        new: list[str] = []
+        cleaned, valid, _ = DOI.normalize_many(dict.fromkeys(raw))
+        for doi, ok in zip(cleaned, valid):
+            if ok and doi not in self._seen:
+                self._seen.add(doi)
+                new.append(doi)
+        return new
+
+
 def text_to_dois(text: str) -> list[str]:
-    matches = [pattern.findall(text) for pattern in DOI.REGEXES]
-    dois = list(chain.from_iterable(matches))
-    return [str(DOI(d)) for d in dois]
+    """
+    Single pass over the text, returning unique cleaned DOIs in order of appearance.
+    """
+    stream = DOIStream()
+    return stream.feed(text) + stream.close()
@@ -0,0 +1,277 @@
+"""
+Read-only retraction database in one file, memory-mapped rather than loaded.
+
+Every process that opens the file maps the same pages of the OS page cache, so N
+workers cost about what one does, and opening takes no parsing at all.
+
+The file holds, after a fixed header and a JSON block of metadata:
+
+    key offsets     n_keys + 1 native uint64, into the key blob
+    row starts      n_keys + 1 native uint64, each key's first record
+    record offsets  n_rows + 1 native uint64, into the record blob
+    key blob        normalized DOIs, UTF-8, sorted bytewise
+    record blob     each row as a JSON list of its column values
+
+Rows are ordered by key, so a key's records are contiguous and a lookup is a
+binary search over the keys followed by one slice of the record blob.
+"""
+
+import json
+import logging
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+from ash import instrument
+from ash.main import (
+    Records,
+    RetractionDatabase,
+    RetractionIndex,
+    matches_source,
+    source_signature,
+    write_atomically,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class MappedRetractionDatabase:
+    """
+    DOI -> retraction records, answered straight from a memory-mapped file.
+
+    Build the file once with `build` (or let `from_csv` build and reuse it beside
+    the snapshots), then open it from as many processes as needed. For shared
+    memory proper, build it on a tmpfs such as /dev/shm.
+    """
+
+    MAGIC = b"ASHMAP\x00\x00"
+    VERSION = 1
+    _HEADER = struct.Struct("<8sH6xQQQ")
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        self._tables: "list[memoryview[int]]" = []
+        with self.path.open("rb") as stream:
+            self._mmap = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            layout = self._read_layout()
+        except Exception:
+            self.close()
+            raise
+        self.meta: dict[str, Any] = layout["meta"]
+        self.columns: tuple[str, ...] = tuple(self.meta["columns"])
+        self.n_keys: int = layout["n_keys"]
+        self.n_rows: int = layout["n_rows"]
+        self._key_offsets: "memoryview[int]" = layout["key_offsets"]
+        self._row_starts: "memoryview[int]" = layout["row_starts"]
+        self._record_offsets: "memoryview[int]" = layout["record_offsets"]
+        self._keys_at: int = layout["keys_at"]
+        self._records_at: int = layout["records_at"]
+
+    def _read_layout(self) -> dict[str, Any]:
+        if len(self._mmap) < self._HEADER.size:
+            raise ValueError(f"{self.path} is not a mapped retraction database")
+        header: tuple[bytes, int, int, int, int] = self._HEADER.unpack_from(self._mmap)
+        magic, version, n_keys, n_rows, meta_length = header
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError(f"{self.path} is not a mapped database of this version")
+        start = self._HEADER.size
+        meta: dict[str, Any] = json.loads(self._mmap[start : start + meta_length])
+        if meta["byteorder"] != sys.byteorder:
+            raise ValueError(f"{self.path} was built with other byte order")
+        table = _aligned(start + meta_length)
+        keys_at = table + 16 * (n_keys + 1) + 8 * (n_rows + 1)
+        if keys_at > len(self._mmap):
+            raise ValueError(f"{self.path} is truncated")
+        key_offsets = self._table(table, n_keys + 1)
+        record_offsets = self._table(table + 16 * (n_keys + 1), n_rows + 1)
+        records_at = keys_at + key_offsets[n_keys]
+        if records_at + record_offsets[n_rows] != len(self._mmap):
+            raise ValueError(f"{self.path} is truncated")
+        return {
+            "meta": meta,
+            "n_keys": n_keys,
+            "n_rows": n_rows,
+            "key_offsets": key_offsets,
+            "row_starts": self._table(table + 8 * (n_keys + 1), n_keys + 1),
+            "record_offsets": record_offsets,
+            "keys_at": keys_at,
+            "records_at": records_at,
+        }
+
+    def _table(self, start: int, length: int) -> "memoryview[int]":
+        table: "memoryview[int]" = memoryview(self._mmap)[
+            start : start + 8 * length
+        ].cast("Q")
+        self._tables.append(table)
+        return table
+
+    @classmethod
+    def build(
+        cls, db: RetractionDatabase, path: Path | str
+    ) -> "MappedRetractionDatabase":
+        """
+        Write the database's records to a mapped file at the path, and open it.
+        Processes opening the path meanwhile see the old file or none, never a part.
+        """
+        data = db.data
+        keys = sorted(data, key=lambda k: k.encode("utf8"))
+        row_keys = data.row_keys()
+        by_key: dict[str, list[int]] = {}
+        for row, key in enumerate(row_keys):
+            by_key.setdefault(key, []).append(row)
+        key_offsets = array("Q", [0])
+        row_starts = array("Q", [0])
+        record_offsets = array("Q", [0])
+        key_blob = bytearray()
+        record_blob = bytearray()
+        for key in keys:
+            key_blob += key.encode("utf8")
+            key_offsets.append(len(key_blob))
+            for row in by_key[key]:
+                values = [data.value(row, c) for c in data.stored_columns]
+                record_blob += json.dumps(values, ensure_ascii=False).encode("utf8")
+                record_offsets.append(len(record_blob))
+            row_starts.append(len(record_offsets) - 1)
+        meta = json.dumps(
+            {
+                "columns": list(data.stored_columns),
+                "byteorder": sys.byteorder,
+                "source": source_signature(db.path, path=str(db.path)),
+            }
+        ).encode("utf8")
+        header = cls._HEADER.pack(
+            cls.MAGIC, cls.VERSION, len(keys), len(record_offsets) - 1, len(meta)
+        )
+        padding = b"\x00" * (
+            _aligned(len(header) + len(meta)) - len(header) - len(meta)
+        )
+
+        target = Path(path)
+        with write_atomically(target) as stream:
+            for part in (
+                header,
+                meta,
+                padding,
+                key_offsets,
+                row_starts,
+                record_offsets,
+                key_blob,
+                record_blob,
+            ):
+                _ = stream.write(part)
+        logger.info(f"Wrote mapped database {target}")
+        return cls(target)
+
+    @classmethod
+    def from_csv(
+        cls, path: Path | str, use_snapshot: bool = True
+    ) -> "MappedRetractionDatabase":
+        """
+        Open the mapped file kept for this CSV in the user cache directory, first
+        building it if it is missing or the CSV has since changed.
+        """
+        source = Path(path).resolve()
+        target = RetractionDatabase.cache_path(source, ".mapped")
+        try:
+            mapped = cls(target)
+        except FileNotFoundError:
+            pass
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            logger.info(f"Ignoring unreadable mapped database {target}: {err}")
+        else:
+            if mapped.built_from(source):
+                logger.info(f"Using mapped database {target}")
+                return mapped
+            mapped.close()
+        return cls.build(RetractionDatabase(source, use_snapshot=use_snapshot), target)
+
+    def built_from(self, path: Path) -> bool:
+        """
+        Whether the file was built, by this release of Ash, from the CSV at this path
+        as it is now.
+        """
+        return matches_source(self.meta["source"], path, path=str(path))
+
+    def _key(self, i: int) -> bytes:
+        start = self._keys_at
+        return self._mmap[
+            start + self._key_offsets[i] : start + self._key_offsets[i + 1]
+        ]
+
+    def _find(self, key: bytes) -> int:
+        # The hot loop of a lookup, so _key is inlined
+        mapped, offsets, start = self._mmap, self._key_offsets, self._keys_at
+        low, high = 0, self.n_keys
+        while low < high:
+            middle = (low + high) // 2
+            if mapped[start + offsets[middle] : start + offsets[middle + 1]] < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.n_keys and self._key(low) == key:
+            return low
+        return -1
+
+    def _records(self, i: int) -> Records:
+        offsets, start = self._record_offsets, self._records_at
+        return tuple(
+            dict(zip(self.columns, json.loads(self._mmap[start + a : start + b])))
+            for a, b in (
+                (offsets[row], offsets[row + 1])
+                for row in range(self._row_starts[i], self._row_starts[i + 1])
+            )
+        )
+
+    def get(self, doi: str) -> Records:
+        i = self._find(RetractionIndex.normalize(doi).encode("utf8"))
+        return self._records(i) if i >= 0 else ()
+
+    def lookup_many(self, dois: Iterable[str]) -> dict[str, Records]:
+        """
+        The retracted among the DOIs, keyed as given, as from RetractionDatabase.
+        """
+        found: dict[str, Records] = {}
+        with instrument.span("lookup"):
+            for doi in dois:
+                i = self._find(RetractionIndex.normalize(doi).encode("utf8"))
+                if i >= 0:
+                    found[doi] = self._records(i)
+        instrument.count("lookup.retracted", len(found))
+        return found
+
+    def __contains__(self, doi: object) -> bool:
+        return (
+            isinstance(doi, str)
+            and self._find(RetractionIndex.normalize(doi).encode("utf8")) >= 0
+        )
+
+    def __len__(self) -> int:
+        return self.n_keys
+
+    def __iter__(self) -> Iterator[str]:
+        return (self._key(i).decode("utf8") for i in range(self.n_keys))
+
+    def close(self) -> None:
+        # The mapping cannot close while views of it remain
+        for table in self._tables:
+            table.release()
+        self._tables.clear()
+        self._mmap.close()
+
+    def __enter__(self) -> "MappedRetractionDatabase":
+        return self
+
+    def __exit__(self, *exc_details: object) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}('{self.path}')"
+
+
+def _aligned(offset: int) -> int:
+    return (offset + 7) & ~7
@@ -0,0 +1,437 @@
+import csv
+import hashlib
+import mmap
+import os
+import re
+from array import array
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from pathlib import Path
+from typing import IO, Any
+
+
+class RetractionRecord(Mapping[str, str]):
+    """
+    Lightweight read-only view of one row of a RecordStore, usable like the dict of
+    CSV columns it replaces.
+    """
+
+    __slots__ = ("_store", "_row", "_full")
+
+    def __init__(self, store: "RecordStore", row: int) -> None:
+        self._store = store
+        self._row = row
+        self._full: dict[str, str] | None = None
+
+    def __getitem__(self, column: str) -> str:
+        if self._store.holds(column):
+            return self._store.value(self._row, column)
+        if self._full is None:
+            # Columns left out of a lazy load: parse the whole row once, on first use
+            self._full = self._store.read_row(self._row)
+        return self._full[column]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._store.columns)
+
+    def __len__(self) -> int:
+        return len(self._store.columns)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(self)!r})"
+
+
+class TextColumn:
+    """
+    All values of a column as one UTF-8 blob, sliced by offsets on access.
+    """
+
+    __slots__ = ("blob", "offsets")
+
+    def __init__(self, values: Sequence[str]) -> None:
+        encoded = [v.encode("utf8") for v in values]
+        self.blob = b"".join(encoded)
+        self.offsets = array("Q", [0])
+        total = 0
+        for value in encoded:
+            total += len(value)
+            self.offsets.append(total)
+
+    @classmethod
+    def concat(cls, parts: Sequence["TextColumn"]) -> "TextColumn":
+        column = cls([])
+        column.blob = b"".join(part.blob for part in parts)
+        shift = 0
+        for part in parts:
+            column.offsets.extend(offset + shift for offset in part.offsets[1:])
+            shift += part.offsets[-1]
+        return column
+
+    def __getitem__(self, row: int) -> str:
+        return self.blob[self.offsets[row] : self.offsets[row + 1]].decode("utf8")
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+
+class CategoryColumn:
+    """
+    Dictionary-encoded column: each distinct value stored once, rows hold codes.
+    """
+
+    __slots__ = ("categories", "codes")
+
+    def __init__(self, values: Sequence[str]) -> None:
+        lookup: dict[str, int] = {}
+        codes = [lookup.setdefault(v, len(lookup)) for v in values]
+        self.categories = tuple(lookup)
+        self.codes = array("H" if len(lookup) <= 1 << 16 else "L", codes)
+
+    @classmethod
+    def concat(cls, parts: Sequence["CategoryColumn"]) -> "CategoryColumn":
+        lookup: dict[str, int] = {}
+        codes: list[int] = []
+        for part in parts:
+            recode = [lookup.setdefault(v, len(lookup)) for v in part.categories]
+            codes += [recode[code] for code in part.codes]
+        column = cls([])
+        column.categories = tuple(lookup)
+        column.codes = array("H" if len(lookup) <= 1 << 16 else "L", codes)
+        return column
+
+    def __getitem__(self, row: int) -> str:
+        return self.categories[self.codes[row]]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+
+Column = TextColumn | CategoryColumn
+
+
+def concat_columns(parts: Sequence[Column], ratio: float) -> Column:
+    """
+    One column from consecutive parts, encoded just as encoding all their values at
+    once would have been.
+    """
+    limit = max(1, sum(len(part) for part in parts) * ratio)
+    categorical = [part for part in parts if isinstance(part, CategoryColumn)]
+    if len(categorical) == len(parts):
+        categories = dict.fromkeys(v for part in categorical for v in part.categories)
+        if len(categories) <= limit:
+            return CategoryColumn.concat(categorical)
+        return TextColumn.concat([TextColumn(_values(part)) for part in parts])
+    distinct = {v.encode("utf8") for part in categorical for v in part.categories}
+    for part in parts:
+        if isinstance(part, TextColumn):
+            blob, offsets = part.blob, part.offsets
+            distinct.update(blob[a:b] for a, b in zip(offsets, offsets[1:]))
+        if len(distinct) > limit:
+            return TextColumn.concat(
+                [
+                    p if isinstance(p, TextColumn) else TextColumn(_values(p))
+                    for p in parts
+                ]
+            )
+    return CategoryColumn([value for part in parts for value in _values(part)])
+
+
+def _values(column: Column) -> list[str]:
+    return [column[row] for row in range(len(column))]
+
+
+class RecordStore(Mapping[str, list[RetractionRecord]]):
+    """
+    Column-oriented store of retraction database rows, keyed by lowercase DOI.
+
+    Columns with few distinct values relative to the number of rows (RetractionNature,
+    Country, ...) are dictionary-encoded; the rest are packed into UTF-8 blobs. Rows
+    come back as RetractionRecord views. Lookups ignore case and, as with the
+    defaultdict this replaces, an unknown DOI gives an empty list.
+
+    Given a source and the byte offset of each row in it, the store may hold only
+    some of the source's columns; the others are read from the file when asked for.
+    Fingerprints of the raw rows, if given, let updates reuse rows that are unchanged.
+    """
+
+    CATEGORY_RATIO = 0.5
+
+    def __init__(
+        self,
+        columns: Sequence[str],
+        rows: Sequence[Sequence[str]],
+        keys: Iterable[str],
+        source: "CSVSource | None" = None,
+        offsets: Iterable[int] = (),
+        fingerprints: Iterable[int] = (),
+    ) -> None:
+        data = tuple(
+            self._encode([row[i] for row in rows]) for i in range(len(columns))
+        )
+        self._set_up(columns, data, keys, len(rows), source, offsets, fingerprints)
+
+    def _set_up(
+        self,
+        columns: Sequence[str],
+        data: tuple[Column, ...],
+        keys: Iterable[str],
+        n_rows: int,
+        source: "CSVSource | None",
+        offsets: Iterable[int],
+        fingerprints: Iterable[int],
+    ) -> None:
+        self.source = source
+        self.stored_columns = tuple(columns)
+        self.columns = source.header if source else self.stored_columns
+        self._column_index = {name: i for i, name in enumerate(self.stored_columns)}
+        self._data = data
+        self._offsets = array("Q", offsets)
+        self.fingerprints = array("Q", fingerprints)
+        grouped: dict[str, list[int]] = {}
+        for row, key in enumerate(keys):
+            grouped.setdefault(key, []).append(row)
+        # Nearly every DOI has just the one row, so skip the tuple for those
+        self._rows: dict[str, int | tuple[int, ...]] = {
+            key: row_ids[0] if len(row_ids) == 1 else tuple(row_ids)
+            for key, row_ids in grouped.items()
+        }
+        self.n_rows = n_rows
+
+    @classmethod
+    def concat(cls, stores: Sequence["RecordStore"]) -> "RecordStore":
+        """
+        One store of the rows of several, in order, as if built from them all at
+        once; they must hold the same columns of the same source.
+        """
+        # pylint: disable=protected-access
+        first = stores[0]
+        store = cls.__new__(cls)
+        store._set_up(
+            first.stored_columns,
+            tuple(
+                concat_columns([s._data[i] for s in stores], cls.CATEGORY_RATIO)
+                for i in range(len(first.stored_columns))
+            ),
+            [key for s in stores for key in s.row_keys()],
+            sum(s.n_rows for s in stores),
+            first.source,
+            [offset for s in stores for offset in s._offsets],
+            [digest for s in stores for digest in s.fingerprints],
+        )
+        return store
+
+    @classmethod
+    def _encode(cls, values: Sequence[str]) -> Column:
+        distinct = len(set(values))
+        if distinct <= max(1, len(values) * cls.CATEGORY_RATIO):
+            return CategoryColumn(values)
+        return TextColumn(values)
+
+    def value(self, row: int, column: str) -> str:
+        return self._data[self._column_index[column]][row]
+
+    def holds(self, column: str) -> bool:
+        """
+        Whether the column is in memory, or else unknown to a store with no source.
+        """
+        return column in self._column_index or self.source is None
+
+    def read_row(self, row: int) -> dict[str, str]:
+        if self.source is None:
+            raise LookupError(f"{self!r} keeps no source to read rows from")
+        return self.source.read_row(self._offsets[row])
+
+    def row_keys(self) -> list[str]:
+        """
+        The key of each row, in row order.
+        """
+        keys = [""] * self.n_rows
+        for key, row_ids in self._rows.items():
+            for row in (row_ids,) if isinstance(row_ids, int) else row_ids:
+                keys[row] = key
+        return keys
+
+    def record(self, row: int) -> RetractionRecord:
+        return RetractionRecord(self, row)
+
+    def __getitem__(self, key: str) -> list[RetractionRecord]:
+        row_ids = self._rows.get(key.lower(), ())
+        if isinstance(row_ids, int):
+            return [RetractionRecord(self, row_ids)]
+        return [RetractionRecord(self, row) for row in row_ids]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and key.lower() in self._rows
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}({len(self):,} DOIs, {self.n_rows:,} rows"
+            + f" x {len(self.stored_columns)}/{len(self.columns)} columns)"
+        )
+
+
+class CSVSource:
+    """
+    The CSV file behind a lazily loaded RecordStore, read back one row at a time.
+
+    Rows are found by byte offset, so the file must not change after loading; its
+    size and mtime are checked before each read.
+    """
+
+    def __init__(self, path: Path, header: Sequence[str]) -> None:
+        self.path = path
+        self.header = tuple(header)
+        stat = path.stat()
+        self.size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+
+    def read_row(self, offset: int) -> dict[str, str]:
+        with self.path.open("rb") as stream:
+            stat = os.fstat(stream.fileno())
+            if (stat.st_size, stat.st_mtime_ns) != (self.size, self.mtime_ns):
+                raise ValueError(f"{self.path} has changed since it was loaded")
+            _ = stream.seek(offset)
+            _, _, row = next(read_csv_rows(stream))
+        row += [""] * (len(self.header) - len(row))
+        return dict(zip(self.header, row))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}('{self.path}')"
+
+
+# As the csv module reads them: a quote opens a quoted field only at the start of
+# a field, and is taken literally anywhere else. Within quotes, "" is an escaped
+# quote; the field's closing quote is one not so doubled.
+_QUOTED_REST = rb'[^"]*(?:""[^"]*)*"(?!")'
+_QUOTED_TAIL = re.compile(_QUOTED_REST)
+# Unquoted text, literal quotes, and whole quoted fields, up to any quoted field
+# left open
+_UNQUOTED_RUN = re.compile(
+    rb'(?:[^"]+|(?<![^,\n])"' + _QUOTED_REST + rb'|(?<=[^,\n])")*'
+)
+
+
+def _in_quotes_after(data: Any, start: int, stop: int, quoted: bool) -> bool:
+    """
+    Whether data[start:stop] ends inside a quoted field, given whether it starts in
+    one. Outside quotes, start must be at a record or field boundary.
+    """
+    if quoted:
+        tail = _QUOTED_TAIL.match(data, start, stop)
+        if tail is None:
+            return True
+        start = tail.end()
+    run = _UNQUOTED_RUN.match(data, start, stop)
+    return run is not None and run.end() < stop
+
+
+def iter_csv_records(stream: IO[bytes]) -> Iterator[tuple[int, bytes]]:
+    """
+    Split a binary CSV stream into whole records, newlines inside quoted fields and
+    all, each with the byte offset it starts at.
+
+    A record ends at the first newline outside a quoted field. Lines without a
+    quote leave that state as it was, so only lines with one need looking into.
+    """
+    offset = stream.tell()
+    pending: list[bytes] = []
+    start = offset
+    quoted = False
+    for line in stream:
+        if b'"' in line:
+            quoted = _in_quotes_after(line, 0, len(line), quoted)
+        if not quoted:
+            if pending:
+                pending.append(line)
+                yield start, b"".join(pending)
+                pending = []
+            else:
+                yield offset, line
+        elif not pending:
+            start = offset
+            pending.append(line)
+        else:
+            pending.append(line)
+        offset += len(line)
+    if pending:
+        yield start, b"".join(pending)
+
+
+def split_csv_records(
+    stream: IO[bytes], start: int, stop: int, n_chunks: int
+) -> list[tuple[int, int]]:
+    """
+    Byte ranges of about equal size, between start and stop, that each hold only
+    whole records; found by the same reading of quotes as iter_csv_records.
+    """
+    if stop <= start:
+        return []
+    bounds = [start]
+    step = max(1, (stop - start) // n_chunks)
+    with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for target in range(start + step, stop, step):
+            last = bounds[-1]
+            end = data.find(b"\n", max(target, last))
+            quoted = end != -1 and _in_quotes_after(data, last, end + 1, False)
+            while quoted:
+                following = data.find(b"\n", end + 1)
+                if following == -1:
+                    end = -1
+                    break
+                quoted = _in_quotes_after(data, end + 1, following + 1, True)
+                end = following
+            if end == -1 or end + 1 >= stop:
+                break
+            bounds.append(end + 1)
+    bounds.append(stop)
+    return list(zip(bounds, bounds[1:]))
+
+
+def read_csv_rows(stream: IO[bytes]) -> Iterator[tuple[int, bytes, list[str]]]:
+    """
+    Parsed rows of a binary CSV stream with their byte offsets and raw bytes; blank
+    lines skipped.
+    """
+    record_start = 0
+    record = b""
+
+    def texts() -> Iterator[str]:
+        nonlocal record_start, record
+        for record_start, record in iter_csv_records(stream):
+            yield decode_record(record)
+
+    # Each text is one whole record, so the reader takes exactly one per row
+    for row in csv.reader(texts()):
+        if row:
+            yield record_start, record, row
+
+
+def parse_record(record: bytes) -> list[str]:
+    return next(csv.reader([decode_record(record)]), list[str]())
+
+
+def decode_record(record: bytes) -> str:
+    """
+    Decoded as reading the file as UTF-8 text with universal newlines would.
+    """
+    text = record.decode("utf8", errors="backslashreplace")
+    # The reader drops the line terminator itself; only quoted ones need this
+    if -1 < text.find("\r") < len(text) - 2:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def fingerprint(record: bytes) -> int:
+    """
+    64-bit digest of a raw CSV record, line terminator aside, to spot changed rows.
+    """
+    digest = hashlib.blake2b(record.rstrip(b"\r\n"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
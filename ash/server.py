@@ -0,0 +1,244 @@
+"""
+Long-running HTTP front end that keeps one RetractionDatabase loaded.
+
+    POST /report[?validate=1]   body is the paper; Content-Type is its MIME type
+    GET  /health
+
+Reports are the same dicts as Paper.report gives, as JSON.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from ash.aio import AsyncHeadClient
+from ash.corpus import extract_dois
+from ash.main import DOI, Paper, RetractionDatabase, binary_mime_check
+
+logger = logging.getLogger(__name__)
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    411: "Length Required",
+    413: "Content Too Large",
+    415: "Unsupported Media Type",
+    422: "Unprocessable Content",
+    500: "Internal Server Error",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class ReportServer:
+    """
+    Serve reports against one database over HTTP/1.1, on a TCP port or Unix socket.
+
+    Extraction runs in an executor, so the event loop keeps answering other requests
+    while a large paper is being read. With jobs > 1 that executor is a process
+    pool; otherwise it is the loop's default thread pool. DOIs are validated on the
+    loop itself, over connections to doi.org kept open between reports.
+    """
+
+    MAX_BODY = 64 << 20
+    TRUE_VALUES = frozenset({"1", "true", "yes"})
+
+    def __init__(self, db: RetractionDatabase, jobs: int = 1) -> None:
+        self.db = db
+        self._executor: Executor | None = (
+            ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+        )
+        self._client = AsyncHeadClient(max_connections=DOI.MAX_WORKERS)
+
+    async def start(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        socket_path: Path | str | None = None,
+    ) -> asyncio.Server:
+        if socket_path is not None:
+            server = await asyncio.start_unix_server(self.handle, path=socket_path)
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+        for sock in server.sockets:
+            logger.info(f"Serving reports on {sock.getsockname()}")
+        return server
+
+    async def serve_forever(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        socket_path: Path | str | None = None,
+    ) -> None:
+        try:
+            async with await self.start(host, port, socket_path) as server:
+                await server.serve_forever()
+        finally:
+            await self._client.close()
+            self.close()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        One connection, kept alive across requests unless the client says otherwise.
+        """
+        try:
+            while True:
+                # Until a request is read in full, the stream can't be trusted further
+                keep_alive = False
+                try:
+                    request = await self._read_request(reader, writer)
+                    if request is None:
+                        break
+                    method, target, headers, body, keep_alive = request
+                    status, payload = await self._dispatch(
+                        method, target, headers, body
+                    )
+                except HTTPError as err:
+                    status, payload = err.status, {"error": str(err)}
+                except Exception as err:  # pylint: disable=broad-exception-caught
+                    logger.exception("Failed to serve request")
+                    status, payload, keep_alive = 500, {"error": repr(err)}, False
+                self._respond(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _read_request(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> tuple[str, str, dict[str, str], bytes, bool] | None:
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        try:
+            method, target, version = line.decode("latin-1").split()
+        except ValueError as err:
+            raise HTTPError(400, "Malformed request line") from err
+        headers: dict[str, str] = {}
+        while (line := await reader.readline()).strip():
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if "transfer-encoding" in headers:
+            raise HTTPError(411, "Send a Content-Length rather than chunks")
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError as err:
+            raise HTTPError(400, "Malformed Content-Length") from err
+        if length < 0:
+            raise HTTPError(400, "Malformed Content-Length")
+        if length > self.MAX_BODY:
+            raise HTTPError(413, f"Papers are limited to {self.MAX_BODY:,} bytes")
+        # Clients such as curl hold back large bodies until told to go ahead
+        expect = headers.get("expect", "").lower()
+        if length and version == "HTTP/1.1" and expect == "100-continue":
+            writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+            await writer.drain()
+        body = await reader.readexactly(length)
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" and (
+            version == "HTTP/1.1" or connection == "keep-alive"
+        )
+        return method.upper(), target, headers, body, keep_alive
+
+    async def _dispatch(
+        self, method: str, target: str, headers: dict[str, str], body: bytes
+    ) -> tuple[int, Any]:
+        url = urlsplit(target)
+        if url.path == "/health":
+            self._require(method, "GET")
+            return 200, {
+                "status": "ok",
+                "database": str(self.db.path),
+                "dois": len(self.db.index),
+            }
+        if url.path == "/report":
+            self._require(method, "POST")
+            validate = parse_qs(url.query).get("validate", ["0"])[-1]
+            mime_type = self._mime_type(headers.get("content-type"), body)
+            return 200, await self.report(
+                body, mime_type, validate.lower() in self.TRUE_VALUES
+            )
+        raise HTTPError(404, f"No such endpoint {url.path!r}")
+
+    async def report(
+        self, data: bytes, mime_type: str, validate_dois: bool = False
+    ) -> dict[str, Any]:
+        if not Paper.supports(mime_type):
+            raise HTTPError(415, f"No handler for {mime_type!r}")
+        loop = asyncio.get_running_loop()
+        try:
+            dois = await loop.run_in_executor(
+                self._executor, extract_dois, data, mime_type
+            )
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            raise HTTPError(422, f"{type(err).__name__}: {err}") from err
+        paper = Paper.from_dois(dois, mime_type)
+        return await paper.areport(self.db, validate_dois, client=self._client)
+
+    @staticmethod
+    def _require(method: str, allowed: str) -> None:
+        if method != allowed:
+            raise HTTPError(405, f"Use {allowed} here")
+
+    @staticmethod
+    def _mime_type(content_type: str | None, body: bytes) -> str:
+        """
+        Trust the Content-Type, if there is a useful one; otherwise sniff the body.
+        """
+        mime_type = (content_type or "").partition(";")[0].strip().lower()
+        if mime_type and mime_type != "application/octet-stream":
+            return mime_type
+        try:
+            return binary_mime_check(body)
+        except TypeError:
+            return "text/plain"
+
+    @staticmethod
+    def _respond(
+        writer: asyncio.StreamWriter, status: int, payload: Any, keep_alive: bool
+    ) -> None:
+        body = json.dumps(payload).encode("utf8")
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            + "Content-Type: application/json\r\n"
+            + f"Content-Length: {len(body)}\r\n"
+            + f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+
+
+def serve(
+    database: Path | str,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    socket_path: Path | str | None = None,
+    jobs: int = 1,
+) -> None:
+    """
+    Load the database once and serve reports until interrupted.
+    """
+    server = ReportServer(RetractionDatabase(database, jobs=jobs), jobs=jobs)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(server.serve_forever(host, port, socket_path))
@@ -0,0 +1,186 @@
+"""
+Synthetic Retraction Watch databases and papers for benchmarking.
+
+Everything is seeded, so the same arguments always write the same bytes and runs on
+different commits are measured against identical inputs.
+"""
+
+import csv
+import random
+import zipfile
+from io import BytesIO
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from pypdf import PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+RW_COLUMNS = (
+    "Record ID,Title,Subject,Institution,Journal,Publisher,Country,Author,URLS,"
+    + "ArticleType,RetractionDate,RetractionDOI,RetractionPubMedID,OriginalPaperDate,"
+    + "OriginalPaperDOI,OriginalPaperPubMedID,RetractionNature,Reason,Paywalled,Notes"
+).split(",")
+NATURES = ("Retraction",) * 8 + ("Correction", "Expression of concern", "Reinstatement")
+# What stands in for a DOI in the real export's invalid rows, roughly as common
+INVALID_DOIS = ("unavailable", "Unavailable", "", "", "Unavailable", "0", "NA")
+# One suffix per handler, covering every handler registered in ash.main
+PAPER_SUFFIXES = (".pdf", ".docx", ".rtf", ".txt", ".tex", ".latex")
+PAPER_SIZES = {"small": 40, "medium": 400, "large": 4000}
+LINES_PER_PDF_PAGE = 50
+
+
+def retracted_doi(row: int) -> str:
+    return f"10.{1000 + row % 9000}/rw.{row}"
+
+
+def write_database(path: Path, rows: int, invalid_rate: float = 0.08, seed: int = 0):
+    """
+    RW-format CSV with quoted multi-line notes, repeated DOIs, and invalid DOIs.
+    """
+    rng = random.Random(seed)
+    with path.open("w", newline="", encoding="utf8") as stream:
+        writer = csv.writer(stream)
+        writer.writerow(RW_COLUMNS)
+        for row in range(rows):
+            if rng.random() < invalid_rate:
+                doi = rng.choice(INVALID_DOIS)
+            elif row and rng.random() < 0.02:
+                doi = retracted_doi(rng.randrange(row)).upper()
+            else:
+                doi = retracted_doi(row)
+            writer.writerow(
+                [
+                    str(100_000 + row),
+                    f"Title of retracted paper {row} on subject {rng.randint(1, 999)}",
+                    "(BLS) Biology - Cellular;(HSC) Medicine - Oncology;",
+                    f"Department {rng.randint(1, 99)}, University {rng.randint(1, 5000)}",
+                    f"Journal {rng.randint(1, 3000)}",
+                    f"Publisher {rng.randint(1, 200)}",
+                    rng.choice(("United States", "China", "India", "Germany", "Iran")),
+                    ";".join(f"Author {row}-{i}" for i in range(rng.randint(1, 8))),
+                    f"https://example.com/notice/{row}",
+                    "Research Article;",
+                    f"{rng.randint(1, 12)}/{rng.randint(1, 28)}/20{rng.randint(10, 24)} 0:00",
+                    f"10.{1000 + row % 9000}/notice.{row}",
+                    str(rng.randint(10**7, 10**8)),
+                    f"{rng.randint(1, 12)}/{rng.randint(1, 28)}/200{rng.randint(0, 9)} 0:00",
+                    doi,
+                    str(rng.randint(10**7, 10**8)),
+                    rng.choice(NATURES),
+                    "+Concerns/Issues About Data;+Investigation by Journal/Publisher;",
+                    rng.choice(("Yes", "No")),
+                    "" if rng.random() < 0.8 else f'See "notice"\nand follow-up {row}',
+                ]
+            )
+
+
+def reference_lines(references: int, database_rows: int, seed: int = 0) -> list[str]:
+    """
+    A paper body followed by a reference list, a tenth of which cite retracted work.
+    """
+    rng = random.Random(seed)
+    lines = [
+        f"Paragraph {i} of the paper discusses prior findings at some length."
+        for i in range(references // 4 + 1)
+    ]
+    lines.append("References")
+    for ref in range(references):
+        if rng.random() < 0.1:
+            doi = retracted_doi(rng.randrange(database_rows))
+        else:
+            doi = f"10.{rng.randint(1000, 99999)}/{rng.choice(('j', 's', 'ABC'))}.{ref}"
+        style = rng.randrange(3)
+        if style == 0:
+            cited = f"https://doi.org/{doi}"
+        elif style == 1:
+            cited = f"doi:{doi}."
+        else:
+            cited = f"({doi})"
+        lines.append(
+            f"{ref + 1}. Author A, Author B. Title of work {ref}. Journal "
+            + f"{rng.randint(1, 60)}({rng.randint(1, 12)}):{rng.randint(1, 999)}. {cited}"
+        )
+    return lines
+
+
+def write_paper(path: Path, lines: list[str]) -> None:
+    writers = {
+        ".pdf": _pdf_bytes,
+        ".docx": _docx_bytes,
+        ".rtf": _rtf_bytes,
+    }
+    writer = writers.get(path.suffix, _text_bytes)
+    _ = path.write_bytes(writer(lines))
+
+
+def _text_bytes(lines: list[str]) -> bytes:
+    return "\n".join(lines).encode("utf8")
+
+
+def _rtf_bytes(lines: list[str]) -> bytes:
+    body = "\\par\n".join(
+        line.replace("\\", "\\\\").replace("{", "\\{").replace("}", "\\}")
+        for line in lines
+    )
+    return ("{\\rtf1\\ansi\\deff0 {\\fonttbl {\\f0 Times;}}\n" + body + "}").encode()
+
+
+def _docx_bytes(lines: list[str]) -> bytes:
+    namespace = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    paragraphs = "".join(f"<w:p><w:r><w:t>{escape(x)}</w:t></w:r></w:p>" for x in lines)
+    output = BytesIO()
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as document:
+        document.writestr(
+            "word/document.xml",
+            f'<w:document xmlns:w="{namespace}"><w:body>{paragraphs}</w:body></w:document>',
+        )
+    return output.getvalue()
+
+
+def _pdf_bytes(lines: list[str]) -> bytes:
+    writer = PdfWriter()
+    font = DictionaryObject(
+        {
+            NameObject("/Type"): NameObject("/Font"),
+            NameObject("/Subtype"): NameObject("/Type1"),
+            NameObject("/BaseFont"): NameObject("/Helvetica"),
+        }
+    )
+    for start in range(0, len(lines), LINES_PER_PDF_PAGE):
+        page = writer.add_blank_page(612, 792)
+        operations = ["BT", "/F1 8 Tf", "10 TL", "36 760 Td"]
+        for line in lines[start : start + LINES_PER_PDF_PAGE]:
+            escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            operations.append(f"({escaped}) Tj T*")
+        operations.append("ET")
+        content = DecodedStreamObject()
+        content.set_data("\n".join(operations).encode("latin-1"))
+        page[NameObject("/Resources")] = DictionaryObject(
+            {NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})}
+        )
+        page.replace_contents(content)
+    output = BytesIO()
+    _ = writer.write(output)
+    return output.getvalue()
+
+
+def generate(directory: Path, database_rows: list[int]) -> dict[str, list[Path]]:
+    """
+    Write any inputs not already in the directory; return databases and papers.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    databases: list[Path] = []
+    for rows in database_rows:
+        path = directory / f"rw-{rows}.csv"
+        if not path.exists():
+            write_database(path, rows)
+        databases.append(path)
+    papers: list[Path] = []
+    for size, references in PAPER_SIZES.items():
+        lines = reference_lines(references, min(database_rows))
+        for suffix in PAPER_SUFFIXES:
+            path = directory / f"paper-{size}{suffix}"
+            if not path.exists():
+                write_paper(path, lines)
+            papers.append(path)
+    return {"databases": databases, "papers": papers}
@@ -0,0 +1,177 @@
+"""
+Time each stage of Ash separately against generated inputs.
+
+    python benchmarks/run.py                       # 10k, 100k and 1M row databases
+    python benchmarks/run.py --quick               # 10k rows, fewer repeats
+    python benchmarks/run.py --compare results/abc1234.json
+
+Results are written as JSON named for the commit, so two runs can be compared.
+Inputs are generated once into benchmarks/data and reused.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from generate import generate
+
+from ash import config
+from ash.mapped import MappedRetractionDatabase
+from ash.main import Paper, RetractionDatabase, path_to_mime_type, text_to_dois
+
+HERE = Path(__file__).parent
+DATA_DIR = HERE / "data"
+RESULTS_DIR = HERE / "results"
+LOOKUPS = 10_000
+
+
+def measure(func: Callable[[], Any], repeat: int) -> dict[str, Any]:
+    runs: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _ = func()
+        runs.append(time.perf_counter() - start)
+    return {"best": min(runs), "median": statistics.median(runs), "runs": repeat}
+
+
+def load(path: Path, **kwargs: Any) -> RetractionDatabase:
+    RetractionDatabase._path_cache.clear()  # pylint: disable=protected-access
+    return RetractionDatabase(path, **kwargs)
+
+
+def bench_databases(databases: list[Path], repeat: int) -> dict[str, Any]:
+    timings: dict[str, Any] = {}
+    for path in databases:
+        name = path.stem
+        # A million rows takes long enough that one run says enough
+        times = 1 if path.stat().st_size > 100 << 20 else repeat
+        timings[f"load/{name}/build"] = measure(
+            partial(load, path, use_snapshot=False), times
+        )
+        timings[f"load/{name}/build-lazy"] = measure(
+            partial(load, path, use_snapshot=False, lazy=True), times
+        )
+        _ = load(path)
+        timings[f"load/{name}/snapshot"] = measure(partial(load, path), times)
+    return timings
+
+
+def bench_papers(
+    papers: list[Path], repeat: int
+) -> tuple[dict[str, Any], dict[Path, Paper]]:
+    timings: dict[str, Any] = {}
+    extracted: dict[Path, Paper] = {}
+    for path in papers:
+        mime_type = path_to_mime_type(path)
+        timings[f"mime/{path.name}"] = measure(partial(path_to_mime_type, path), repeat)
+        timings[f"extract/{path.name}"] = measure(
+            partial(Paper.from_path, path, mime_type), repeat
+        )
+        extracted[path] = Paper.from_path(path, mime_type)
+        if path.suffix == ".txt":
+            text = path.read_text(encoding="utf8")
+            timings[f"scan/{path.name}"] = measure(partial(text_to_dois, text), repeat)
+    return timings, extracted
+
+
+def bench_reports(
+    databases: list[Path], papers: dict[Path, Paper], repeat: int
+) -> dict[str, Any]:
+    timings: dict[str, Any] = {}
+    cited = [doi for paper in papers.values() for doi in paper.dois]
+    queries = (cited * (LOOKUPS // len(cited) + 1))[:LOOKUPS]
+    for path in databases:
+        db = load(path)
+        timings[f"lookup/{path.stem}/{LOOKUPS}"] = measure(
+            partial(db.lookup_many, queries), repeat
+        )
+        with MappedRetractionDatabase.build(db, path.with_suffix(".mapped")) as mapped:
+            timings[f"lookup-mapped/{path.stem}/{LOOKUPS}"] = measure(
+                partial(mapped.lookup_many, queries), repeat
+            )
+        for paper_path, paper in papers.items():
+            if paper_path.suffix != ".txt":
+                continue
+            timings[f"report/{path.stem}/{paper_path.stem}"] = measure(
+                partial(paper.report, db, validate_dois=False), repeat
+            )
+    return timings
+
+
+def git_commit() -> tuple[str, bool]:
+    def git(*args: str) -> str:
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, check=False, cwd=HERE
+        ).stdout.strip()
+
+    return git("rev-parse", "--short", "HEAD") or "unknown", bool(git("status", "-s"))
+
+
+def compare(old: dict[str, Any], new: dict[str, Any]) -> None:
+    print(f"{'stage':<48} {old['commit']:>10} {new['commit']:>10}  ratio")
+    for name, timing in new["timings"].items():
+        before = old["timings"].get(name)
+        if before is None:
+            continue
+        ratio = timing["best"] / before["best"]
+        print(
+            f"{name:<48} {before['best']:>10.4f} {timing['best']:>10.4f}  {ratio:.2f}x"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    _ = parser.add_argument(
+        "--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    _ = parser.add_argument("--repeat", type=int, default=5)
+    _ = parser.add_argument("--quick", action="store_true", help="10k rows, 2 repeats")
+    _ = parser.add_argument("--output", type=Path, help="Results file to write.")
+    _ = parser.add_argument("--compare", type=Path, help="Earlier results to compare.")
+    args = parser.parse_args()
+    if args.quick:
+        args.rows, args.repeat = [10_000], 2
+
+    inputs = generate(DATA_DIR, sorted(args.rows))
+    commit, dirty = git_commit()
+    results: dict[str, Any] = {
+        "commit": commit + ("-dirty" if dirty else ""),
+        "started": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "rows": sorted(args.rows),
+        "repeat": args.repeat,
+        "timings": {},
+    }
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # Keep snapshots away from the user's own cache
+        config.CACHE_DIR = Path(cache_dir)
+        results["timings"].update(bench_databases(inputs["databases"], args.repeat))
+        paper_timings, papers = bench_papers(inputs["papers"], args.repeat)
+        results["timings"].update(paper_timings)
+        results["timings"].update(
+            bench_reports(inputs["databases"], papers, args.repeat)
+        )
+
+    output = args.output or RESULTS_DIR / f"{results['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    _ = output.write_text(json.dumps(results, indent=2), encoding="utf8")
+    for name, timing in results["timings"].items():
+        print(f"{name:<48} {timing['best']:>10.4f}s")
+    print(f"Wrote {output}")
+    if args.compare:
+        compare(json.loads(args.compare.read_text(encoding="utf8")), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -104,6 +104,19 @@ def test_pytest_multipython(session: Session):
     )
 
 
+@nox.session(python=False)
+def benchmark(session: Session):
+    """
+    Time database load, extraction, DOI scanning, lookup, and reports on generated
+    inputs; results go to benchmarks/results/<commit>.json.
+
+    Not run by default. Arguments pass through, e.g.:
+
+        nox -s benchmark -- --quick --compare benchmarks/results/abc1234.json
+    """
+    _ = session.run("python", "benchmarks/run.py", *session.posargs)
+
+
 @nox.session(python=False)
 def lint_todos(_):
     for file in Path(".").glob("*/*.py"):
@@ -1,7 +1,16 @@
+import shutil
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
 from pathlib import Path
 
 import pytest
+from pypdf import PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
 
+from ash import config
+from ash.cache import ValidationCache
 from ash.main import DOI, RetractionDatabase
 
 MAIN_DIR = Path(__file__).parent.parent
@@ -18,6 +27,17 @@ except ImportError:
     VAULT_AVAILABLE = False
 
 
+@pytest.fixture(scope="session", autouse=True)
+def cache_dir(tmp_path_factory):
+    """
+    Keep snapshots and other cached artifacts out of the real user cache directory.
+    """
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        path = tmp_path_factory.mktemp("cache")
+        monkeypatch.setattr(config, "CACHE_DIR", path)
+        yield path
+
+
 @pytest.fixture(scope="session")
 def vault():
     if not VAULT_AVAILABLE:
@@ -53,6 +73,17 @@ def fake_db():
     return RetractionDatabase(MOCK_DIR / "rw_database.csv")
 
 
+@pytest.fixture
+def csv_path(tmp_path, monkeypatch):
+    """
+    A copy of the fake_db CSV that tests may change, loaded afresh by each test.
+    """
+    monkeypatch.setattr(RetractionDatabase, "_path_cache", {})
+    path = tmp_path / "rw_database.csv"
+    shutil.copy(MOCK_DIR / "rw_database.csv", path)
+    return path
+
+
 @pytest.fixture(scope="function")
 def mock_http(mocker, request):
     code = request.param
@@ -66,5 +97,108 @@ def mock_http(mocker, request):
 
 
 @pytest.fixture(scope="function", autouse=True)
-def delete_api_cache():
+def delete_api_cache(tmp_path):
     DOI._cached_api_results = {}  # pylint: disable=protected-access
+    DOI.breaker.reset()
+    cache = ValidationCache(tmp_path / ValidationCache.FILENAME)
+    DOI._persistent_cache = cache  # pylint: disable=protected-access
+    yield cache
+    cache.close()
+
+
+class StubHandleServer(ThreadingHTTPServer):
+    """
+    Local stand-in for the doi.org handle API: DOIs in `known` exist, others 404.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, known: set[str], delay: float = 0.0):
+        super().__init__(("127.0.0.1", 0), StubHandleRequestHandler)
+        self.known = known
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak_active = 0
+        self.clients: set[int] = set()
+        self.requests: list[str] = []
+
+    @property
+    def api_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/api/handles/{{doi}}"
+
+
+class StubHandleRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so pooled connections can be reused
+
+    server: StubHandleServer
+
+    def do_HEAD(self):  # pylint: disable=invalid-name
+        doi = self.path.removeprefix("/api/handles/")
+        with self.server.lock:
+            self.server.active += 1
+            self.server.peak_active = max(self.server.peak_active, self.server.active)
+            self.server.clients.add(self.client_address[1])
+            self.server.requests.append(doi)
+        time.sleep(self.server.delay)
+        with self.server.lock:
+            self.server.active -= 1
+        self.send_response(200 if doi in self.server.known else 404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+@pytest.fixture(scope="function")
+def stub_api(request, monkeypatch):
+    """
+    Parametrize indirectly with (known DOIs, delay in seconds).
+    """
+    known, delay = getattr(request, "param", (set(), 0.0))
+    server = StubHandleServer(set(known), delay)
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    monkeypatch.setattr(DOI, "API_URL", server.api_url)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def write_pdf(pages: list[str]) -> bytes:
+    """
+    Minimal PDF with one page per string, one text line per line of each string.
+    """
+    writer = PdfWriter()
+    font = DictionaryObject(
+        {
+            NameObject("/Type"): NameObject("/Font"),
+            NameObject("/Subtype"): NameObject("/Type1"),
+            NameObject("/BaseFont"): NameObject("/Helvetica"),
+        }
+    )
+    for text in pages:
+        page = writer.add_blank_page(612, 792)
+        operations = ["BT", "/F1 10 Tf", "12 TL", "72 720 Td"]
+        for line in text.splitlines():
+            escaped = line.replace("\\", "\\\\")
+            escaped = escaped.replace("(", "\\(").replace(")", "\\)")
+            operations.append(f"({escaped}) Tj T*")
+        operations.append("ET")
+        content = DecodedStreamObject()
+        content.set_data("\n".join(operations).encode("latin-1"))
+        page[NameObject("/Resources")] = DictionaryObject(
+            {NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})}
+        )
+        page.replace_contents(content)
+    output = BytesIO()
+    _ = writer.write(output)
+    return output.getvalue()
+
+
+@pytest.fixture(scope="session")
+def make_pdf():
+    return write_pdf
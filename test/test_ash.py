@@ -1,9 +1,36 @@
 # pylint: disable=unused-argument
-from io import StringIO
+import asyncio
+import csv
+import os
+import random
+import time
+import zipfile
+from email.utils import formatdate
+from io import BytesIO, StringIO
+from pathlib import Path
 
 import pytest
 
-from ash.main import DOI, InvalidDOIError, Paper, path_to_mime_type
+from ash.aio import AsyncHeadClient
+from ash.main import (
+    DOI,
+    CircuitBreaker,
+    DOIStream,
+    InvalidDOIError,
+    Paper,
+    PaperBatch,
+    PDFHandler,
+    PlainTextHandler,
+    PrefilteredDatabase,
+    RetractionDatabase,
+    path_to_mime_type,
+    retry_after_seconds,
+    text_to_dois,
+    write_atomically,
+)
+from ash.records import parse_record
+
+MOCK_DIR = Path(__file__).parent / "mock"
 
 UNRETRACTED_TEXT = "A DOI here 10.21105/joss.03440 and that's all for now."
 UNRETRACTED_DOI = "10.21105/joss.03440"
@@ -116,6 +143,160 @@ class TestPaperDOIExtraction:
         assert "10.1016/S0140-6736(14)61033-3" in paper.dois
 
 
+def make_docx(parts):
+    namespace = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    output = BytesIO()
+    with zipfile.ZipFile(output, "w") as document:
+        for name, body in parts.items():
+            document.writestr(
+                f"word/{name}.xml", f'<w:root xmlns:w="{namespace}">{body}</w:root>'
+            )
+    output.seek(0)
+    return output
+
+
+class TestStreamingExtraction:
+
+    TEXT = " ".join(
+        f"Ref {i}: doi:10.{1000 + i}/abc.{i}-x(1)2 and https://doi.org/10.1002/w{i}<x>."
+        for i in range(300)
+    )
+
+    def chunked(self, text, seed):
+        rng = random.Random(seed)
+        position = 0
+        while position < len(text):
+            step = rng.randint(1, 3000)
+            yield text[position : position + step]
+            position += step
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_stream_matches_whole_text(self, seed):
+        stream = DOIStream()
+        found = []
+        for chunk in self.chunked(self.TEXT, seed):
+            found += stream.feed(chunk)
+        found += stream.close()
+        assert sorted(found) == sorted(text_to_dois(self.TEXT))
+
+    def test_single_pass_keeps_longest_reading(self):
+        text = "See 10.1002/(SICI)1097-4571<3::AID>3.0.CO;2-X and 10.1207/s1532&3_4."
+        assert text_to_dois(text) == [
+            "10.1002/(SICI)1097-4571<3::AID>3.0.CO;2-X",
+            "10.1207/s1532&3_4",
+        ]
+
+    def test_trailing_punctuation_dropped(self):
+        text = (
+            "See doi:10.1002/abc.123, and (10.1002/def.456); also 10.1002/ghi.7),"
+            + " but 10.1002/x(y)."
+        )
+        assert text_to_dois(text) == [
+            "10.1002/abc.123",
+            "10.1002/def.456",
+            "10.1002/ghi.7",
+            "10.1002/x(y)",
+        ]
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "doi = {10.1002/anie.201915678},",
+            "\\doi{10.1002/anie.201915678}",
+            'cited as "10.1002/anie.201915678" here',
+            "cited as '10.1002/anie.201915678' here",
+            "<10.1002/anie.201915678>",
+            "\u201c10.1002/anie.201915678\u201d",
+            "<a href='https://doi.org/10.1002/anie.201915678'>link</a>",
+        ],
+    )
+    def test_closing_marks_end_wiley_dois(self, text):
+        assert text_to_dois(text) == ["10.1002/anie.201915678"]
+
+    def test_quoted_wiley_zombie_reported(self, csv_path):
+        text = csv_path.read_text(encoding="utf8")
+        _ = csv_path.write_text(
+            text.replace("10.1234/retracted12349", "10.1002/anie.201915678"),
+            encoding="utf8",
+        )
+        db = RetractionDatabase(csv_path, use_snapshot=False)
+        paper = Paper('Cites "10.1002/anie.201915678".', mime_type="text/plain")
+        report = paper.report(db, validate_dois=False)
+        assert report["dois"] == {"10.1002/anie.201915678": {"Retracted": True}}
+        assert [z["Zombie"] for z in report["zombies"]] == ["10.1002/anie.201915678"]
+
+    def test_scanned_dois_unique_and_cleaned(self):
+        text = "10.1234/a. Again 10.1234/a, 10.1234/b/ and doi: 10.1234/a"
+        assert text_to_dois(text) == ["10.1234/a", "10.1234/b"]
+
+    def test_text_chunks_split_dois_and_characters(self, monkeypatch):
+        monkeypatch.setattr(PlainTextHandler, "CHUNK_SIZE", 7)
+        text = "Ça 10.1234/ünïcode-ok … and 10.5555/ab€cd then 10.21105/joss.03440 "
+        stream = BytesIO(text.encode("utf-8") * 50)
+        paper = Paper(stream, mime_type="text/plain")
+        assert paper.dois == text_to_dois(text)
+
+    def test_text_dois_arrive_before_end_of_file(self, monkeypatch):
+        monkeypatch.setattr(PlainTextHandler, "CHUNK_SIZE", 4096)
+        filler = b"x " * 10_000
+        stream = BytesIO(b"see 10.1234/early " + filler + b"10.1234/late")
+        dois = PlainTextHandler().iter_dois(stream)
+        assert next(dois) == "10.1234/early"
+        assert stream.tell() < len(stream.getvalue())
+        assert list(dois) == ["10.1234/late"]
+
+    def test_docx_body_tables_footnotes_and_endnotes(self):
+        para = "<w:p><w:r><w:t>{}</w:t></w:r><w:r><w:t>{}</w:t></w:r></w:p>"
+        docx = make_docx(
+            {
+                "document": "<w:body>"
+                + para.format("Body 10.1234/", "body")
+                + "<w:tbl><w:tr><w:tc>"
+                + para.format("Cell 10.1234/", "cell")
+                + "</w:tc></w:tr></w:tbl></w:body>",
+                "footnotes": "<w:footnote>"
+                + para.format("Note 10.1234/", "footnote")
+                + "</w:footnote>",
+                "endnotes": "<w:endnote>"
+                + para.format("Note 10.1234/", "endnote")
+                + "</w:endnote>",
+            }
+        )
+        paper = Paper(
+            docx,
+            "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        )
+        assert paper.dois == [
+            "10.1234/body",
+            "10.1234/cell",
+            "10.1234/footnote",
+            "10.1234/endnote",
+        ]
+
+    def test_pdf_pages(self, make_pdf):
+        pdf = make_pdf(["First 10.1234/one\nand 10.1234/two", "Then 10.1234/three"])
+        paper = Paper(BytesIO(pdf), mime_type="application/pdf")
+        assert set(paper.dois) == {"10.1234/one", "10.1234/two", "10.1234/three"}
+
+    def test_pdf_doi_split_across_page_break(self, make_pdf):
+        pdf = make_pdf(["Lancet 10.1016/S0140-", "6736(14)60921-1 is cited"])
+        paper = Paper(BytesIO(pdf), mime_type="application/pdf")
+        assert paper.dois == ["10.1016/S0140-6736(14)60921-1"]
+
+    def test_pdf_page_ranges_in_processes(self, make_pdf, monkeypatch, tmp_path):
+        pages = [f"Page {i} cites 10.5555/page{i}" for i in range(7)]
+        pages[2] = "Lancet 10.1016/S0140-"
+        pages[3] = "6736(14)60921-1 is cited"
+        path = tmp_path / "long.pdf"
+        _ = path.write_bytes(make_pdf(pages))
+        serial = Paper.from_path(path).dois
+        monkeypatch.setattr(PDFHandler, "processes", 3)
+        monkeypatch.setattr(PDFHandler, "pages_per_process", 2)
+        assert Paper.from_path(path).dois == serial
+        assert Paper(BytesIO(path.read_bytes()), "application/pdf").dois == serial
+        assert "10.1016/S0140-6736(14)60921-1" in serial
+
+
 class TestPaperReports:
 
     @pytest.mark.parametrize("mock_http", [200], indirect=True)
@@ -157,6 +338,363 @@ class TestPaperReports:
         paper = Paper(text, mime_type="text/plain")
         print(paper.report(fake_db, validate_dois=False))
 
+    @pytest.mark.parametrize("mock_http", [200], indirect=True)
+    def test_iter_report_zombies_first(self, fake_db, mock_http):
+        paper = Paper(UNRETRACTED_TEXT + " " + MOCKED_RETRACTION, "text/plain")
+        items = list(paper.iter_report(fake_db))
+        kinds = [kind for kind, _ in items]
+        assert kinds == ["zombie"] * kinds.count("zombie") + ["doi", "doi"]
+        assert items[0][1]["Zombie"] == MOCKED_RETRACTION_DOI
+        assert {item["DOI"] for kind, item in items if kind == "doi"} == {
+            UNRETRACTED_DOI,
+            MOCKED_RETRACTION_DOI,
+        }
+
+    def test_report_passes_items_on_as_known(self, fake_db):
+        paper = Paper(MOCKED_RETRACTION + " " + UNRETRACTED_TEXT, "text/plain")
+        seen = []
+        report = paper.report(
+            fake_db, validate_dois=False, on_item=lambda *item: seen.append(item)
+        )
+        assert seen == list(paper.iter_report(fake_db, validate_dois=False))
+        assert report == {
+            "dois": {
+                MOCKED_RETRACTION_DOI: {"Retracted": True},
+                UNRETRACTED_DOI: {"Retracted": False},
+            },
+            "zombies": [item for kind, item in seen if kind == "zombie"],
+        }
+
+
+@pytest.mark.enable_socket
+class TestPaperBatch:
+
+    TEXTS = [
+        UNRETRACTED_TEXT + " " + MOCKED_RETRACTION,
+        MOCKED_RETRACTION + " Also 10.1234/retracted12345.",
+        "Again " + MOCKED_RETRACTION_DOI.upper() + ".",
+        "Nothing cited here.",
+    ]
+
+    @pytest.mark.parametrize("stub_api", [({UNRETRACTED_DOI}, 0.0)], indirect=True)
+    def test_each_doi_resolved_once(self, stub_api, fake_db):
+        papers = [Paper(text, "text/plain") for text in self.TEXTS]
+        batch = PaperBatch(papers)
+        result = batch.report(fake_db)
+        assert sorted(stub_api.requests) == sorted(
+            {DOI.clean(doi) for doi in batch.dois}
+        )
+        assert len(stub_api.requests) == 4
+        assert result["papers"] == {
+            str(i): paper.report(fake_db) for i, paper in enumerate(papers)
+        }
+        assert len(stub_api.requests) == 4
+
+    def test_summary_ranks_most_cited(self, fake_db):
+        batch = PaperBatch(Paper(text, "text/plain") for text in self.TEXTS)
+        summary = batch.report(fake_db, validate_dois=False, most_cited=1)["summary"]
+        assert summary["papers"] == 4
+        assert summary["unique_dois"] == 4
+        assert summary["papers_with_zombies"] == 3
+        assert summary["most_cited_retracted"] == [
+            {
+                "DOI": MOCKED_RETRACTION_DOI,
+                "Cited by": 3,
+                "Papers": ["0", "1", "2"],
+                "Item": "Retraction",
+            }
+        ]
+
+    def test_papers_from_paths_named_by_path(self, fake_db, tmp_path):
+        path = tmp_path / "paper.txt"
+        _ = path.write_text(MOCKED_RETRACTION)
+        batch = PaperBatch([path])
+        batch.add(Paper(UNRETRACTED_TEXT, "text/plain"), name="inline")
+        reports = batch.report(fake_db, validate_dois=False)["papers"]
+        assert list(reports) == [str(path), "inline"]
+        assert reports[str(path)] == Paper.from_path(path).report(
+            fake_db, validate_dois=False
+        )
+
+
+class TestRetractionIndex:
+
+    def test_lookup_is_case_insensitive(self, fake_db):
+        assert "10.1234/RETRACTED12349" in fake_db.index
+        assert fake_db.index.get("10.1234/Retracted12349")
+
+    def test_lookup_many_keeps_given_keys(self, fake_db):
+        found = fake_db.lookup_many(
+            ["10.1234/Retracted12345", UNRETRACTED_DOI, MOCKED_RETRACTION_DOI]
+        )
+        assert set(found) == {"10.1234/Retracted12345", MOCKED_RETRACTION_DOI}
+        assert all(found.values())
+
+    def test_prefix_subindex(self, fake_db):
+        assert fake_db.index.with_prefix("10.1234") == fake_db.index.dois
+        assert fake_db.index.with_prefix("10.21105") == frozenset()
+
+    def test_dois_built_once(self, fake_db):
+        assert fake_db.index.dois is fake_db.index.dois
+        assert fake_db.dois is fake_db.dois
+
+    def test_dois_as_the_database_writes_them(self, csv_path):
+        _ = csv_path.write_text(
+            "Record ID,OriginalPaperDOI\n1,10.1234/MixedCase\n2,10.1234/lower\n",
+            encoding="utf8",
+        )
+        db = RetractionDatabase(csv_path, use_snapshot=False)
+        assert db.dois == {"10.1234/MixedCase", "10.1234/lower"}
+        assert db.index.dois == {"10.1234/mixedcase", "10.1234/lower"}
+
+    def test_report_matches_other_casing(self, fake_db):
+        paper = Paper(MOCKED_RETRACTION.upper(), mime_type="text/plain")
+        report = paper.report(fake_db, validate_dois=False)
+        assert report["dois"] == {"10.1234/RETRACTED12349": {"Retracted": True}}
+        assert [z["Zombie"] for z in report["zombies"]] == ["10.1234/RETRACTED12349"]
+
+
+class TestRetractionDatabaseSnapshot:
+
+    def test_snapshot_written_and_reused(self, csv_path, mocker):
+        first = RetractionDatabase(csv_path)
+        assert first.snapshot_path.exists()
+        RetractionDatabase._path_cache.clear()  # pylint: disable=protected-access
+        build = mocker.patch.object(RetractionDatabase, "_build_data")
+        second = RetractionDatabase(csv_path)
+        build.assert_not_called()
+        assert second.data == first.data
+
+    def test_touched_but_unchanged_csv_reuses_snapshot(self, csv_path, mocker):
+        _ = RetractionDatabase(csv_path)
+        RetractionDatabase._path_cache.clear()  # pylint: disable=protected-access
+        stat = csv_path.stat()
+        os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        build = mocker.patch.object(RetractionDatabase, "_build_data")
+        _ = RetractionDatabase(csv_path)
+        build.assert_not_called()
+
+    def test_changed_csv_rebuilds(self, csv_path):
+        _ = RetractionDatabase(csv_path)
+        RetractionDatabase._path_cache.clear()  # pylint: disable=protected-access
+        lines = csv_path.read_text(encoding="utf8").splitlines(keepends=True)
+        _ = csv_path.write_text("".join(lines[:2]), encoding="utf8")
+        db = RetractionDatabase(csv_path)
+        assert db.dois == {"10.1234/retracted12345"}
+
+    def test_new_release_rebuilds(self, csv_path, mocker):
+        _ = RetractionDatabase(csv_path)
+        RetractionDatabase._path_cache.clear()  # pylint: disable=protected-access
+        _ = mocker.patch("ash.main.package_version", return_value="99.0")
+        build = mocker.spy(RetractionDatabase, "_build_data")
+        _ = RetractionDatabase(csv_path)
+        build.assert_called_once()
+
+    def test_failed_write_leaves_no_partial_file(self, tmp_path):
+        target = tmp_path / "derived" / "rw_database.snapshot"
+        with pytest.raises(OSError):
+            with write_atomically(target) as stream:
+                _ = stream.write(b"partial")
+                raise OSError("disk full")
+        assert not list(target.parent.iterdir())
+
+    def test_snapshot_can_be_disabled(self, csv_path):
+        db = RetractionDatabase(csv_path, use_snapshot=False)
+        assert not db.snapshot_path.exists()
+
+
+class TestPrefilteredDatabase:
+
+    def test_lookups_match_full_database(self, csv_path):
+        dois = [MOCKED_RETRACTION_DOI.upper(), UNRETRACTED_DOI, "10.1234/nope"]
+        expected = RetractionDatabase(csv_path).lookup_many(dois)
+        assert PrefilteredDatabase(csv_path).lookup_many(dois) == expected
+        assert set(expected) == {MOCKED_RETRACTION_DOI.upper()}
+
+    def test_no_load_without_possible_hit(self, csv_path, mocker):
+        _ = PrefilteredDatabase(csv_path)
+        RetractionDatabase._path_cache.clear()  # pylint: disable=protected-access
+        load = mocker.patch.object(RetractionDatabase, "_get_data")
+        db = PrefilteredDatabase(csv_path)
+        assert not db.lookup_many([UNRETRACTED_DOI])
+        load.assert_not_called()
+        assert Paper(UNRETRACTED_TEXT, "text/plain").report(db, validate_dois=False)
+        load.assert_not_called()
+
+    def test_changed_csv_rebuilds_filter(self, csv_path):
+        _ = PrefilteredDatabase(csv_path)
+        RetractionDatabase._path_cache.clear()  # pylint: disable=protected-access
+        lines = csv_path.read_text(encoding="utf8").splitlines(keepends=True)
+        _ = csv_path.write_text("".join(lines[:2]), encoding="utf8")
+        db = PrefilteredDatabase(csv_path)
+        assert len(db.bloom) == 1
+        assert db.might_be_retracted("10.1234/RETRACTED12345")
+
+    def test_empty_filter_reused(self, csv_path, mocker):
+        header = csv_path.read_text(encoding="utf8").splitlines(keepends=True)[0]
+        _ = csv_path.write_text(header, encoding="utf8")
+        assert not PrefilteredDatabase(csv_path).bloom
+        build = mocker.patch.object(PrefilteredDatabase, "_build_filter")
+        db = PrefilteredDatabase(csv_path)
+        build.assert_not_called()
+        assert not db.might_be_retracted(MOCKED_RETRACTION_DOI)
+
+
+class TestParallelLoad:
+
+    @pytest.fixture(autouse=True)
+    def parallel_for_any_size(self, monkeypatch):
+        monkeypatch.setattr(RetractionDatabase, "PARALLEL_LOAD_BYTES", 0)
+
+    @pytest.fixture
+    def multiline_csv_path(self, csv_path):
+        with csv_path.open(encoding="utf8") as stream:
+            header, *rows = csv.reader(stream)
+        subject = header.index("Subject")
+        with csv_path.open("w", encoding="utf8", newline="") as stream:
+            writer = csv.writer(stream)
+            writer.writerow(header)
+            for i, row in enumerate(rows * 20):
+                if i % 3 == 0:
+                    row = row.copy()
+                    row[subject] = f'Multi\r\nline "{row[subject]}"'
+                writer.writerow(row)
+        return csv_path
+
+    @pytest.mark.parametrize("lazy", [False, True])
+    def test_parallel_matches_serial(self, multiline_csv_path, lazy):
+        path = multiline_csv_path
+        serial = RetractionDatabase(path, use_snapshot=False, lazy=lazy)
+        RetractionDatabase._path_cache.clear()  # pylint: disable=protected-access
+        parallel = RetractionDatabase(path, use_snapshot=False, lazy=lazy, jobs=2)
+        assert parallel.data.n_rows == serial.data.n_rows
+        assert parallel.data.row_keys() == serial.data.row_keys()
+        assert list(parallel.data.fingerprints) == list(serial.data.fingerprints)
+        assert parallel.data == serial.data
+        # pylint: disable-next=protected-access
+        encodings = [type(column) for column in parallel.data._data]
+        assert encodings == [type(column) for column in serial.data._data]
+        # pylint: disable-next=protected-access
+        assert parallel._invalid_dois == serial._invalid_dois
+        subjects = [r["Subject"] for r in parallel.data["10.1234/retracted12345"]]
+        assert "Multi\nline" in subjects[0]
+        assert subjects == [r["Subject"] for r in serial.data["10.1234/retracted12345"]]
+
+    @pytest.mark.parametrize("lazy", [False, True])
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_stray_quote_in_unquoted_field(self, csv_path, lazy, jobs):
+        text = csv_path.read_text(encoding="utf8")
+        _ = csv_path.write_text(text.replace("First Title", 'First 12" Title'))
+        db = RetractionDatabase(csv_path, use_snapshot=False, lazy=lazy, jobs=jobs)
+        original = RetractionDatabase(MOCK_DIR / "rw_database.csv", use_snapshot=False)
+        assert db.data.n_rows == original.data.n_rows
+        titles = {r["Title"] for r in db.data["10.1234/retracted12345"]}
+        assert titles == {'First 12" Title of Paper'}
+
+
+class TestLazyRetractionDatabase:
+
+    def test_lazy_load_keeps_report_columns_only(self, csv_path):
+        db = RetractionDatabase(csv_path, lazy=True)
+        assert set(db.data.stored_columns) <= set(RetractionDatabase.LAZY_COLUMNS)
+        assert "OriginalPaperDOI" in db.data.stored_columns
+
+    @pytest.mark.parametrize("use_snapshot", [False, True])
+    def test_lazy_records_match_full_load(self, csv_path, use_snapshot):
+        full = RetractionDatabase(csv_path, use_snapshot=False)
+        if use_snapshot:
+            _ = RetractionDatabase(csv_path, lazy=True)
+            RetractionDatabase._path_cache.clear()  # pylint: disable=protected-access
+        lazy = RetractionDatabase(csv_path, use_snapshot=use_snapshot, lazy=True)
+        assert lazy.dois == full.dois
+        for doi in full.dois:
+            assert [dict(r) for r in lazy.data[doi]] == [
+                dict(r) for r in full.data[doi]
+            ]
+
+    def test_lazy_report_matches_full_report(self, csv_path):
+        paper = Paper.from_dois([MOCKED_RETRACTION_DOI, UNRETRACTED_DOI])
+        full = RetractionDatabase(csv_path, use_snapshot=False)
+        lazy = RetractionDatabase(csv_path, use_snapshot=False, lazy=True)
+        assert paper.report(lazy, validate_dois=False) == paper.report(
+            full, validate_dois=False
+        )
+
+    def test_lazy_and_full_snapshots_kept_apart(self, csv_path):
+        full = RetractionDatabase(csv_path)
+        lazy = RetractionDatabase(csv_path, lazy=True)
+        assert full.snapshot_path != lazy.snapshot_path
+        assert lazy.data.source is not None and full.data.source is None
+
+
+class TestDatabaseUpdate:
+
+    @pytest.fixture
+    def releases(self, csv_path, tmp_path):
+        old = csv_path
+        lines = old.read_text(encoding="utf8").splitlines(keepends=True)
+        new_row = lines[3].replace("retracted12349", "Retracted99999")
+        new_row = new_row.replace("12349", "99999")
+        lines[2] = lines[2].replace(",Retraction,", ",Correction,")
+        del lines[3]
+        new = tmp_path / "rw_new.csv"
+        _ = new.write_text("".join(lines) + new_row, encoding="utf8")
+        return old, new
+
+    @pytest.mark.parametrize("lazy", [False, True])
+    def test_diff_by_record_id(self, releases, lazy):
+        old, new = releases
+        db = RetractionDatabase(old, use_snapshot=False, lazy=lazy)
+        assert db.update(new) == {
+            "added": ["99999"],
+            "changed": ["12346"],
+            "removed": ["12349"],
+            "unchanged": 2,
+            "newly_retracted": ["10.1234/Retracted99999"],
+            "no_longer_listed": ["10.1234/retracted12349"],
+        }
+        assert db.path == new
+
+    @pytest.mark.parametrize("lazy", [False, True])
+    def test_updated_matches_fresh_load(self, releases, lazy):
+        old, new = releases
+        db = RetractionDatabase(old, lazy=lazy)
+        _ = db.update(new)
+        RetractionDatabase._path_cache.clear()  # pylint: disable=protected-access
+        fresh = RetractionDatabase(new, use_snapshot=False, lazy=lazy)
+        assert db.dois == fresh.dois
+        for doi in fresh.dois:
+            assert [dict(r) for r in db.data[doi]] == [dict(r) for r in fresh.data[doi]]
+        assert db.data.fingerprints == fresh.data.fingerprints
+        # pylint: disable-next=protected-access
+        assert db._invalid_dois == fresh._invalid_dois
+
+    def test_repeated_rows_matched_one_for_one(self, csv_path, tmp_path):
+        lines = csv_path.read_text(encoding="utf8").splitlines(keepends=True)
+        _ = csv_path.write_text("".join(lines + lines[1:2]), encoding="utf8")
+        new = tmp_path / "rw_new.csv"
+        _ = new.write_text("".join(lines[:3] + lines[1:2]), encoding="utf8")
+        db = RetractionDatabase(csv_path, use_snapshot=False)
+        diff = db.update(new)
+        assert diff["removed"] == ["12349", "22345"]
+        assert diff["unchanged"] == 3
+
+    def test_unchanged_rows_not_parsed(self, releases, mocker):
+        old, new = releases
+        db = RetractionDatabase(old, use_snapshot=False)
+        parse = mocker.patch("ash.main.parse_record", wraps=parse_record)
+        _ = db.update(new)
+        # Header, changed, added, and the blank-DOI row that was never indexed
+        assert parse.call_count == 4
+
+    def test_updated_database_snapshotted(self, releases, mocker):
+        old, new = releases
+        _ = RetractionDatabase(old).update(new)
+        RetractionDatabase._path_cache.clear()  # pylint: disable=protected-access
+        build = mocker.patch.object(RetractionDatabase, "_build_data")
+        _ = RetractionDatabase(new)
+        build.assert_not_called()
+
 
 class TestMIMEBehavior:
     @pytest.mark.parametrize(
@@ -211,6 +749,34 @@ class TestDOI:
     def test_dois_regex_acceptable(self, raw):
         _ = DOI(raw)
 
+    def test_normalize_many_reports_without_raising(self):
+        raws = [" 10.1234/Retracted12345. ", "", "unavailable", "10.x/abc", "1235.23"]
+        cleaned, valid, reasons = DOI.normalize_many(raws)
+        assert cleaned == [
+            "10.1234/Retracted12345",
+            "",
+            "unavailable",
+            "10.x/abc",
+            "1235.23",
+        ]
+        assert valid == [True, False, False, False, False]
+        assert reasons == [
+            DOI.VALID,
+            DOI.EMPTY,
+            DOI.NO_SLASH,
+            DOI.NO_MATCH,
+            DOI.NO_SLASH,
+        ]
+
+    def test_normalize_many_agrees_with_constructor(self):
+        raws = ["10.1234/retracted12345", "unavailable", "10.1177/ 0020720920940575"]
+        for raw, ok in zip(raws, DOI.normalize_many(raws)[1]):
+            if ok:
+                _ = DOI(raw)
+            else:
+                with pytest.raises(InvalidDOIError):
+                    _ = DOI(raw)
+
 
 class TestAPICallsForDOI:
 
@@ -225,3 +791,177 @@ class TestAPICallsForDOI:
         mock_http.assert_called_once_with("HEAD", expected_url)
 
         assert exists_result
+
+
+@pytest.mark.enable_socket
+class TestConcurrentValidation:
+
+    DOIS = [f"10.5555/stub{i}" for i in range(12)]
+
+    @pytest.mark.parametrize("stub_api", [({"10.5555/stub1"}, 0.0)], indirect=True)
+    def test_exists_many_results(self, stub_api):
+        result = DOI.exists_many(self.DOIS)
+        assert result == {doi: doi == "10.5555/stub1" for doi in self.DOIS}
+
+    @pytest.mark.parametrize("stub_api", [(set(), 0.05)], indirect=True)
+    def test_requests_overlap_over_reused_connections(self, stub_api):
+        _ = DOI.exists_many(self.DOIS, max_workers=4)
+        assert stub_api.peak_active > 1
+        assert len(stub_api.clients) <= 4
+
+    @pytest.mark.parametrize("stub_api", [(set(), 0.0)], indirect=True)
+    def test_answers_are_cached(self, stub_api):
+        _ = DOI.exists_many(self.DOIS)
+        _ = DOI.exists_many(self.DOIS)
+        assert len(stub_api.requests) == len(self.DOIS)
+
+    @pytest.mark.parametrize("stub_api", [(set(), 1.0)], indirect=True)
+    def test_timeout_gives_no_answer(self, stub_api):
+        assert DOI.exists_many(self.DOIS[:2], timeout=0.1) == {
+            self.DOIS[0]: None,
+            self.DOIS[1]: None,
+        }
+
+    @pytest.mark.parametrize("stub_api", [({UNRETRACTED_DOI}, 0.0)], indirect=True)
+    def test_report_uses_batch_validation(self, stub_api, fake_db):
+        paper = Paper(UNRETRACTED_TEXT + " " + MOCKED_RETRACTION, "text/plain")
+        report = paper.report(fake_db)
+        assert report["dois"] == {
+            UNRETRACTED_DOI: {"DOI is valid": True, "Retracted": False},
+            MOCKED_RETRACTION_DOI: {"DOI is valid": False, "Retracted": True},
+        }
+
+
+@pytest.mark.enable_socket
+class TestAsyncValidation:
+
+    DOIS = [f"10.5555/stub{i}" for i in range(12)]
+
+    @pytest.mark.parametrize("stub_api", [({"10.5555/stub1"}, 0.0)], indirect=True)
+    def test_aexists_many_results(self, stub_api):
+        result = asyncio.run(DOI.aexists_many(self.DOIS))
+        assert result == {doi: doi == "10.5555/stub1" for doi in self.DOIS}
+        assert asyncio.run(DOI.aexists_many(self.DOIS)) == result
+        assert len(stub_api.requests) == len(self.DOIS)
+
+    @pytest.mark.parametrize("stub_api", [(set(), 0.05)], indirect=True)
+    def test_requests_overlap_over_reused_connections(self, stub_api):
+        async def check():
+            async with AsyncHeadClient(max_connections=4) as client:
+                _ = await DOI.aexists_many(self.DOIS[:6], client=client)
+                _ = await DOI.aexists_many(self.DOIS[6:], client=client)
+
+        asyncio.run(check())
+        assert stub_api.peak_active > 1
+        assert len(stub_api.clients) <= 4
+
+    @pytest.mark.parametrize("stub_api", [(set(), 1.0)], indirect=True)
+    def test_timeout_gives_no_answer(self, stub_api):
+        result = asyncio.run(DOI.aexists_many(self.DOIS[:2], timeout=0.1))
+        assert result == {self.DOIS[0]: None, self.DOIS[1]: None}
+
+    @pytest.mark.parametrize("stub_api", [(set(), 1.0)], indirect=True)
+    def test_cancellation_propagates(self, stub_api):
+        async def cancel():
+            task = asyncio.create_task(DOI.aexists_many(self.DOIS))
+            await asyncio.sleep(0.1)
+            _ = task.cancel()
+            await task
+
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(cancel())
+        assert not DOI._cached_api_results  # pylint: disable=protected-access
+
+    @pytest.mark.parametrize("stub_api", [({UNRETRACTED_DOI}, 0.0)], indirect=True)
+    def test_areport_matches_report(self, stub_api, fake_db, tmp_path):
+        path = tmp_path / "paper.txt"
+        _ = path.write_text(UNRETRACTED_TEXT + " " + MOCKED_RETRACTION)
+
+        async def report():
+            paper = await Paper.afrom_path(path)
+            return await paper.areport(fake_db)
+
+        assert asyncio.run(report()) == Paper.from_path(path).report(fake_db)
+
+
+class TestCircuitBreaker:
+
+    def test_trips_after_consecutive_failures(self):
+        breaker = CircuitBreaker(threshold=2, cooldown=60)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.is_open and not breaker.allow()
+
+    @pytest.fixture
+    def clock(self, mocker):
+        return mocker.patch("ash.main.time.monotonic", return_value=1_000.0)
+
+    def test_one_trial_after_cooldown(self, clock):
+        breaker = CircuitBreaker(threshold=1, cooldown=60)
+        breaker.record_failure()
+        clock.return_value += 59
+        assert not breaker.allow()
+        clock.return_value += 2
+        assert breaker.allow()
+        assert not breaker.allow()
+        breaker.record_failure()
+        assert not breaker.allow()
+        clock.return_value += 61
+        assert breaker.allow()
+        breaker.record_success()
+        assert not breaker.is_open and breaker.allow()
+
+    def test_trip_for_given_time(self, clock):
+        breaker = CircuitBreaker(cooldown=60)
+        breaker.trip(5)
+        assert not breaker.allow()
+        clock.return_value += 6
+        assert breaker.allow()
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [("120", 120), ("-5", 0), (None, None), ("soon", None)],
+    )
+    def test_retry_after_seconds(self, value, expected):
+        assert retry_after_seconds(value) == expected
+
+    def test_retry_after_http_date(self):
+        assert 50 < retry_after_seconds(formatdate(time.time() + 60, usegmt=True)) <= 60
+
+
+@pytest.mark.enable_socket
+class TestValidationBackoff:
+
+    DOIS = [f"10.5555/stub{i}" for i in range(10)]
+
+    @pytest.mark.parametrize("stub_api", [(set(), 0.5)], indirect=True)
+    def test_failing_api_skipped_after_threshold(self, stub_api):
+        result = DOI.exists_many(self.DOIS, max_workers=1, timeout=0.1)
+        assert len(stub_api.requests) == DOI.breaker.threshold
+        assert result == dict.fromkeys(self.DOIS[: DOI.breaker.threshold])
+
+    @pytest.mark.parametrize("stub_api", [({UNRETRACTED_DOI}, 0.0)], indirect=True)
+    def test_report_marks_skipped_validation(self, stub_api, fake_db):
+        DOI.breaker.trip()
+        paper = Paper(UNRETRACTED_TEXT + " " + MOCKED_RETRACTION, "text/plain")
+        for report in (paper.report(fake_db), asyncio.run(paper.areport(fake_db))):
+            assert report["dois"][UNRETRACTED_DOI] == {
+                "DOI is valid": None,
+                "Retracted": False,
+                "Validation": "skipped",
+            }
+        assert not stub_api.requests
+
+    @pytest.mark.parametrize("mock_http", [429], indirect=True)
+    def test_too_many_requests_backs_off(self, mock_http):
+        mock_http.return_value.headers = {"Retry-After": "30"}
+        assert DOI(UNRETRACTED_DOI).exists() is None
+        assert DOI.breaker.is_open
+        assert DOI.exists_many(["10.5555/later"]) == {}
+        assert mock_http.call_count == 1
+        assert (
+            UNRETRACTED_DOI not in DOI._cached_api_results
+        )  # pylint: disable=protected-access
@@ -0,0 +1,46 @@
+import pytest
+
+from ash.bloom import BloomFilter
+
+KEYS = [f"10.1234/retracted{i}" for i in range(5000)]
+OTHERS = [f"10.5678/fine{i}" for i in range(20000)]
+
+
+@pytest.fixture(scope="module")
+def bloom():
+    return BloomFilter.from_keys(KEYS, error_rate=0.01)
+
+
+def test_no_false_negatives(bloom):
+    assert all(key in bloom for key in KEYS)
+
+
+def test_false_positive_rate_near_target(bloom):
+    false_positives = sum(key in bloom for key in OTHERS)
+    assert false_positives / len(OTHERS) < 0.02
+    assert bloom.error_rate == pytest.approx(0.01, rel=0.2)
+
+
+def test_size_scales_with_error_rate():
+    small = BloomFilter(50_000, error_rate=0.001)
+    assert 85_000 < len(small.bits) < 95_000
+    assert len(BloomFilter(50_000, error_rate=0.01).bits) < len(small.bits)
+
+
+def test_round_trip(bloom):
+    restored = BloomFilter.from_bytes(bloom.to_bytes())
+    assert restored.bits == bloom.bits
+    assert len(restored) == len(bloom)
+    assert all(key in restored for key in KEYS)
+
+
+def test_corrupt_bytes_rejected(bloom):
+    data = bloom.to_bytes()
+    with pytest.raises(ValueError):
+        _ = BloomFilter.from_bytes(b"NOTBLOOM" + data[8:])
+    with pytest.raises(ValueError):
+        _ = BloomFilter.from_bytes(data[:-1])
+
+
+def test_empty_filter_rejects():
+    assert "10.1234/anything" not in BloomFilter.from_keys([])
@@ -0,0 +1,189 @@
+# pylint: disable=unused-argument
+import multiprocessing
+import pickle
+import sqlite3
+import threading
+
+import pytest
+
+from ash.cache import ExtractionCache, ValidationCache
+from ash.main import DOI, Paper, PlainTextHandler
+
+
+@pytest.fixture
+def cache(tmp_path):
+    validation_cache = ValidationCache(tmp_path / "validation.sqlite3")
+    yield validation_cache
+    validation_cache.close()
+
+
+class TestValidationCache:
+
+    def test_roundtrip(self, cache):
+        cache.set_many({"10.5555/yes": True, "10.5555/no": False})
+        assert cache.get_many(["10.5555/yes", "10.5555/no", "10.5555/unknown"]) == {
+            "10.5555/yes": True,
+            "10.5555/no": False,
+        }
+
+    def test_negative_answers_expire_sooner(self, cache, mocker):
+        clock = mocker.patch("ash.cache.time.time", return_value=1_000_000.0)
+        cache.set_many({"10.5555/yes": True, "10.5555/no": False})
+        clock.return_value += cache.negative_ttl + 1
+        assert cache.get_many(["10.5555/yes", "10.5555/no"]) == {"10.5555/yes": True}
+        clock.return_value += cache.ttl
+        assert not cache.get_many(["10.5555/yes"])
+
+    def test_least_recently_used_evicted(self, tmp_path, mocker):
+        clock = mocker.patch("ash.cache.time.time", return_value=1_000_000.0)
+        cache = ValidationCache(tmp_path / "small.sqlite3", max_entries=2)
+        cache.set("10.5555/a", True)
+        clock.return_value += 1
+        cache.set("10.5555/b", True)
+        clock.return_value += 1
+        assert cache.get("10.5555/a")  # touch, so b is now least recent
+        clock.return_value += 1
+        cache.set("10.5555/c", True)
+        assert len(cache) == 2
+        assert cache.get("10.5555/b") is None
+        cache.close()
+
+    def test_reads_while_another_connection_writes(self, cache):
+        cache.set("10.5555/yes", True)
+        other = sqlite3.connect(cache.path, isolation_level=None)
+        _ = other.execute("BEGIN IMMEDIATE")
+        try:
+            assert cache.get("10.5555/yes")
+        finally:
+            other.close()
+
+    def test_concurrent_writers(self, tmp_path):
+        path = tmp_path / "shared.sqlite3"
+        with multiprocessing.get_context("spawn").Pool(4) as pool:
+            pool.starmap(_write_range, [(path, n) for n in range(4)])
+        cache = ValidationCache(path)
+        assert len(cache) == 4 * 50
+        cache.close()
+
+    def test_opens_while_another_connection_writes(self, tmp_path):
+        path = tmp_path / "busy.sqlite3"
+        other = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        _ = other.execute("CREATE TABLE held (x)")
+        _ = other.execute("BEGIN IMMEDIATE")
+        release = threading.Timer(0.2, other.execute, ["COMMIT"])
+        release.start()
+        cache = ValidationCache(path)
+        cache.set("10.5555/a", True)
+        release.join()
+        other.close()
+        assert cache.get("10.5555/a")
+        # pylint: disable-next=protected-access
+        mode = cache._connect().execute("PRAGMA journal_mode").fetchone()
+        assert mode == ("wal",)
+        cache.close()
+
+
+def _write_range(path, worker):
+    cache = ValidationCache(path)
+    for i in range(50):
+        cache.set(f"10.5555/{worker}-{i}", bool(i % 2))
+    cache.close()
+
+
+class TestDOIUsesPersistentCache:
+
+    @pytest.mark.parametrize("mock_http", [200], indirect=True)
+    def test_answers_survive_process_memory(self, mock_http, delete_api_cache):
+        assert DOI("10.1126/science.aax5705").exists()
+        DOI._cached_api_results = {}  # pylint: disable=protected-access
+        assert DOI("10.1126/science.aax5705").exists()
+        mock_http.assert_called_once()
+        assert delete_api_cache.get("10.1126/science.aax5705")
+
+    @pytest.mark.parametrize("mock_http", [418], indirect=True)
+    def test_unclear_answers_not_stored(self, mock_http, delete_api_cache):
+        assert DOI.exists_many(["10.1126/science.aax5705"]) == {
+            "10.1126/science.aax5705": None
+        }
+        assert len(delete_api_cache) == 0
+
+
+class TestExtractionCache:
+
+    @pytest.fixture
+    def extraction_cache(self, tmp_path):
+        extraction_cache = ExtractionCache(tmp_path / "extraction.sqlite3")
+        yield extraction_cache
+        extraction_cache.close()
+
+    @pytest.fixture
+    def paper_path(self, tmp_path):
+        path = tmp_path / "paper.txt"
+        _ = path.write_text("Cites 10.1234/retracted12349 and 10.21105/joss.03440.")
+        return path
+
+    def test_unchanged_paper_not_extracted_again(
+        self, extraction_cache, paper_path, mocker
+    ):
+        first = Paper.from_path(paper_path, cache=extraction_cache)
+        extract = mocker.patch.object(PlainTextHandler, "extract_dois")
+        second = Paper.from_path(paper_path, cache=extraction_cache)
+        extract.assert_not_called()
+        assert (
+            second.dois
+            == first.dois
+            == [
+                "10.1234/retracted12349",
+                "10.21105/joss.03440",
+            ]
+        )
+
+    def test_changed_bytes_extracted_again(self, extraction_cache, paper_path):
+        _ = Paper.from_path(paper_path, cache=extraction_cache)
+        _ = paper_path.write_text("Now cites 10.1234/retracted12345 only.")
+        paper = Paper.from_path(paper_path, cache=extraction_cache)
+        assert paper.dois == ["10.1234/retracted12345"]
+        assert len(extraction_cache) == 2
+
+    def test_handler_version_in_key(self, extraction_cache, mocker):
+        before = extraction_cache.key("abc", PlainTextHandler())
+        mocker.patch.object(PlainTextHandler, "VERSION", PlainTextHandler.VERSION + 1)
+        assert extraction_cache.key("abc", PlainTextHandler()) != before
+
+    def test_least_recently_used_evicted_by_size(self, tmp_path, mocker):
+        clock = mocker.patch("ash.cache.time.time", return_value=1_000_000.0)
+        small = ExtractionCache(tmp_path / "small.sqlite3", max_bytes=100)
+        small.set("a", ["10.5555/" + "a" * 30])
+        clock.return_value += 1
+        small.set("b", ["10.5555/" + "b" * 30])
+        clock.return_value += 1
+        assert small.get("a")
+        clock.return_value += 1
+        small.set("c", ["10.5555/" + "c" * 30])
+        assert small.get("b") is None
+        assert small.get("a") and small.get("c")
+        small.close()
+
+    def test_hits_read_while_another_connection_writes(self, extraction_cache):
+        extraction_cache.set("a", ["10.5555/a"])
+        other = sqlite3.connect(extraction_cache.path, isolation_level=None)
+        _ = other.execute("BEGIN IMMEDIATE")
+        try:
+            assert extraction_cache.get("a") == ["10.5555/a"]
+        finally:
+            other.close()
+
+    def test_broken_cache_falls_back_to_extracting(
+        self, extraction_cache, paper_path, mocker
+    ):
+        error = sqlite3.OperationalError("disk I/O error")
+        _ = mocker.patch.object(extraction_cache, "get", side_effect=error)
+        _ = mocker.patch.object(extraction_cache, "set", side_effect=error)
+        paper = Paper.from_path(paper_path, cache=extraction_cache)
+        assert paper.dois == ["10.1234/retracted12349", "10.21105/joss.03440"]
+
+    def test_picklable_for_workers(self, extraction_cache):
+        extraction_cache.set("a", ["10.5555/a"])
+        restored = pickle.loads(pickle.dumps(extraction_cache))
+        assert restored.get("a") == ["10.5555/a"]
+        restored.close()
@@ -1,9 +1,38 @@
 # pylint: disable=unused-argument
+import json
+from pathlib import Path
 
 import pytest
 from click.testing import CliRunner
 
-from ash import ash_cli
+from ash import ash_cli, config
+from ash.cache import ExtractionCache
+
+MOCK_DB = Path(__file__).parent / "mock" / "rw_database.csv"
+
+
+@pytest.fixture(autouse=True)
+def config_file(tmp_path, monkeypatch):
+    path = tmp_path / "config.toml"
+    _ = path.write_text("[database]")
+    monkeypatch.setattr(config, "CONFIG_FILE", path)
+    return path
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    directory = tmp_path / "corpus"
+    (directory / "nested").mkdir(parents=True)
+    _ = (directory / "clean.txt").write_text("See 10.21105/joss.03440 for more.")
+    _ = (directory / "nested" / "zombie.tex").write_text("Cite 10.1234/retracted12349.")
+    _ = (directory / "ignored.xyz").write_text("10.1234/retracted12345")
+    return directory
+
+
+def run_lines(args):
+    result = CliRunner().invoke(ash_cli, ["--database", str(MOCK_DB), *args])
+    assert result.exit_code == 0, result.output
+    return [json.loads(line) for line in result.stdout.splitlines()]
 
 
 @pytest.mark.parametrize("args", [[], ["--help"]])
@@ -13,3 +42,82 @@ def test_help_works(args):
     assert result.exit_code == 0
     assert result.output.startswith("Usage")
     assert "help" in result.output
+
+
+def test_single_paper_pretty_printed(corpus):
+    result = CliRunner().invoke(
+        ash_cli, ["--database", str(MOCK_DB), str(corpus / "clean.txt")]
+    )
+    assert result.exit_code == 0
+    assert "{'dois': {'10.21105/joss.03440': {'Retracted': False}}" in result.output
+
+
+@pytest.mark.enable_socket
+@pytest.mark.parametrize("stub_api", [({"10.21105/joss.03440"}, 0.0)], indirect=True)
+def test_validate_shows_answers_as_they_arrive(corpus, stub_api):
+    paper = corpus / "clean.txt"
+    _ = paper.write_text("See 10.21105/joss.03440 and 10.1234/retracted12349.")
+    result = CliRunner().invoke(
+        ash_cli, ["--database", str(MOCK_DB), "--validate", str(paper)]
+    )
+    assert result.exit_code == 0, result.output
+    assert result.stderr.splitlines()[0].startswith("Zombie 10.1234/retracted12349:")
+    assert sorted(result.stderr.splitlines()[1:]) == [
+        "10.1234/retracted12349: retracted, not found",
+        "10.21105/joss.03440: not retracted, valid",
+    ]
+    assert "'10.21105/joss.03440': {'DOI is valid': True" in result.stdout
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_directory_streams_json_lines(corpus, jobs):
+    *papers, summary = run_lines([str(corpus), "--jobs", jobs])
+    assert {Path(p["path"]).name for p in papers} == {"clean.txt", "zombie.tex"}
+    assert summary["summary"]["zombies"] == 1
+    assert summary["summary"]["papers_with_zombies"] == 1
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_extraction_cache_reused(corpus, jobs, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "CACHE_DIR", tmp_path / "cache")
+    first = run_lines([str(corpus), "--jobs", jobs, "--extraction-cache"])
+    cached = ExtractionCache()
+    assert len(cached) == 2
+    cached.close()
+    _ = (corpus / "clean.txt").write_bytes(b"no DOIs now")
+    *papers, summary = run_lines([str(corpus), "--jobs", jobs, "--extraction-cache"])
+    reports = {Path(p["path"]).name: p["report"] for p in papers}
+    assert reports["clean.txt"]["dois"] == {}
+    assert reports["zombie.tex"] == next(
+        p["report"] for p in first if p.get("path", "").endswith("zombie.tex")
+    )
+    assert summary["summary"]["zombies"] == 1
+
+
+def test_glob_and_file_list(corpus, tmp_path):
+    listing = tmp_path / "papers.txt"
+    _ = listing.write_text(f"# queue\n{corpus / 'nested' / 'zombie.tex'}\n")
+    *papers, _ = run_lines([str(corpus / "*.txt"), "--from-file", str(listing)])
+    assert [Path(p["path"]).name for p in papers] == ["clean.txt", "zombie.tex"]
+
+
+def test_unreadable_paper_reported_not_fatal(corpus):
+    *papers, summary = run_lines([str(corpus / "clean.txt"), str(corpus / "gone.txt")])
+    assert "error" in papers[1]
+    assert summary["summary"]["failed"] == 1
+
+
+def test_stats(corpus):
+    *papers, summary = run_lines([str(corpus), "--stats"])
+    assert set(papers[0]["timings"]) == {"mime", "extract", "report"}
+    assert summary["summary"]["papers_per_second"] > 0
+
+
+def test_update_prints_diff_and_records_new_release(tmp_path, config_file):
+    new_release = tmp_path / "rw_new.csv"
+    lines = MOCK_DB.read_text(encoding="utf8").splitlines(keepends=True)
+    _ = new_release.write_text("".join(lines[:3] + lines[4:]), encoding="utf8")
+    (diff,) = run_lines(["--update", str(new_release)])
+    assert diff["removed"] == ["12349"]
+    assert diff["no_longer_listed"] == ["10.1234/retracted12349"]
+    assert str(new_release.resolve()) in config_file.read_text()
@@ -0,0 +1,93 @@
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from ash import ash_cli, instrument
+from ash.corpus import screen_corpus
+from ash.main import Paper, RetractionDatabase
+
+MOCK_DB = Path(__file__).parent / "mock" / "rw_database.csv"
+
+
+@pytest.fixture
+def enabled():
+    instrument.reset()
+    instrument.enable()
+    yield
+    instrument.disable()
+    instrument.reset()
+
+
+def test_disabled_records_nothing():
+    instrument.reset()
+    with instrument.span("anything"):
+        instrument.count("things")
+    assert instrument.as_dict() == {"spans": {}, "counters": {}}
+
+
+def test_spans_counters_and_histograms(enabled):
+    @instrument.timed("decorated")
+    def work(x):
+        return x * 2
+
+    for _ in range(3):
+        with instrument.span("block"):
+            assert work(2) == 4
+    instrument.count("things", 5)
+    collected = instrument.as_dict()
+    assert collected["spans"]["block"]["count"] == 3
+    assert collected["spans"]["decorated"]["count"] == 3
+    assert sum(collected["spans"]["block"]["buckets_us"].values()) == 3
+    assert collected["counters"] == {"things": 5}
+    assert json.loads(instrument.to_json()) == collected
+
+
+def test_merge_adds_up(enabled):
+    with instrument.span("block"):
+        instrument.count("things")
+    collected = instrument.as_dict()
+    instrument.merge(collected)
+    merged = instrument.as_dict()
+    assert merged["spans"]["block"]["count"] == 2
+    assert merged["spans"]["block"]["total"] == 2 * collected["spans"]["block"]["total"]
+    assert merged["counters"] == {"things": 2}
+
+
+def test_report_stages_timed(enabled):
+    db = RetractionDatabase(MOCK_DB)
+    paper = Paper("Cites 10.1234/retracted12349 and 10.21105/joss.03440", "text/plain")
+    _ = paper.report(db, validate_dois=False)
+    collected = instrument.as_dict()
+    assert {"extract", "scan", "lookup", "report"} <= set(collected["spans"])
+    assert collected["counters"]["dois.extracted"] == 2
+    assert collected["counters"]["lookup.retracted"] == 1
+
+
+def test_worker_processes_merged(enabled, tmp_path):
+    for i in range(3):
+        _ = (tmp_path / f"{i}.txt").write_text(f"See 10.1234/retracted1234{i}.")
+    results = list(
+        screen_corpus(
+            sorted(tmp_path.glob("*.txt")), RetractionDatabase(MOCK_DB), jobs=2
+        )
+    )
+    assert all("instrumentation" not in r for r in results)
+    collected = instrument.as_dict()
+    assert collected["spans"]["extract"]["count"] == 3
+    assert collected["counters"]["dois.extracted"] == 3
+
+
+def test_cli_writes_json(enabled, tmp_path, monkeypatch):
+    monkeypatch.setattr("ash.config.CONFIG_FILE", tmp_path / "config.toml")
+    paper = tmp_path / "paper.txt"
+    _ = paper.write_text("Cite 10.1234/retracted12349.")
+    output = tmp_path / "timings.json"
+    result = CliRunner().invoke(
+        ash_cli,
+        ["--database", str(MOCK_DB), "--timings", str(output), str(paper)],
+    )
+    assert result.exit_code == 0, result.output
+    collected = json.loads(output.read_text())
+    assert {"mime", "extract", "lookup", "report"} <= set(collected["spans"])
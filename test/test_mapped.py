@@ -0,0 +1,71 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from ash.main import Paper, RetractionDatabase
+from ash.mapped import MappedRetractionDatabase
+
+QUERIES = ["10.1234/RETRACTED12349", "10.1234/retracted12345", "10.21105/joss.03440"]
+
+
+@pytest.fixture
+def mapped(csv_path):
+    with MappedRetractionDatabase.from_csv(csv_path) as db:
+        yield db
+
+
+def lookup_in_worker(path):
+    with MappedRetractionDatabase(path) as db:
+        return db.lookup_many(QUERIES)
+
+
+def test_lookups_match_database(csv_path, mapped):
+    db = RetractionDatabase(csv_path)
+    assert mapped.lookup_many(QUERIES) == db.lookup_many(QUERIES)
+    assert set(mapped) == db.index.dois
+    assert len(mapped) == len(db.index.dois)
+    assert "10.1234/Retracted12349" in mapped
+    assert not mapped.get("10.1234/nope")
+
+
+def test_reports_match_database(csv_path, mapped):
+    paper = Paper(" ".join(QUERIES), "text/plain")
+    expected = paper.report(RetractionDatabase(csv_path), validate_dois=False)
+    assert paper.report(mapped, validate_dois=False) == expected
+
+
+def test_reused_until_csv_changes(csv_path, mapped, mocker):
+    load = mocker.patch.object(RetractionDatabase, "_get_data")
+    with MappedRetractionDatabase.from_csv(csv_path) as reopened:
+        assert reopened.path == mapped.path
+    load.assert_not_called()
+    mocker.stopall()
+    lines = csv_path.read_text(encoding="utf8").splitlines(keepends=True)
+    _ = csv_path.write_text("".join(lines[:2]), encoding="utf8")
+    RetractionDatabase._path_cache.clear()  # pylint: disable=protected-access
+    with MappedRetractionDatabase.from_csv(csv_path) as rebuilt:
+        assert list(rebuilt) == ["10.1234/retracted12345"]
+
+
+def test_workers_share_one_file(mapped):
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(lookup_in_worker, [mapped.path] * 4))
+    assert all(result == mapped.lookup_many(QUERIES) for result in results)
+
+
+def test_corrupt_file_rejected(mapped, tmp_path):
+    truncated = tmp_path / "truncated.mapped"
+    _ = truncated.write_bytes(mapped.path.read_bytes()[:-1])
+    with pytest.raises(ValueError):
+        _ = MappedRetractionDatabase(truncated)
+    _ = truncated.write_bytes(b"x" * 64)
+    with pytest.raises(ValueError):
+        _ = MappedRetractionDatabase(truncated)
+
+
+def test_failed_build_leaves_no_partial_file(csv_path, tmp_path):
+    target = tmp_path / "built" / "rw.mapped"
+    target.mkdir(parents=True)
+    with pytest.raises(OSError):
+        _ = MappedRetractionDatabase.build(RetractionDatabase(csv_path), target)
+    assert [p.name for p in target.parent.iterdir()] == ["rw.mapped"]
@@ -0,0 +1,205 @@
+import csv
+from io import BytesIO
+
+import pytest
+
+from ash.records import (
+    CategoryColumn,
+    CSVSource,
+    RecordStore,
+    TextColumn,
+    concat_columns,
+    iter_csv_records,
+    read_csv_rows,
+    split_csv_records,
+)
+
+COLUMNS = ["Record ID", "OriginalPaperDOI", "RetractionNature", "Title"]
+ROWS = [
+    ["1", "10.1234/A", "Retraction", "First ✓"],
+    ["2", "10.1234/b", "Retraction", "Second"],
+    ["3", "10.1234/a", "Correction", "Third"],
+    ["4", "10.1234/c", "Retraction", ""],
+]
+
+
+@pytest.fixture
+def store():
+    return RecordStore(COLUMNS, ROWS, [row[1].lower() for row in ROWS])
+
+
+class TestRecordStore:
+
+    def test_records_read_like_dicts(self, store):
+        (record,) = store["10.1234/b"]
+        assert record["Title"] == "Second"
+        assert dict(record) == dict(zip(COLUMNS, ROWS[1]))
+
+    def test_rows_grouped_by_doi_any_case(self, store):
+        assert [r["Record ID"] for r in store["10.1234/A"]] == ["1", "3"]
+        assert "10.1234/C" in store
+        assert len(store) == 3
+        assert store.n_rows == 4
+
+    def test_unknown_doi_gives_empty_list(self, store):
+        assert store["10.1234/zzz"] == []
+        assert "10.1234/zzz" not in store
+        assert store.get("10.1234/zzz") is None
+
+    def test_low_cardinality_columns_dictionary_encoded(self, store):
+        # pylint: disable=protected-access
+        nature = store._data[COLUMNS.index("RetractionNature")]
+        assert isinstance(nature, CategoryColumn)
+        assert nature.categories == ("Retraction", "Correction")
+        assert isinstance(store._data[COLUMNS.index("Title")], TextColumn)
+
+    def test_non_ascii_text_roundtrips(self, store):
+        assert store["10.1234/a"][0]["Title"] == "First ✓"
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        ["a", "b"] * 10,
+        [str(i) for i in range(20)],
+        ["same"] * 5 + [str(i) for i in range(15)],
+        [str(i % 10) for i in range(20)],
+    ],
+)
+@pytest.mark.parametrize("n_parts", [1, 2, 3, 7])
+def test_concat_columns_encodes_as_one_column(values, n_parts):
+    step = -(-len(values) // n_parts)
+    parts = [
+        RecordStore._encode(values[i : i + step])  # pylint: disable=protected-access
+        for i in range(0, len(values), step)
+    ]
+    whole = RecordStore._encode(values)  # pylint: disable=protected-access
+    joined = concat_columns(parts, RecordStore.CATEGORY_RATIO)
+    assert type(joined) is type(whole)
+    assert [joined[i] for i in range(len(joined))] == values
+    if isinstance(whole, CategoryColumn):
+        assert joined.categories == whole.categories
+        assert joined.codes == whole.codes
+    else:
+        assert joined.blob == whole.blob
+        assert joined.offsets == whole.offsets
+
+
+MULTILINE_CSV = (
+    'Record ID,OriginalPaperDOI,Title\r\n1,10.1234/a,"Two\r\nlines"\r\n\r\n'
+    + '2,10.1234/b,"Say ""hi"", then\nleave"\r\n3,10.1234/c,Plain ✓\r\n'
+).encode("utf8")
+
+# Quotes not at the start of a field are literal, as in the csv module
+STRAY_QUOTE_CSV = (
+    'Record ID,OriginalPaperDOI,Title\n1,10.1234/a,First 12" Title\n'
+    + '2,10.1234/b,"Quoted"then more\n3,10.1234/c,"Two\nlines, 5"" long"\n'
+    + "4,10.1234/d,Last\n"
+).encode("utf8")
+
+
+class TestCSVRecords:
+
+    def test_quoted_newlines_stay_in_their_record(self):
+        starts = [offset for offset, _ in iter_csv_records(BytesIO(MULTILINE_CSV))]
+        assert [MULTILINE_CSV[s : s + 1] for s in starts] == [
+            b"R",
+            b"1",
+            b"\r",
+            b"2",
+            b"3",
+        ]
+
+    def test_rows_match_universal_newline_text_reading(self, tmp_path):
+        path = tmp_path / "multiline.csv"
+        _ = path.write_bytes(MULTILINE_CSV)
+        with path.open(encoding="utf8") as text:
+            expected = [row for row in csv.reader(text) if row]
+        assert [row for _, _, row in read_csv_rows(BytesIO(MULTILINE_CSV))] == expected
+
+    def test_stray_quotes_read_as_csv_module_does(self):
+        expected = list(csv.reader(STRAY_QUOTE_CSV.decode("utf8").splitlines(True)))
+        assert [
+            row for _, _, row in read_csv_rows(BytesIO(STRAY_QUOTE_CSV))
+        ] == expected
+        assert len(expected) == 5
+
+    def test_offsets_lead_back_to_rows(self):
+        for offset, record, row in read_csv_rows(BytesIO(MULTILINE_CSV)):
+            stream = BytesIO(MULTILINE_CSV)
+            _ = stream.seek(offset)
+            assert next(read_csv_rows(stream)) == (offset, record, row)
+
+    @pytest.mark.parametrize("n_chunks", [1, 2, 3, 50])
+    def test_chunks_hold_whole_records(self, tmp_path, n_chunks):
+        path = tmp_path / "multiline.csv"
+        _ = path.write_bytes(MULTILINE_CSV * 3)
+        starts = {offset for offset, _ in iter_csv_records(BytesIO(MULTILINE_CSV * 3))}
+        with path.open("rb") as stream:
+            chunks = split_csv_records(stream, 0, len(MULTILINE_CSV) * 3, n_chunks)
+        assert chunks[0][0] == 0
+        assert chunks[-1][1] == len(MULTILINE_CSV) * 3
+        assert all(a < b == c for (a, b), (c, _) in zip(chunks, chunks[1:]))
+        assert {a for a, _ in chunks} <= starts
+        assert len(chunks) <= n_chunks
+
+    @pytest.mark.parametrize("n_chunks", [2, 3, 50])
+    def test_stray_quotes_do_not_move_chunk_bounds(self, tmp_path, n_chunks):
+        data = STRAY_QUOTE_CSV * 3
+        path = tmp_path / "stray.csv"
+        _ = path.write_bytes(data)
+        with path.open("rb") as stream:
+            chunks = split_csv_records(stream, 0, len(data), n_chunks)
+        assert len(chunks) > 1
+        rows = [
+            row for a, b in chunks for _, _, row in read_csv_rows(BytesIO(data[a:b]))
+        ]
+        assert rows == list(csv.reader(data.decode("utf8").splitlines(True)))
+
+    def test_no_chunks_for_empty_range(self, tmp_path):
+        path = tmp_path / "multiline.csv"
+        _ = path.write_bytes(MULTILINE_CSV)
+        with path.open("rb") as stream:
+            assert not split_csv_records(
+                stream, len(MULTILINE_CSV), len(MULTILINE_CSV), 4
+            )
+
+
+class TestLazyRecordStore:
+
+    @pytest.fixture
+    def lazy_store(self, tmp_path):
+        path = tmp_path / "multiline.csv"
+        _ = path.write_bytes(MULTILINE_CSV)
+        with path.open("rb") as stream:
+            _, _, header = next(rows := read_csv_rows(stream))
+            offsets, kept = zip(*((o, row[:2]) for o, _, row in rows))
+        keys = [row[1] for row in kept]
+        return RecordStore(header[:2], kept, keys, CSVSource(path, header), offsets)
+
+    def test_projected_columns_held_in_memory(self, lazy_store):
+        assert lazy_store.stored_columns == ("Record ID", "OriginalPaperDOI")
+        assert lazy_store.columns == ("Record ID", "OriginalPaperDOI", "Title")
+        (record,) = lazy_store["10.1234/B"]
+        assert record["Record ID"] == "2"
+
+    def test_other_columns_read_on_demand(self, lazy_store, mocker):
+        read_row = mocker.spy(lazy_store.source, "read_row")
+        (record,) = lazy_store["10.1234/a"]
+        assert record["Title"] == "Two\nlines"
+        assert dict(record) == {
+            "Record ID": "1",
+            "OriginalPaperDOI": "10.1234/a",
+            "Title": "Two\nlines",
+        }
+        assert read_row.call_count == 1
+        assert lazy_store["10.1234/c"][0]["Title"] == "Plain ✓"
+
+    def test_unknown_column_raises(self, lazy_store):
+        with pytest.raises(KeyError):
+            _ = lazy_store["10.1234/a"][0]["Country"]
+
+    def test_changed_source_refuses_reads(self, lazy_store):
+        _ = lazy_store.source.path.write_bytes(MULTILINE_CSV + b"4,10.1234/d,New\r\n")
+        with pytest.raises(ValueError, match="changed since it was loaded"):
+            _ = lazy_store["10.1234/a"][0]["Title"]
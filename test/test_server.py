@@ -0,0 +1,169 @@
+import asyncio
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from ash import server
+from ash.main import RetractionDatabase
+from ash.server import ReportServer
+
+MOCK_DIR = Path(__file__).parent / "mock"
+
+pytestmark = pytest.mark.enable_socket
+
+
+def run_with_server(client, **where):
+    """
+    Start a server on a free port (or the given socket), run the client against it.
+    """
+
+    async def main():
+        report_server = ReportServer(RetractionDatabase(MOCK_DIR / "rw_database.csv"))
+        async with await report_server.start(port=0, **where) as running:
+            address = where.get("socket_path") or running.sockets[0].getsockname()
+            return await client(address)
+
+    return asyncio.run(main())
+
+
+async def exchange(address, *requests):
+    if isinstance(address, Path):
+        reader, writer = await asyncio.open_unix_connection(address)
+    else:
+        reader, writer = await asyncio.open_connection(*address[:2])
+    responses = []
+    for method, target, body, headers in requests:
+        head = f"{method} {target} HTTP/1.1\r\nContent-Length: {len(body)}\r\n"
+        head += "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+        writer.write(head.encode() + b"\r\n" + body)
+        status = int((await reader.readline()).split()[1])
+        length = 0
+        while (line := await reader.readline()).strip():
+            name, _, value = line.decode().partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        responses.append((status, json.loads(await reader.readexactly(length))))
+    writer.close()
+    return responses
+
+
+def post_report(body, content_type="text/plain", target="/report"):
+    return ("POST", target, body, {"Content-Type": content_type})
+
+
+def test_report_matches_paper_report():
+    async def client(address):
+        return await exchange(address, post_report(b"Cite 10.1234/retracted12349."))
+
+    ((status, report),) = run_with_server(client)
+    assert status == 200
+    assert report["dois"] == {"10.1234/retracted12349": {"Retracted": True}}
+    assert report["zombies"][0]["Zombie"] == "10.1234/retracted12349"
+
+
+@pytest.mark.parametrize("stub_api", [({"10.21105/joss.03440"}, 0.0)], indirect=True)
+def test_validation_reuses_connections(stub_api):
+    body = b"Cite 10.1234/retracted12349 and 10.21105/joss.03440."
+
+    async def client(address):
+        return await exchange(
+            address,
+            post_report(body, target="/report?validate=1"),
+            post_report(body.replace(b"12349", b"12345"), target="/report?validate=1"),
+        )
+
+    (_, first), (_, second) = run_with_server(client)
+    assert first["dois"] == {
+        "10.1234/retracted12349": {"DOI is valid": False, "Retracted": True},
+        "10.21105/joss.03440": {"DOI is valid": True, "Retracted": False},
+    }
+    assert second["dois"]["10.1234/retracted12345"]["Retracted"]
+    assert len(stub_api.requests) == 3
+    assert len(stub_api.clients) <= 2  # the second report opened none
+
+
+def test_keep_alive_and_errors(make_pdf):
+    pdf = make_pdf(["Text citing 10.1234/retracted12345 here."])
+
+    async def client(address):
+        return await exchange(
+            address,
+            ("GET", "/health", b"", {}),
+            post_report(pdf, "application/octet-stream"),
+            ("GET", "/report", b"", {}),
+            post_report(b"x", "image/png"),
+            ("GET", "/nowhere", b"", {}),
+        )
+
+    statuses, payloads = zip(*run_with_server(client))
+    assert statuses == (200, 200, 405, 415, 404)
+    assert payloads[0]["dois"] == 3
+    assert list(payloads[1]["dois"]) == ["10.1234/retracted12345"]
+
+
+def test_negative_length_rejected(caplog):
+    async def client(address):
+        return await exchange(
+            address, ("POST", "/report", b"", {"Content-Length": "-5"})
+        )
+
+    ((status, payload),) = run_with_server(client)
+    assert status == 400
+    assert payload == {"error": "Malformed Content-Length"}
+    assert "Failed to serve request" not in caplog.text
+
+
+def test_body_sent_after_100_continue():
+    body = b"Cite 10.1234/retracted12349."
+
+    async def client(address):
+        reader, writer = await asyncio.open_connection(*address[:2])
+        writer.write(
+            b"POST /report HTTP/1.1\r\nContent-Type: text/plain\r\n"
+            + f"Content-Length: {len(body)}\r\n".encode()
+            + b"Expect: 100-continue\r\n\r\n"
+        )
+        interim = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 5)
+        writer.write(body)
+        status = int((await reader.readline()).split()[1])
+        writer.close()
+        return interim, status
+
+    interim, status = run_with_server(client)
+    assert interim == b"HTTP/1.1 100 Continue\r\n\r\n"
+    assert status == 200
+
+
+def test_unix_socket(tmp_path):
+    async def client(address):
+        return await exchange(address, ("GET", "/health", b"", {}))
+
+    ((status, health),) = run_with_server(client, socket_path=tmp_path / "ash.sock")
+    assert status == 200
+    assert health["status"] == "ok"
+
+
+def test_slow_extraction_does_not_block_other_requests(mocker):
+    release = threading.Event()
+
+    def slow_extract(data, mime_type):
+        _ = release.wait(5)
+        return []
+
+    _ = mocker.patch.object(server, "extract_dois", side_effect=slow_extract)
+
+    async def client(address):
+        slow = asyncio.create_task(exchange(address, post_report(b"big paper")))
+        start = time.perf_counter()
+        ((status, _),) = await exchange(address, ("GET", "/health", b"", {}))
+        waited = time.perf_counter() - start
+        release.set()
+        await slow
+        return status, waited
+
+    status, waited = run_with_server(client)
+    assert status == 200
+    assert waited < 1
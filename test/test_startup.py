@@ -0,0 +1,106 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+HEAVY_MODULES = (
+    "asyncio",
+    "click",
+    "filetype",
+    "pypdf",
+    "striprtf",
+    "tomlkit",
+    "urllib3",
+)
+
+# Loose enough for a loaded CI machine, as these take a few hundredths of a second
+# here; the tests of which modules load catch heavy imports, this only gross slowdowns
+IMPORT_BUDGET = 1.0
+HELP_BUDGET = 2.0
+
+
+@pytest.fixture
+def isolated_env(tmp_path):
+    env = dict(os.environ)
+    env.update(
+        HOME=str(tmp_path),
+        XDG_CONFIG_HOME=str(tmp_path / "config"),
+        XDG_CACHE_HOME=str(tmp_path / "cache"),
+    )
+    return env
+
+
+def run_python(code, env, cwd):
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=cwd,
+        check=True,
+    )
+    return result.stdout, time.perf_counter() - start
+
+
+def best_of(code, env, cwd, runs=3):
+    return min(run_python(code, env, cwd)[1] for _ in range(runs))
+
+
+def test_import_loads_no_heavy_dependencies(isolated_env, tmp_path):
+    code = (
+        "import json, sys, ash\n"
+        + "print(json.dumps(sorted({m.split('.')[0] for m in sys.modules})))"
+    )
+    stdout, _ = run_python(code, isolated_env, tmp_path)
+    assert not set(HEAVY_MODULES) & set(json.loads(stdout))
+
+
+def test_cli_help_loads_no_handler_dependencies(isolated_env, tmp_path):
+    code = (
+        "import json, sys\n"
+        + "from ash.cli import ash_cli\n"
+        + "try:\n    ash_cli(['--help'])\n"
+        + "except SystemExit:\n"
+        + "    print(json.dumps(sorted({m.split('.')[0] for m in sys.modules})))"
+    )
+    stdout, _ = run_python(code, isolated_env, tmp_path)
+    loaded = set(json.loads(stdout.splitlines()[-1]))
+    assert "click" in loaded
+    assert not {"asyncio", "filetype", "pypdf", "striprtf", "urllib3"} & loaded
+
+
+def test_submodules_reached_from_package(isolated_env, tmp_path):
+    code = (
+        "import ash\n"
+        + "print(ash.config.setup_logging.__name__, ash.aio.AsyncHeadClient.__name__,"
+        + " ash.cache.ExtractionCache.__name__, ash.instrument.__name__)"
+    )
+    stdout, _ = run_python(code, isolated_env, tmp_path)
+    assert stdout.split() == [
+        "setup_logging",
+        "AsyncHeadClient",
+        "ExtractionCache",
+        "ash.instrument",
+    ]
+
+
+def test_import_touches_no_files(isolated_env, tmp_path):
+    _ = run_python("import ash; ash.Paper", isolated_env, tmp_path)
+    assert sorted(p.name for p in tmp_path.iterdir()) == []
+
+
+def test_startup_within_budget(isolated_env, tmp_path):
+    bare = best_of("pass", isolated_env, tmp_path)
+    imported = best_of("import ash", isolated_env, tmp_path)
+    helped = best_of(
+        "from ash.cli import ash_cli\ntry:\n    ash_cli(['--help'])\n"
+        + "except SystemExit:\n    pass",
+        isolated_env,
+        tmp_path,
+    )
+    assert imported - bare < IMPORT_BUDGET
+    assert helped - bare < HELP_BUDGET